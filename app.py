@@ -3,6 +3,7 @@ import dataclasses
 from datetime import datetime
 from pathlib import Path
 from random import randint
+import math
 import time
 import os
 
@@ -15,22 +16,35 @@ from pygame.locals import *
 from pygame.math import Vector2
 
 # engine imports
-from src.engine.animation import SpriteAnimation
+from src.engine.autosave import Autosaver
+from src.engine.back_buffer import BackBuffer
 from src.engine.cache import ECacheStatus
+from src.engine.dirty_rects import DirtyRectTracker
+from src.engine.render_queue import RenderQueue
 from src.engine.utilities import clamp, clamp_onscreen
+from src.engine.hot_reload import AssetWatcher, EAssetKind
 from src.engine.input import EngineInput
+from src.engine.loader import StreamingLoader
+from src.engine.particles import ParticleSystem, is_available as particles_are_available
+from src.engine.pixel_format import SUPPORTED_DISPLAY_BIT_DEPTHS, get_display_flags, prepare_surface
 from src.engine.resource import IMAGES_TO_LOAD, AUDIO_TO_LOAD, FONTS_TO_LOAD
-from src.engine.resource import load_json, load_image, load_sound, load_font
-from src.engine.resource import write_json
+from src.engine.resource import load_image, load_font, load_font_from_bytes
+from src.engine.scroll_list import ScrollList
+from src.engine.sound_cache import SoundCache
+from src.engine.text import TextRenderCache
+from src.engine.transform import TransformCache
 from src.engine.ui import EColor
 
 # game imports
 from src.gembo.update_modes import EUpdateMode, UpdateModeManager
+from src.gembo.save_format import load_save_file, write_save_file
+from src.gembo.statistics_store import StatisticsStore
 from src.gembo.game_data import (AudioData, EngineData, FontData, GameplayData, GemData, CactusData,
                                  ImageData, MenuData, PlayerData, StatisticsData, SettingsData, UIData)
 
 from src.gembo.renderer import (RenderAboutMenu, RenderSettingsMenu, RenderStatsMenu, RenderDemo,
                                 RenderMainMenu, RenderGameplay)
+from src.gembo.renderer.render_mode import BreatheBoxCache
 
 
 
@@ -105,6 +119,9 @@ class App:
     def __init__(self):
         self.running = True
         self._display_surface = None
+        # everything is drawn here, at APPLICATION_WINDOW_SIZE, and scaled up into the display (see BackBuffer)
+        self._back_buffer = None
+        self._render_surface = None
 
         # user defined events, max? 8?
         self.EVENT__RESPAWN_GEM = pygame.event.custom_type()
@@ -139,16 +156,26 @@ class App:
         self._images_to_load = self._engine.cache.lookup('IMAGES_TO_LOAD')
         self._engine.cache.register('loaded_image_surfaces', {}, ECacheStatus.NO_EVICT)
         self._loaded_image_surfaces = self._engine.cache.lookup('loaded_image_surfaces')
+        self._engine.cache.register('transform_cache', TransformCache(self._loaded_image_surfaces), ECacheStatus.NO_EVICT)
+        self._transform_cache = self._engine.cache.lookup('transform_cache')
         # load audio
         self._engine.cache.register('AUDIO_TO_LOAD', AUDIO_TO_LOAD, ECacheStatus.NO_EVICT)
         self._audio_to_load = self._engine.cache.lookup('AUDIO_TO_LOAD')
         self._engine.cache.register('loaded_audio_sounds', {}, ECacheStatus.NO_EVICT)
         self._loaded_audio_sounds = self._engine.cache.lookup('loaded_audio_sounds')
+        self._engine.cache.register('sound_cache', SoundCache(), ECacheStatus.NO_EVICT)
+        self._sound_cache = self._engine.cache.lookup('sound_cache')
         # load fonts
         self._engine.cache.register('FONTS_TO_LOAD', FONTS_TO_LOAD, ECacheStatus.NO_EVICT)
         self._display_fonts_to_load = self._engine.cache.lookup('FONTS_TO_LOAD')
         self._engine.cache.register('loaded_display_fonts', {}, ECacheStatus.NO_EVICT)
         self._loaded_display_fonts = self._engine.cache.lookup('loaded_display_fonts')
+        # loads assets across several frames, during startup
+        self._engine.cache.register('asset_loader', StreamingLoader(), ECacheStatus.NO_EVICT)
+        self._asset_loader = self._engine.cache.lookup('asset_loader')
+        # reloads changed images and fonts while the game runs (only if hot_reload_assets is set)
+        self._engine.cache.register('asset_watcher', AssetWatcher(), ECacheStatus.NO_EVICT)
+        self._asset_watcher = self._engine.cache.lookup('asset_watcher')
 
         # images used in-game
         self._engine.cache.register('images', ImageData(), ECacheStatus.NO_EVICT)
@@ -194,6 +221,19 @@ class App:
         self._engine.cache.register('statistics', StatisticsData(), ECacheStatus.NO_EVICT)
         self._statistics = self._engine.cache.lookup('statistics')
 
+        # progress is saved on a background thread while playing, not just at shutdown
+        autosaver = Autosaver(fn_snapshot=self.get_statistics_snapshot,
+                              fn_write=self.write_statistics_snapshot,
+                              min_interval_s=self._engine.autosave_min_interval_s,
+                              periodic_interval_s=self._engine.autosave_periodic_interval_s)
+        self._engine.cache.register('autosaver', autosaver, ECacheStatus.NO_EVICT)
+        self._autosaver = self._engine.cache.lookup('autosaver')
+
+        # the stats menu's streak table, which scrolls through every streak length, a few rows at a time
+        stats_list = ScrollList(row_height=30, visible_row_count=self._statistics.display_n_top_streaks)
+        self._engine.cache.register('stats_list', stats_list, ECacheStatus.NO_EVICT)
+        self._stats_list = self._engine.cache.lookup('stats_list')
+
 
         # Game Settings ------------------------------------------------------------------------------------------------
 
@@ -205,6 +245,29 @@ class App:
         self._engine.cache.register('ui', UIData(), ECacheStatus.NO_EVICT)
         self._ui = UIData()
 
+        # rendered text is reused between frames, as long as the font, string, and color are the same
+        self._engine.cache.register('text_cache', TextRenderCache(), ECacheStatus.NO_EVICT)
+        self._text_cache = self._engine.cache.lookup('text_cache')
+
+        # the render modes report what they draw here, so only what changed is presented
+        self._engine.cache.register('dirty_rects', DirtyRectTracker(), ECacheStatus.NO_EVICT)
+        self._dirty_rects = self._engine.cache.lookup('dirty_rects')
+
+        # the render modes submit their blits here, and they're drawn in a few Surface.blits calls, each frame
+        self._engine.cache.register('render_queue', RenderQueue(), ECacheStatus.NO_EVICT)
+        self._render_queue = self._engine.cache.lookup('render_queue')
+
+        # the gameplay breathe box is drawn from pre-rendered phases
+        self._engine.cache.register('breathe_boxes', BreatheBoxCache(), ECacheStatus.NO_EVICT)
+
+        # sparks and dust, during gameplay.  They need numpy, without it there are none
+        self._particles = None
+        if particles_are_available():
+            self._engine.cache.register('particles', ParticleSystem(), ECacheStatus.NO_EVICT)
+            self._particles = self._engine.cache.lookup('particles')
+        # the direction the player last moved in, to tell when they turn around (see emit_dust_cloud)
+        self._player_move_direction = Vector2()
+
         self._engine.cache.register('render_modes', {}, ECacheStatus.NO_EVICT)
         self._render_modes = self._engine.cache.lookup('render_modes')
 
@@ -225,66 +288,91 @@ class App:
 
 
     def initialize_images(self):
+        """ queues every image on the asset loader, followed by binding them to the game data """
         for image_path in self._images_to_load:
-            surface = load_image(image_path)
-            # the stem is just the file name, w/o the extension
-            name = Path(image_path).stem
-            self._loaded_image_surfaces[name] = surface
+            self._asset_loader.add_job('images', self.load_image_asset, image_path)
+        self._asset_loader.add_job('images', self.bind_images)
+
+
+    def load_image_asset(self, image_path: str):
+        surface = prepare_surface(load_image(image_path))
+        # the stem is just the file name, w/o the extension
+        name = Path(image_path).stem
+        self._loaded_image_surfaces[name] = surface
+
+
+    def bind_images(self):
+        """ points the game data at the loaded images.  This is called again after a hot reload swaps an image """
+        gem_was_ripe = self._gem.image is None or self._gem.is_ripe()
 
         self._player.image = self._loaded_image_surfaces['p1_stand']
         self._gem.blue_image = self._loaded_image_surfaces['gemBlue']
         self._gem.yellow_image = self._loaded_image_surfaces['gemYellow']
-        self._gem.image = self._gem.yellow_image
+        self._gem.image = self._gem.yellow_image if gem_was_ripe else self._gem.blue_image
+
+        # derived surfaces (flipped, scaled, rotated) are built once, and shared through the transform cache
+        self._player.image_mirrored = self._transform_cache.get_flipped('p1_stand')
 
-        self._player.image_mirrored = pygame.transform.flip(self._player.image, True, False)
-
-
-        p1_walk_anim_surfaces = [
-            self._loaded_image_surfaces['p1_walk01'],
-            self._loaded_image_surfaces['p1_walk02'],
-            self._loaded_image_surfaces['p1_walk03'],
-            self._loaded_image_surfaces['p1_walk04'],
-            self._loaded_image_surfaces['p1_walk05'],
-            self._loaded_image_surfaces['p1_walk06'],
-            self._loaded_image_surfaces['p1_walk07'],
-            self._loaded_image_surfaces['p1_walk08'],
-        ]
-        p1_walk_anim = SpriteAnimation(self._engine, p1_walk_anim_surfaces, 1.0)
-        self._player.sprite_animator.register_animation('walk', p1_walk_anim)
-
-        p1_walk_flipped_anim_surfaces = [
-            pygame.transform.flip(self._loaded_image_surfaces['p1_walk01'], True, False),
-            pygame.transform.flip(self._loaded_image_surfaces['p1_walk02'], True, False),
-            pygame.transform.flip(self._loaded_image_surfaces['p1_walk03'], True, False),
-            pygame.transform.flip(self._loaded_image_surfaces['p1_walk04'], True, False),
-            pygame.transform.flip(self._loaded_image_surfaces['p1_walk05'], True, False),
-            pygame.transform.flip(self._loaded_image_surfaces['p1_walk06'], True, False),
-            pygame.transform.flip(self._loaded_image_surfaces['p1_walk07'], True, False),
-            pygame.transform.flip(self._loaded_image_surfaces['p1_walk08'], True, False),
-        ]
-        p1_walk_flipped_anim = SpriteAnimation(self._engine, p1_walk_flipped_anim_surfaces, 1.0)
-        self._player.sprite_animator.register_animation('walk_flipped', p1_walk_flipped_anim)
+        p1_walk_anim_names = ['p1_walk01', 'p1_walk02', 'p1_walk03', 'p1_walk04',
+                              'p1_walk05', 'p1_walk06', 'p1_walk07', 'p1_walk08']
+        p1_walk_anim = self._transform_cache.build_animation(self._engine, p1_walk_anim_names, 1.0)
+        p1_walk_flipped_anim = self._transform_cache.build_mirrored_animation(p1_walk_anim)
+
+        animator = self._player.sprite_animator
+        if 'walk' not in animator.animations:
+            animator.register_animation('walk', p1_walk_anim)
+            animator.register_flipped_animation('walk', p1_walk_flipped_anim)
+        else:
+            # keep the existing animations, so their timing is unchanged
+            animator.update_animation_surfaces('walk', p1_walk_anim.animation_surfaces)
+            animator.update_animation_surfaces('walk', p1_walk_flipped_anim.animation_surfaces, flipped=True)
 
         self._cactus.image = self._loaded_image_surfaces['cactus']
-        cactus_base_image = self._loaded_image_surfaces['dirtHalf']
-        self._cactus.base_image = pygame.transform.scale_by(cactus_base_image, 0.5)
+        self._cactus.base_image = self._transform_cache.get_scaled('dirtHalf', 0.5)
 
 
     def initialize_sounds(self):
+        """ queues every sound on the asset loader, followed by binding them to the game data """
         for audio_path in self._audio_to_load:
-            sound = load_sound(audio_path)
-            name = Path(audio_path).stem
-            self._loaded_audio_sounds[name] = sound
+            self._asset_loader.add_job('sounds', self.load_sound_asset, audio_path)
+        self._asset_loader.add_job('sounds', self.bind_sounds)
 
+
+    def load_sound_asset(self, audio_path: str):
+        # sounds are decoded once, and then loaded as raw pcm from the sound cache on later launches
+        sound = self._sound_cache.load(audio_path)
+        name = Path(audio_path).stem
+        self._loaded_audio_sounds[name] = sound
+
+
+    def bind_sounds(self):
         self._gem.blue_sfx = self._loaded_audio_sounds['misc_menu_2']
         self._gem.yellow_sfx = self._loaded_audio_sounds['coin10']
 
 
     def initialize_font(self):
+        """ queues every font on the asset loader, followed by binding them to the game data """
+        for name, size, path in self._display_fonts_to_load:
+            if name not in self._loaded_display_fonts:
+                self._asset_loader.add_job('fonts', self.load_font_asset, name, size, path)
+        self._asset_loader.add_job('fonts', self.bind_fonts)
+
+
+    def initialize_demo_font(self):
+        """ loads only the font used by the demo title, so the first frame can be shown right away """
         for name, size, path in self._display_fonts_to_load:
-            font = load_font(path, size)
-            self._loaded_display_fonts[name] = font
+            if name == 'lcd_big':
+                self.load_font_asset(name, size, path)
+        self._font.lcd_big = self._loaded_display_fonts.get('lcd_big')
+
+
+    def load_font_asset(self, name: str, size: int, path: str):
+        font = load_font(path, size)
+        self._loaded_display_fonts[name] = font
+
 
+    def bind_fonts(self):
+        """ points the game data at the loaded fonts.  This is called again after a hot reload swaps a font """
         self._font.lcd_big = self._loaded_display_fonts['lcd_big']
         self._font.lcd = self._loaded_display_fonts['lcd']
         self._font.lcd_small = self._loaded_display_fonts['lcd_small']
@@ -299,7 +387,7 @@ class App:
     def initialize_gameplay(self):
         assert hasattr(self._game_mode, 'current')
 
-        w, h = self._display_surface.get_size()
+        w, h = self._render_surface.get_size()
         self._ui.time_played_text_position = (w - 350, 30)
         self._ui.point_total_text_position = (w - 270, 80)
 
@@ -308,24 +396,46 @@ class App:
 
         self.place_cactus()
 
-        stats = load_json(self._statistics.player_stats_file_path)
+        # this also reads the json game.data, written by older versions, which is replaced on the next save
+        stats = load_save_file(self._statistics.player_stats_file_path,
+                               self._statistics.player_stats_backup_file_path)
         if stats:
             self._statistics.player_stats = stats
 
+        # the history itself isn't needed to play, so it's read in chunks, after everything else is loaded
+        if self._statistics.use_statistics_database:
+            self._statistics.load_statistics_store(StatisticsStore(self._statistics.statistics_database_file_path),
+                                                   lazy=True)
+        else:
+            self._statistics.load_streak_history(lazy=True)
         self._statistics.parse_player_history()
+        self._asset_loader.add_job('history', self.load_streak_history_chunk)
 
         self._player.speed = self._player.start_speed
 
         self._player.sprite_animator.play_animation('walk', loop=True)
-        self._player.sprite_animator.play_animation('walk_flipped', loop=True)
+
+    def load_streak_history_chunk(self):
+        """ reads the next part of the streak history, and queues itself again, until all of it is read """
+        if not self._statistics.player_streak_history.load_chunk():
+            self._asset_loader.add_job('history', self.load_streak_history_chunk)
 
     # def initialize_game_modes(self):
     #     self._game_mode.get_current().update()
 
+    def initialize_demo_render_mode(self):
+        """ the demo is the only render mode available while the rest of the assets are loading """
+        self._engine.ui = self._ui
+        self._render_modes[EUpdateMode.UPDATE_DEMO] = RenderDemo(self._engine, self._render_surface, EUpdateMode.UPDATE_DEMO, {
+            'demo_title_font': self._font.lcd_big,
+            'window_title': self.window_title,
+            'fn_get_loading_progress': self._asset_loader.get_progress,
+        })
+
     def initialize_render_modes(self):
         engine = self._engine
         engine.ui = self._ui
-        surface = self._display_surface
+        surface = self._render_surface
 
         # main menu
         self._render_modes[EUpdateMode.UPDATE_MENU] = RenderMainMenu(engine, surface, EUpdateMode.UPDATE_MENU, {
@@ -341,7 +451,8 @@ class App:
             'score_font': self._font.lcd_small,
             'floor_line_padding': self._gameplay.floor_line_padding,
             'floor_line_color': self._gameplay.floor_line_color,
-            'statistics': self._statistics
+            'statistics': self._statistics,
+            'stats_list': self._stats_list,
         })
 
         # settings
@@ -362,10 +473,7 @@ class App:
         })
 
         # demo
-        self._render_modes[EUpdateMode.UPDATE_DEMO] = RenderDemo(engine, surface, EUpdateMode.UPDATE_DEMO, {
-            'demo_title_font': self._font.lcd_big,
-            'window_title': self.window_title
-        })
+        self.initialize_demo_render_mode()
 
         # update_modes
         self._render_modes[EUpdateMode.UPDATE_GAMEPLAY] = RenderGameplay(engine, surface, EUpdateMode.UPDATE_GAMEPLAY, {
@@ -381,6 +489,7 @@ class App:
             'cactus': self._cactus,
             'statistics': self._statistics,
             'ui': self._ui,
+            'particles': self._particles,
 
             'fn_get_total_playtime_s': self.get_total_playtime_s,
             'fn_player_streak_popup_is_visible': self.player_streak_popup__is_visible,
@@ -389,6 +498,61 @@ class App:
         })
 
 
+    def initialize_hot_reload(self):
+        """ starts watching every image and font in the manifest, if hot reloading is turned on """
+        if not self._engine.hot_reload_assets:
+            return
+
+        for image_path in self._images_to_load:
+            self._asset_watcher.watch(image_path, EAssetKind.IMAGE)
+        for _, _, font_path in self._display_fonts_to_load:
+            self._asset_watcher.watch(font_path, EAssetKind.FONT)
+
+        self._asset_watcher.start()
+
+
+    def apply_hot_reloaded_assets(self):
+        """ Swaps in any assets the AssetWatcher has decoded since the last frame.  The decoding already happened
+        on the watcher thread, so this only converts and swaps, and then rebuilds anything derived from the assets
+        """
+        changes = self._asset_watcher.get_pending_changes()
+        if not changes:
+            return
+
+        images_changed = False
+        fonts_changed = False
+        for asset in changes:
+            if asset.kind == EAssetKind.IMAGE:
+                name = Path(asset.path).stem
+                self._loaded_image_surfaces[name] = prepare_surface(asset.data)
+                # flipped and scaled copies of the old image are dropped, and rebuilt on request
+                self._transform_cache.invalidate(name)
+                images_changed = True
+
+            elif asset.kind == EAssetKind.FONT:
+                # a single font file can be loaded at several sizes
+                for name, size, path in self._display_fonts_to_load:
+                    if path == asset.path:
+                        font = load_font_from_bytes(asset.data, size)
+                        if font is not None:
+                            self._loaded_display_fonts[name] = font
+                            fonts_changed = True
+
+        # the old surfaces are freed, and the rebuilt ones can get their ids.  The dirty rect tracker keys sprites on
+        # their id, so a sprite which didn't move would look unchanged, and the old art would stay on screen
+        self._dirty_rects.invalidate()
+
+        if images_changed:
+            self.bind_images()
+
+        if fonts_changed:
+            self.bind_fonts()
+            # cached text and stats rows were rendered with the old fonts, and the render modes hold on to fonts
+            self._text_cache.clear()
+            self._stats_list.clear()
+            self.initialize_render_modes()
+
+
     # Gameplay Functions -----------------------------------------------------------------------------------------------
 
     def gem_overlaps_with_player(self):
@@ -478,6 +642,9 @@ class App:
         else:
             # if on a streak, it ends, and we calculate the stats to see if the player is on the scoreboard
             if self._gameplay.gem_streak_is_happening:
+                # a streak long enough to show the popup goes out with fireworks
+                if self.player_streak_popup__is_visible():
+                    self.emit_streak_fireworks()
                 self._gameplay.end_gem_streak()
 
             self._gameplay.increment_gem_anti_streak()
@@ -499,7 +666,7 @@ class App:
         if self._gameplay.gem_is_active:
             return
 
-        pos = self.get_random_onscreen_coordinate(self._display_surface)
+        pos = self.get_random_onscreen_coordinate(self._render_surface)
         w, h = self._gem.image.get_size()
 
         pos_x = clamp_onscreen(pos[0], 0, w)
@@ -511,16 +678,17 @@ class App:
         pygame.time.set_timer(self.EVENT__SPOIL_GEM, self._gameplay.gem_spoilage_timeout_ms)
 
         self._gameplay.gem_is_active = True
+        self.emit_gem_appear_particles()
 
     def place_cactus(self):
         """ places the cactus randomly on the game screen, if not already there """
         if self._cactus.cactus_is_active:
             return
 
-        random_position = self.get_random_onscreen_coordinate(self._display_surface)
+        random_position = self.get_random_onscreen_coordinate(self._render_surface)
 
         cactus_width, cactus_height = self._cactus.image.get_size()
-        screen_width, screen_height = self._display_surface.get_size()
+        screen_width, screen_height = self._render_surface.get_size()
 
         left = screen_width * 0.2 + cactus_width
         right = screen_width * 0.8 - cactus_width
@@ -538,6 +706,39 @@ class App:
         """ removes the cactus from the screen """
         self._cactus.cactus_is_active = False
 
+    def emit_gem_appear_particles(self):
+        """ a small puff of sparks where a gem appears """
+        if self._particles is None:
+            return
+        w, h = self._gem.image.get_size()
+        center = self._gem.position + Vector2(w / 2, h / 2)
+        self._particles.emit(center, 24, EColor.HIGHLIGHT_YELLOW, speed=(40, 110), lifetime_s=(0.25, 0.5), drag=3.0)
+
+    def emit_streak_fireworks(self):
+        """ bursts of sparks from the streak popup, bigger for longer streaks """
+        if self._particles is None:
+            return
+        w, h = self._render_surface.get_size()
+        popup_center = Vector2(w / 2, h - 90)
+        count = min(40 + 10 * self._gameplay.gem_streak_length, 200)
+        for color in [EColor.HIGHLIGHT_YELLOW, EColor.PINK, EColor.LIGHT_BLUE, EColor.WHITE]:
+            self._particles.emit(popup_center, count, color, speed=(80, 280), lifetime_s=(0.8, 1.6),
+                                 gravity=220.0, drag=1.0, spread=20.0)
+
+    def emit_dust_cloud(self, move_direction: Vector2):
+        """ kicks up dust at the player's feet, when they turn more than 90 degrees """
+        turned_around = self._player_move_direction.dot(move_direction) < 0
+        if move_direction.length_squared() > 0:
+            self._player_move_direction = move_direction
+        if self._particles is None or not turned_around:
+            return
+
+        w, h = self._player.image.get_size()
+        feet = self._player.position + Vector2(w / 2, h)
+        # upward, since y points down
+        self._particles.emit(feet, 16, EColor.COOL_GREY, speed=(20, 70), lifetime_s=(0.3, 0.6),
+                             angle=(math.pi, 2 * math.pi), drag=4.0, spread=6.0)
+
     def player_streak_popup__is_visible(self):
         """ returns true, if it's appropriate for the streak popup to arise """
         display_streak_at_length = 3
@@ -586,30 +787,63 @@ class App:
 
         pygame.mixer.pre_init(44100, 16, 2, 4096)
         pygame.init()
-        flags = pygame.HWSURFACE | pygame.DOUBLEBUF
-        display_surface = pygame.display.set_mode(APPLICATION_WINDOW_SIZE, flags, 16)
+        bit_depth = self._engine.display_bit_depth
+        if bit_depth not in SUPPORTED_DISPLAY_BIT_DEPTHS:
+            print(f'Display bit depth={bit_depth} is not supported, using 16')
+            bit_depth = 16
+        window_scale = self._engine.window_scale
+        if not isinstance(window_scale, int) or window_scale < 1:
+            print(f'Window scale={window_scale} is not a whole number, using 1')
+            window_scale = 1
+        window_size = (APPLICATION_WINDOW_SIZE[0] * window_scale, APPLICATION_WINDOW_SIZE[1] * window_scale)
+
+        flags = get_display_flags(self._engine.display_scaled)
+        display_surface = pygame.display.set_mode(window_size, flags, bit_depth)
         self._engine.cache.register('display_surface', display_surface, ECacheStatus.NO_EVICT)
         self._display_surface = self._engine.cache.lookup('display_surface')
 
+        # the render modes, and the layout, only ever see the back buffer, at APPLICATION_WINDOW_SIZE
+        self._back_buffer = BackBuffer(self._display_surface, window_scale)
+        self._engine.cache.register('render_surface', self._back_buffer.surface, ECacheStatus.NO_EVICT)
+        self._render_surface = self._engine.cache.lookup('render_surface')
+
+        # from here on, text is converted to the display's format as it's rendered, so blits don't convert it
+        self._text_cache.prepare_surface = prepare_surface
+        if self._particles is not None:
+            self._particles.prepare_surface = prepare_surface
+
         self.running = True
 
+        # only the demo title is loaded up front, so the window shows something on the very first frame
+        self.initialize_demo_font()
+        self.initialize_demo_render_mode()
+        self.change_game_mode(EUpdateMode.UPDATE_DEMO)
+        self.on_render()
+
+        # everything else streams in across the next frames, under a per-frame budget (see on_execute).
+        # Fonts go first, so the menus are ready soonest
+        self.initialize_font()
         self.initialize_images()
         self.initialize_sounds()
-        self.initialize_font()
-        self.initialize_gameplay()
-        self.initialize_render_modes()
+        self._asset_loader.add_job('gameplay', self.initialize_gameplay)
+        self._asset_loader.add_job('gameplay', self.initialize_render_modes)
+        self._asset_loader.add_job('gameplay', self.initialize_hot_reload)
+        self._asset_loader.add_job('gameplay', self.initialize_autosave)
 
         # register the parse_player_history fn w/ changing to the stats menu, so it's always ready
         # by the time we need to render it
         self._game_mode.register_callable(EUpdateMode.UPDATE_STATISTICS, self._statistics.parse_player_history)
 
-        self._statistics.playtime_this_session_started_at_time = time.time()
-
-        # now initialization is complete, set to demo mode for the main menu
-        self.change_game_mode(EUpdateMode.UPDATE_DEMO)
+        self._statistics.start_session()
 
         return True
 
+    def is_gameplay_unlocked(self) -> bool:
+        """ The game stays on the demo screen until every asset has been loaded.  The streak history may still be
+        loading after this, which is fine, since playing only appends to it
+        """
+        return self._asset_loader.has_group('gameplay') and self._asset_loader.is_group_ready('gameplay')
+
 
     def on_event(self, event):
         """ the engine's event fn """
@@ -618,6 +852,9 @@ class App:
             # handles quit event from the window
             if event.type == QUIT:
                 self.running = False
+            # the window was uncovered, or resized, so what's on screen can't be trusted
+            elif event.type in [WINDOWEXPOSED, WINDOWSIZECHANGED]:
+                self._dirty_rects.invalidate()
         _handle_engine_event(event)
 
         def _handle_menu_state_event(event):
@@ -630,7 +867,7 @@ class App:
 
                 if current_mode in transition_to_main_menu:
                     self._game_mode.set_mode__menu()
-                elif current_mode in transition_to_gameplay:
+                elif current_mode in transition_to_gameplay and self.is_gameplay_unlocked():
                     self._game_mode.set_mode__gameplay()
 
         _handle_menu_state_event(event)
@@ -649,7 +886,7 @@ class App:
 
 
         def _handle_debug_event(event):
-            if event.type == KEYDOWN:
+            if event.type == KEYDOWN and self.is_gameplay_unlocked():
                 key = event.key
 
                 if key == K_1:
@@ -693,6 +930,18 @@ class App:
 
             self._player.is_moving = is_player_moving(actions_this_frame)
 
+            def get_player_move_direction(player_input_actions: list) -> Vector2:
+                directions = {'move_left': (-1, 0), 'move_right': (1, 0), 'move_up': (0, -1), 'move_down': (0, 1)}
+                move_direction = Vector2()
+                for player_action in player_input_actions:
+                    if player_action.name in directions:
+                        move_direction += directions[player_action.name]
+                return move_direction
+
+            self.emit_dust_cloud(get_player_move_direction(actions_this_frame))
+            if self._particles is not None:
+                self._particles.update(delta_time_s)
+
 
             # collision update -----------------------------------------------------------------------------------------
             #
@@ -707,7 +956,7 @@ class App:
                 LEFT_COLLISION = 0
                 UP_COLLISION = 0
 
-                w, h = self._display_surface.get_size()
+                w, h = self._render_surface.get_size()
                 RIGHT_COLLISION = w
                 DOWN_COLLISION = h
 
@@ -777,7 +1026,6 @@ class App:
                         """ the animation increases in speed over the same interval of time, as the player's movement """
                         new_walk_duration = pygame.math.lerp(self._player.walk_animation_duration_s__slowest, self._player.walk_animation_duration_s__fastest, progression)
                         self._player.sprite_animator.update_animation_duration('walk', new_walk_duration)
-                        self._player.sprite_animator.update_animation_duration('walk_flipped', new_walk_duration)
                     scale_walk_animation_duration(player_speed_progression)
 
                     return pygame.math.lerp(self._player.start_speed, self._player.top_speed, player_speed_progression)
@@ -852,8 +1100,8 @@ class App:
 
         #@self.demo_mode_only
         def update_demo_mode():
-            # auto transition from demo mode to update_modes on user input
-            if len(actions_this_frame) > 0:
+            # auto transition from demo mode to update_modes on user input, once everything is loaded
+            if len(actions_this_frame) > 0 and self.is_gameplay_unlocked():
                 self.change_game_mode(EUpdateMode.UPDATE_GAMEPLAY)
 
             # update position of player.image on demo mode
@@ -874,9 +1122,13 @@ class App:
 
         #@self.stats_menu_only
         def update_stats_mode():
-            # user_input = get_user_input()
-            # if up/down: -> cycle through stats
-            pass
+            """ up and down scroll the streak table, a row at a time """
+            for action in actions_this_frame:
+                if action.is_starting:
+                    if action.name == 'move_up':
+                        self._stats_list.scroll(-1, self._statistics.get_streak_row_count())
+                    elif action.name == 'move_down':
+                        self._stats_list.scroll(1, self._statistics.get_streak_row_count())
 
 
         if self._game_mode.current == EUpdateMode.UPDATE_GAMEPLAY:
@@ -901,19 +1153,24 @@ class App:
     #   fns as it needs
 
     def on_render(self):
-        # clear the screen
-        self._display_surface.fill(EColor.BLACK)
+        # clear the screen.  With dirty rects, only what was drawn last frame needs clearing
+        if self._engine.render_dirty_rects_only and not self._dirty_rects.is_full_update_needed():
+            for rect in self._dirty_rects.get_previous_rects():
+                self._render_surface.fill(EColor.BLACK, rect)
+        else:
+            self._render_surface.fill(EColor.BLACK)
 
-        screen_width, screen_height = self._display_surface.get_size()
+        screen_width, screen_height = self._render_surface.get_size()
 
         def render_debug_info():
-            if self._engine.render_avg_fps:
+            if self._engine.render_avg_fps and self._font.open_dyslexic is not None:
                 message = f'fps: {self._engine.avg_fps}'
-                renderable_text = self._font.open_dyslexic.render(message, True, self._ui.get_unhighlight_color())
-                text_width, text_height = renderable_text.get_size()
+                fps_glyphs = self._text_cache.get_glyph_atlas(self._font.open_dyslexic, True, self._ui.get_unhighlight_color())
+                text_width, text_height = fps_glyphs.size(message)
                 x_pos = screen_width - text_width - 10
                 y_pos = screen_height - text_height - 10
-                self._display_surface.blit(renderable_text, (x_pos, y_pos))
+                fps_glyphs.render_to(self._render_surface, message, (x_pos, y_pos))
+                self._dirty_rects.add(pygame.Rect(x_pos, y_pos, text_width, text_height), ('fps', message))
 
         render_debug_info()
 
@@ -921,20 +1178,94 @@ class App:
         # and then calls render() on it.  What gets rendered, is defined in the
         # associated render mode file
         self._render_modes[self._game_mode.current].render()
+        self._render_queue.flush(self._render_surface, self._dirty_rects)
+        self._render_queue.end_frame()
 
-        pygame.display.flip()
+        dirty_rects = self._dirty_rects.end_frame(self._render_surface.get_rect())
+        if not self._engine.render_dirty_rects_only:
+            self._back_buffer.present()
+            pygame.display.flip()
+            return
+
+        if self._engine.render_dirty_rect_overlay:
+            dirty_rects += self.render_dirty_rect_overlay()
+        if dirty_rects:
+            pygame.display.update(self._back_buffer.present(dirty_rects))
     # on_render
 
+    def render_dirty_rect_overlay(self) -> list:
+        """ outlines what changed this frame, and how much of the screen that is, for debugging.  Returns the rects
+        it drew over, which are cleared on the next frame
+        """
+        overlay_rects = [pygame.draw.rect(self._render_surface, EColor.PINK, rect, 1)
+                         for rect in self._dirty_rects.changed_rects]
+
+        if self._font.open_dyslexic is not None:
+            screen_width, screen_height = self._render_surface.get_size()
+            dirty_percent = self._dirty_rects.dirty_area / (screen_width * screen_height) * 100
+            frame_stats = self._render_queue.frame_stats
+            message = (f'dirty: {len(self._dirty_rects.changed_rects)} rects, {dirty_percent:.0f}%, '
+                       f'blits: {frame_stats["blits"]} in {frame_stats["blits_calls"]} calls')
+            overlay_glyphs = self._text_cache.get_glyph_atlas(self._font.open_dyslexic, True, EColor.PINK)
+            _, text_height = overlay_glyphs.size(message)
+            position = (10, screen_height - text_height - 10)
+            overlay_glyphs.render_to(self._render_surface, message, position)
+            overlay_rects.append(pygame.Rect(position, overlay_glyphs.size(message)))
+
+        self._dirty_rects.set_overlay_rects(overlay_rects)
+        return overlay_rects
+
+
+    def initialize_autosave(self):
+        """ the stats are loaded by now, so it's safe to start writing them """
+        self._autosaver.start()
+
+    def update_autosave(self):
+        if self._statistics.has_unsaved_changes:
+            self._statistics.has_unsaved_changes = False
+            self._autosaver.mark_dirty()
+        self._autosaver.update()
+
+    def get_statistics_snapshot(self) -> dict:
+        """ runs on the main thread, and copies the stats, so the autosave thread never reads them mid-update """
+        snapshot = self._statistics.get_save_data()
+        snapshot['total_play_time'] = self.get_total_playtime_s()
+        return snapshot
+
+    def write_statistics_snapshot(self, snapshot: dict) -> bool:
+        """ runs on the autosave thread.  The previous game.data is rotated into game.data.backup """
+        if self._statistics.statistics_store is not None:
+            return self._statistics.statistics_store.write_save_data(snapshot)
+
+        was_written = write_save_file(self._statistics.player_stats_file_path, snapshot,
+                                      backup_path=self._statistics.player_stats_backup_file_path)
+        self._statistics.player_streak_history.sync()
+        return was_written
 
     def save_gameplay_data(self):
         self._statistics.player_stats['total_play_time'] = self.get_total_playtime_s()
-        write_json(self._statistics.player_stats_file_path, self._statistics.player_stats)
+
+        # the log is only emptied once game.data holds its records
+        compact_history = None
+        if self._statistics.should_compact_streak_history():
+            compact_history = self._statistics.compact_streak_history()
+
+        was_written = self.write_statistics_snapshot(self._statistics.get_save_data(compact_history))
+        if was_written and compact_history is not None:
+            self._statistics.apply_compacted_streak_history(compact_history)
 
     def cleanup_gameplay(self):
-        self.save_gameplay_data()
+        # lets any autosave which is in flight finish, so it can't race the final save
+        self._autosaver.stop()
+
+        # if the game closed while still loading, the stats were never read, so don't overwrite them
+        if self.is_gameplay_unlocked():
+            self.save_gameplay_data()
+        self._statistics.close_streak_history()
 
     def on_cleanup(self):
         """ this fn is called when shutting down the game """
+        self._asset_watcher.stop()
         self.cleanup_gameplay()
         pygame.quit()
 
@@ -950,11 +1281,20 @@ class App:
             self._engine.frame_time_start = time.time()
             self._engine.delta_time_s = self._engine.frame_time_start - self._engine.last_frame_start
 
+            # assets stream in under a per-frame budget, until everything is loaded
+            if not self._asset_loader.is_complete():
+                self._asset_loader.update(self._engine.asset_loading_budget_s)
+
+            self.apply_hot_reloaded_assets()
+
             for event in pygame.event.get():
                 self.on_event(event)
             self.on_update(self._engine.delta_time_s)
             self.on_render()
 
+            if self.is_gameplay_unlocked():
+                self.update_autosave()
+
             self._engine.update_fps_counter(i_will_only_call_this_once_per_engine_frame=True)
 
             # budget to 30 fps / 32ms
@@ -1013,8 +1353,6 @@ if __name__ == '__main__':
             
             * makes 3 loops, and then waits for 30s
             
-        add "appear" vfx for gem spawn            
-
         plan input selector
 
         add cactus that slowly moves across the screen when a streak of >10 ends
@@ -1030,8 +1368,6 @@ if __name__ == '__main__':
 
         spawn gems in pattern?        
 
-        add dust cloud, if player changes direction of > 90 deg
-
 """
 
 
@@ -0,0 +1,60 @@
+""" Compares blit speed across display formats, for the game's images and text, without starting the game
+
+    python blit_benchmark.py
+    python blit_benchmark.py --depths 16 32 --blits 50000 [--no-scaled] [images...]
+
+Each format is timed with the images as they used to be loaded (32 bit, with alpha), and after prepare_surface
+matched them to the display.  Set EngineData.display_bit_depth and display_scaled to whichever is fastest
+"""
+import argparse
+import os
+import sys
+
+import pygame
+
+from src.engine.pixel_format import SUPPORTED_DISPLAY_BIT_DEPTHS, benchmark_display_formats
+from src.engine.resource import IMAGES_TO_LOAD
+
+
+# the same strings the hud and menus show
+BENCHMARK_TEXT = ['Menu', 'Settings', 'Streak        Count', '00h 12m 34s', 'x12']
+
+
+def main(argv: list[str] = None) -> int:
+    parser = argparse.ArgumentParser(description='Times blits in each display format')
+    parser.add_argument('images', nargs='*', help='images to blit, defaults to the game\'s images')
+    parser.add_argument('--depths', type=int, nargs='+', default=list(SUPPORTED_DISPLAY_BIT_DEPTHS),
+                        choices=SUPPORTED_DISPLAY_BIT_DEPTHS, help='display bits per pixel to try')
+    parser.add_argument('--blits', type=int, default=20000, help='blits timed in each format')
+    parser.add_argument('--no-scaled', action='store_true', help='skip the SCALED display formats')
+    args = parser.parse_args(argv)
+
+    # imported here, so --help works without a display
+    from app import APPLICATION_WINDOW_SIZE
+
+    pygame.init()
+    # the images are loaded unconverted, since there's no display to convert them to yet
+    image_paths = [path for path in (args.images or IMAGES_TO_LOAD) if os.path.isfile(path)]
+    surfaces = [pygame.image.load(path) for path in image_paths]
+    font = pygame.font.Font(None, 32)
+    surfaces += [font.render(text, True, (255, 235, 153)) for text in BENCHMARK_TEXT]
+
+    scaled_options = (False,) if args.no_scaled else (False, True)
+    results = benchmark_display_formats(APPLICATION_WINDOW_SIZE, surfaces, args.blits, args.depths, scaled_options)
+    pygame.quit()
+
+    print(f'{len(image_paths)} images, {len(BENCHMARK_TEXT)} strings, {args.blits} blits each')
+    print(f'{"depth":>6}{"scaled":>8}{"actual":>8}{"loaded/s":>12}{"prepared/s":>12}{"speedup":>9}')
+    for result in results:
+        label = f'{result["bit_depth"]:>6}{str(result["scaled"]):>8}'
+        if 'error' in result:
+            print(f'{label}  could not open the display: {result["error"]}')
+            continue
+        speedup = result['prepared_blits_per_s'] / result['loaded_blits_per_s'] if result['loaded_blits_per_s'] else 0
+        print(f'{label}{result["actual_bit_depth"]:>8}{result["loaded_blits_per_s"]:>12.0f}'
+              f'{result["prepared_blits_per_s"]:>12.0f}{speedup:>8.2f}x')
+    return 0 if any('error' not in result for result in results) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -14,17 +14,37 @@ Note:
 
 # engine tests
 from src.engine.animation_test import AnimationTestCases
+from src.engine.autosave_test import AutosaveTestCases
+from src.engine.back_buffer_test import BackBufferTestCases
 from src.engine.cache_test import CacheTestCases
+from src.engine.dirty_rects_test import DirtyRectsTestCases
+from src.engine.hot_reload_test import HotReloadTestCases
 from src.engine.input_test import InputTestCases
+from src.engine.loader_test import LoaderTestCases
+from src.engine.particles_test import ParticleSystemTestCases
+from src.engine.pixel_format_test import PixelFormatTestCases
+from src.engine.render_queue_test import RenderQueueTestCases
 from src.engine.resource_test import ResourceTestCases
+from src.engine.scroll_list_test import ScrollListTestCases
+from src.engine.sound_cache_test import SoundCacheTestCases
+from src.engine.text_test import TextTestCases
 from src.engine.time_utility_test import TimeTestCases
+from src.engine.transform_test import TransformTestCases
 from src.engine.utilities_test import UtilitiesTestCases
 
 # game tests
 from src.gembo.update_modes._update_mode_test import UpdateModeTestCases
 from src.gembo.game_data_test import GameDataTestCases
+from src.gembo.rollups_test import RollupsTestCases
+from src.gembo.save_format_test import SaveFormatTestCases
+from src.gembo.statistics_store_test import StatisticsStoreTestCases
+from src.gembo.stats_report_test import StatsReportTestCases
+from src.gembo.streak_analytics_test import StreakAnalyticsTestCases
+from src.gembo.streak_log_test import StreakLogTestCases
 from src.gembo.gameplay.game_object_test import GameObjectTestCases
 from src.gembo.gameplay.cactus_test import CactusTestCases
+from src.gembo.gameplay.render_graph_test import RenderGraphTestCases
+from src.gembo.renderer.render_menu_test import RenderMenuTestCases
 
 # profiler tests -------------------------------------------------------------------------------------------------------
 
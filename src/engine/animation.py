@@ -18,6 +18,10 @@ class SpriteAnimation:
     def update_duration(self, new_duration_s):
         self.duration_s = new_duration_s
 
+    def update_surfaces(self, new_animation_surfaces):
+        assert new_animation_surfaces is not None
+        self.animation_surfaces = new_animation_surfaces
+
     def play(self, loop:bool=False):
         """ start anim from the beginning when called """
         self.loop_playing_animation = loop
@@ -68,32 +72,48 @@ class SpriteAnimation:
 class SpriteAnimator:
     def __init__(self):
         self.animations = {}
+        # mirrored copies of animations, stored under the same name as the original
         self.flipped_animations = {}
 
     def register_animation(self, name: str, animation: SpriteAnimation):
         if name not in self.animations:
             self.animations[name] = animation
 
-    def update_animation_duration(self, name, new_duration_s):
-        if name in self.animations:
-            self.animations[name].update_duration(new_duration_s)
+    def register_flipped_animation(self, name: str, animation: SpriteAnimation):
+        if name not in self.flipped_animations:
+            self.flipped_animations[name] = animation
 
-    def play_animation(self, name, loop=True):
-        if name in self.animations:
-            self.animations[name].play(loop)
+    def register_mirrored_animation(self, name: str, transform_cache):
+        """ uses the transform cache to build a mirrored copy of an already registered animation """
+        if name in self.animations and name not in self.flipped_animations:
+            self.flipped_animations[name] = transform_cache.build_mirrored_animation(self.animations[name])
 
-    def pause_animation(self, name):
-        if name in self.animations:
-            self.animations[name].pause()
+    def _get_animations_with_name(self, name):
+        """ returns the animation and its mirrored copy, if either is registered """
+        return [anims[name] for anims in (self.animations, self.flipped_animations) if name in anims]
 
-    def unpause_animation(self, name):
-        if name in self.animations:
-            self.animations[name].unpause()
+    def update_animation_surfaces(self, name, new_animation_surfaces, flipped: bool = False):
+        animations = self.flipped_animations if flipped else self.animations
+        if name in animations:
+            animations[name].update_surfaces(new_animation_surfaces)
 
-    def get_animation_frame(self, name):
-        if name in self.animations:
-            return self.animations[name].get_frame()
+    def update_animation_duration(self, name, new_duration_s):
+        for animation in self._get_animations_with_name(name):
+            animation.update_duration(new_duration_s)
 
+    def play_animation(self, name, loop=True):
+        for animation in self._get_animations_with_name(name):
+            animation.play(loop)
 
+    def pause_animation(self, name):
+        for animation in self._get_animations_with_name(name):
+            animation.pause()
 
+    def unpause_animation(self, name):
+        for animation in self._get_animations_with_name(name):
+            animation.unpause()
 
+    def get_animation_frame(self, name, flipped: bool = False):
+        animations = self.flipped_animations if flipped else self.animations
+        if name in animations:
+            return animations[name].get_frame()
@@ -0,0 +1,106 @@
+import threading
+import time
+
+
+class Autosaver:
+    """ The Autosaver writes snapshots of the game's progress on a background thread, so a crash loses a few seconds
+    of play, instead of the whole session.
+
+    The main thread calls mark_dirty whenever something worth saving happens (it's cheap, call it as often as you
+    like), and update once per frame.  update takes a snapshot at most once every min_interval_s, no matter how
+    many changes happened in between, and also every periodic_interval_s, even if nothing was marked.  The snapshot
+    is handed to the worker thread, which calls fn_write with it.  If the worker is still busy writing, a newer
+    snapshot replaces the waiting one, so only the latest state is ever written.
+
+    fn_snapshot runs on the main thread, and must return something fn_write can use on another thread (ie: a copy)
+    """
+    def __init__(self,
+                 fn_snapshot: callable,
+                 fn_write: callable,
+                 min_interval_s: float = 5.0,
+                 periodic_interval_s: float = 60.0,
+                 fn_time: callable = time.monotonic):
+        self.fn_snapshot = fn_snapshot
+        self.fn_write = fn_write
+        self.min_interval_s = min_interval_s
+        self.periodic_interval_s = periodic_interval_s
+        self.fn_time = fn_time
+
+        self.is_dirty: bool = False
+        self.last_snapshot_at = self.fn_time()
+
+        # the newest snapshot the worker hasn't written yet.  There is only ever one
+        self._pending_snapshot = None
+        self._lock = threading.Lock()
+        self._wake_event = threading.Event()
+        self._stop_event = threading.Event()
+        self._thread: threading.Thread = None
+
+        # counters, so we can see how much coalescing is happening
+        self.snapshots_taken: int = 0
+        self.writes: int = 0
+
+    def mark_dirty(self):
+        self.is_dirty = True
+
+    def update(self) -> bool:
+        """ Call once per frame, on the main thread
+
+        Returns:
+            took_snapshot(bool) - True, if a save was handed to the worker
+        """
+        elapsed_s = self.fn_time() - self.last_snapshot_at
+        if elapsed_s < self.min_interval_s:
+            return False
+        if not self.is_dirty and elapsed_s < self.periodic_interval_s:
+            return False
+
+        self.submit(self.fn_snapshot())
+        return True
+
+    def submit(self, snapshot):
+        """ queues this snapshot for the worker, replacing any snapshot which is still waiting """
+        with self._lock:
+            self._pending_snapshot = snapshot
+        self.is_dirty = False
+        self.last_snapshot_at = self.fn_time()
+        self.snapshots_taken += 1
+        self._wake_event.set()
+
+    def write_pending(self) -> bool:
+        """ writes the waiting snapshot, if there is one.  The worker calls this, but it's safe from any thread """
+        with self._lock:
+            snapshot = self._pending_snapshot
+            self._pending_snapshot = None
+        if snapshot is None:
+            return False
+
+        self.fn_write(snapshot)
+        self.writes += 1
+        return True
+
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> bool:
+        if self.is_running():
+            return False
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name='Autosaver', daemon=True)
+        self._thread.start()
+        return True
+
+    def stop(self):
+        """ stops the worker, after it writes any snapshot which is still waiting """
+        self._stop_event.set()
+        self._wake_event.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.write_pending()
+
+    def _run(self):
+        while not self._stop_event.is_set():
+            self._wake_event.wait()
+            self._wake_event.clear()
+            self.write_pending()
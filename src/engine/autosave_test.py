@@ -0,0 +1,108 @@
+import unittest
+from src.test import AbstractTestBase as TestCase
+
+import threading
+
+from src.engine.autosave import Autosaver
+
+
+class AutosaveTestCases(TestCase):
+
+    # test utilities ---------------------------------------------------------------------------------------------------
+
+    class MockClock:
+        """ time only moves when the test says so """
+        def __init__(self):
+            self.now = 0.0
+
+        def __call__(self):
+            return self.now
+
+    def make_autosaver(self, min_interval_s=5.0, periodic_interval_s=60.0):
+        self.clock = self.MockClock()
+        self.snapshot_value = 0
+        self.written = []
+        return Autosaver(fn_snapshot=lambda: self.snapshot_value,
+                         fn_write=self.written.append,
+                         min_interval_s=min_interval_s,
+                         periodic_interval_s=periodic_interval_s,
+                         fn_time=self.clock)
+
+    def test_framework_can_pass_a_test(self):
+        self.assertTrue(True)
+
+
+    # class Autosaver --------------------------------------------------------------------------------------------------
+
+    def test__classAutosaver__exists(self):
+        self.assertIsNotNone(Autosaver)
+
+    # fn update --------------------------------------------------------------------------------------------------------
+
+    def test__classAutosaver__fnUpdate__doesNothing__whenClean(self):
+        autosaver = self.make_autosaver()
+        self.clock.now = 10.0
+        self.assertFalse(autosaver.update())
+
+    def test__classAutosaver__fnUpdate__coalescesChanges__intoOneSnapshotPerInterval(self):
+        autosaver = self.make_autosaver(min_interval_s=5.0)
+        self.clock.now = 5.0
+        for i in range(100):
+            self.snapshot_value = i
+            autosaver.mark_dirty()
+            autosaver.update()
+        self.assertEqual(autosaver.snapshots_taken, 1)
+
+        # still inside the interval, so nothing new is taken, even though it's dirty
+        self.clock.now = 9.0
+        self.assertFalse(autosaver.update())
+
+        self.clock.now = 10.0
+        self.assertTrue(autosaver.update())
+        self.assertEqual(autosaver.snapshots_taken, 2)
+
+    def test__classAutosaver__fnUpdate__takesPeriodicSnapshot__withoutChanges(self):
+        autosaver = self.make_autosaver(periodic_interval_s=60.0)
+        self.clock.now = 60.0
+        self.assertTrue(autosaver.update())
+
+    # fn write_pending -------------------------------------------------------------------------------------------------
+
+    def test__classAutosaver__fnWritePending__writesOnlyLatestSnapshot(self):
+        autosaver = self.make_autosaver()
+        autosaver.submit('old')
+        autosaver.submit('new')
+        self.assertTrue(autosaver.write_pending())
+        self.assertFalse(autosaver.write_pending())
+        self.assertEqual(self.written, ['new'])
+
+    # fn start / stop --------------------------------------------------------------------------------------------------
+
+    def test__classAutosaver__fnStart__writesOnBackgroundThread(self):
+        autosaver = self.make_autosaver()
+        written_on = []
+        was_written = threading.Event()
+
+        def write(snapshot):
+            written_on.append(threading.current_thread().name)
+            was_written.set()
+        autosaver.fn_write = write
+
+        self.assertTrue(autosaver.start())
+        self.assertTrue(autosaver.is_running())
+        autosaver.submit('snapshot')
+        self.assertTrue(was_written.wait(timeout=2.0))
+        autosaver.stop()
+
+        self.assertFalse(autosaver.is_running())
+        self.assertEqual(written_on, ['Autosaver'])
+
+    def test__classAutosaver__fnStop__writesPendingSnapshot__whenNotStarted(self):
+        autosaver = self.make_autosaver()
+        autosaver.submit('snapshot')
+        autosaver.stop()
+        self.assertEqual(self.written, ['snapshot'])
+
+
+if __name__ == '__main__':
+    unittest.main()
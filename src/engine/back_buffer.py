@@ -0,0 +1,59 @@
+from pygame.rect import Rect
+from pygame.surface import Surface
+from pygame.transform import scale as pygame_scale
+
+
+class BackBuffer:
+    """ The BackBuffer is what the game draws into, at the logical resolution the layout is designed for.  If the
+    window is a whole multiple of that (see EngineData.window_scale), it's scaled up into the window once per frame,
+    so a big window costs no more to draw than a small one, only the final copy grows.
+
+    With a scale of 1, the back buffer is the display surface itself, and presenting does nothing.
+
+    Scaling is nearest neighbour, by a whole number, so every logical pixel becomes a sharp scale x scale block
+    """
+    def __init__(self, display_surface: Surface, window_scale: int = 1):
+        self.display_surface = display_surface
+        self.window_scale = window_scale
+
+        if window_scale == 1:
+            self.surface = display_surface
+        else:
+            display_width, display_height = display_surface.get_size()
+            logical_size = (display_width // window_scale, display_height // window_scale)
+            self.surface = Surface(logical_size, 0, display_surface)
+
+    def is_scaled(self) -> bool:
+        return self.surface is not self.display_surface
+
+    def get_window_rect(self, rect: Rect) -> Rect:
+        """ returns the part of the window a rect of the back buffer ends up in """
+        scale = self.window_scale
+        return Rect(rect.x * scale, rect.y * scale, rect.width * scale, rect.height * scale)
+
+    def present(self, rects: list[Rect] = None) -> list[Rect]:
+        """ Scales the back buffer up into the window
+
+        Args:
+            rects(list[Rect]) - only these parts of the back buffer changed, or None for all of it
+
+        Returns:
+            window_rects(list[Rect]) - the parts of the window which changed, for pygame.display.update
+        """
+        if not self.is_scaled():
+            return rects
+
+        if rects is None:
+            pygame_scale(self.surface, self.display_surface.get_size(), self.display_surface)
+            return [self.display_surface.get_rect()]
+
+        window_rects = []
+        back_buffer_rect = self.surface.get_rect()
+        for rect in rects:
+            rect = Rect(rect).clip(back_buffer_rect)
+            if rect.width <= 0 or rect.height <= 0:
+                continue
+            window_rect = self.get_window_rect(rect)
+            pygame_scale(self.surface.subsurface(rect), window_rect.size, self.display_surface.subsurface(window_rect))
+            window_rects.append(window_rect)
+        return window_rects
@@ -0,0 +1,59 @@
+import unittest
+from src.test import AbstractTestBase as TestCase
+
+import pygame
+
+from src.engine.back_buffer import BackBuffer
+
+
+class BackBufferTestCases(TestCase):
+
+    # test utilities ---------------------------------------------------------------------------------------------------
+
+    def setUp(self):
+        self.display_surface = pygame.Surface((60, 90))
+
+    def test_framework_can_pass_a_test(self):
+        self.assertTrue(True)
+
+
+    # class BackBuffer -------------------------------------------------------------------------------------------------
+
+    def test__classBackBuffer__fnInit__drawsStraightToDisplay__atScaleOne(self):
+        back_buffer = BackBuffer(self.display_surface)
+        self.assertIs(back_buffer.surface, self.display_surface)
+        self.assertFalse(back_buffer.is_scaled())
+        rects = [pygame.Rect(1, 2, 3, 4)]
+        self.assertIs(back_buffer.present(rects), rects)
+
+    def test__classBackBuffer__fnInit__makesLogicalSizeSurface(self):
+        back_buffer = BackBuffer(self.display_surface, 3)
+        self.assertEqual(back_buffer.surface.get_size(), (20, 30))
+        self.assertTrue(back_buffer.is_scaled())
+
+    def test__classBackBuffer__fnPresent__scalesWholeBufferIntoDisplay(self):
+        back_buffer = BackBuffer(self.display_surface, 3)
+        back_buffer.surface.set_at((1, 2), (255, 0, 0))
+        self.assertEqual(back_buffer.present(), [self.display_surface.get_rect()])
+        for x, y in [(3, 6), (5, 8)]:
+            self.assertEqual(tuple(self.display_surface.get_at((x, y)))[:3], (255, 0, 0))
+        self.assertEqual(tuple(self.display_surface.get_at((6, 6)))[:3], (0, 0, 0))
+
+    def test__classBackBuffer__fnPresent__scalesOnlyDirtyRects(self):
+        back_buffer = BackBuffer(self.display_surface, 3)
+        back_buffer.surface.fill((255, 0, 0))
+        window_rects = back_buffer.present([pygame.Rect(2, 2, 4, 1)])
+        self.assertEqual(window_rects, [pygame.Rect(6, 6, 12, 3)])
+        self.assertEqual(tuple(self.display_surface.get_at((6, 6)))[:3], (255, 0, 0))
+        self.assertEqual(tuple(self.display_surface.get_at((17, 8)))[:3], (255, 0, 0))
+        self.assertEqual(tuple(self.display_surface.get_at((18, 8)))[:3], (0, 0, 0))
+        self.assertEqual(tuple(self.display_surface.get_at((0, 0)))[:3], (0, 0, 0))
+
+    def test__classBackBuffer__fnPresent__clipsRects__andSkipsEmptyOnes(self):
+        back_buffer = BackBuffer(self.display_surface, 3)
+        window_rects = back_buffer.present([pygame.Rect(18, 28, 10, 10), pygame.Rect(50, 50, 5, 5)])
+        self.assertEqual(window_rects, [pygame.Rect(54, 84, 6, 6)])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,113 @@
+from pygame.rect import Rect
+
+
+class DirtyRectTracker:
+    """ The DirtyRectTracker lets a frame be presented with pygame.display.update(rects), instead of flip.  Everything
+    drawn during a frame is reported with add, as the rect it covered, and a key for what was drawn there (ie: the
+    source surface, or the text and its glyph atlas).
+
+    At the end of the frame, a rect is dirty if something was drawn there this frame and not last frame, or the
+    other way around.  So a sprite which moved dirties its old and new bounds, text which changed dirties its
+    bounds, and a static menu dirties nothing at all.  Two overlapping things which swapped their draw order are
+    dirty too.
+
+    Before drawing, the caller clears everything drawn last frame (see get_previous_rects), so the surface always
+    ends up exactly as a full redraw would leave it.  Only the presenting is partial
+    """
+    def __init__(self, max_rects: int = 32):
+        # past this many dirty rects, they're merged into one, since each rect costs the display some overhead
+        self.max_rects = max_rects
+
+        # [(rect as a tuple, key)] drawn during the previous, and the current frame, in draw order
+        self._previous_entries = []
+        self._current_entries = []
+
+        # until the first frame has been presented, the whole display is unknown
+        self._is_full_update_needed = True
+
+        # drawn over the frame after end_frame, by the debug overlay, so they're cleared and presented next frame
+        self._overlay_rects = []
+
+        # what actually changed last frame, not counting the overlay, and its size, for the debug overlay
+        self.changed_rects = []
+        self.dirty_area: int = 0
+
+    def add(self, rect: Rect, key=None):
+        """ reports that something identified by key was drawn over rect this frame """
+        if rect is not None and rect.width > 0 and rect.height > 0:
+            self._current_entries.append((tuple(rect), key))
+
+    def invalidate(self):
+        """ the next frame presents the whole display, ie: after the window was uncovered, or the mode changed """
+        self._is_full_update_needed = True
+
+    def is_full_update_needed(self) -> bool:
+        return self._is_full_update_needed
+
+    def get_previous_rects(self) -> list[Rect]:
+        """ returns the rects drawn last frame, which have to be cleared before this frame is drawn """
+        return [Rect(rect) for rect in {rect for rect, _ in self._previous_entries}] + self._overlay_rects
+
+    def end_frame(self, display_rect: Rect) -> list[Rect]:
+        """ Finishes the frame, and starts the next one
+
+        Args:
+            display_rect(Rect) - the whole display, which is returned if everything needs to be presented
+
+        Returns:
+            dirty_rects(list[Rect]) - the rects to pass to pygame.display.update, or [] if nothing changed
+        """
+        previous_set = set(self._previous_entries)
+        current_set = set(self._current_entries)
+        changed_entries = previous_set ^ current_set
+        changed_entries.update(self.get_reordered_entries(self._previous_entries, previous_set,
+                                                          self._current_entries, current_set))
+        self._previous_entries = self._current_entries
+        self._current_entries = []
+
+        if self._is_full_update_needed:
+            self._is_full_update_needed = False
+            self.changed_rects = [Rect(display_rect)]
+        else:
+            self.changed_rects = self.merge_rects([Rect(rect) for rect in {rect for rect, _ in changed_entries}])
+        self.dirty_area = sum(rect.width * rect.height for rect in self.changed_rects)
+
+        dirty_rects = self.changed_rects + self._overlay_rects
+        self._overlay_rects = []
+        return dirty_rects
+
+    @staticmethod
+    def get_reordered_entries(previous_entries: list, previous_set: set, current_entries: list, current_set: set) -> set:
+        """ returns the entries which were drawn both frames, but overlap something they swapped draw order with """
+        previous_order = [entry for entry in previous_entries if entry in current_set]
+        current_order = [entry for entry in current_entries if entry in previous_set]
+        if previous_order == current_order:
+            return set()
+
+        # rare, so the pairwise check is fine
+        previous_index = {entry: index for index, entry in enumerate(previous_order)}
+        reordered_entries = set()
+        for index, entry in enumerate(current_order):
+            rect = Rect(entry[0])
+            for other in current_order[index + 1:]:
+                if previous_index[other] < previous_index[entry] and rect.colliderect(other[0]):
+                    reordered_entries.update([entry, other])
+        return reordered_entries
+
+    def set_overlay_rects(self, rects: list[Rect]):
+        """ for the debug overlay, which draws after end_frame.  These are cleared and presented next frame, but never
+        count as changes, so the overlay doesn't outline its own outlines
+        """
+        self._overlay_rects = [Rect(rect) for rect in rects]
+
+    def merge_rects(self, rects: list[Rect]) -> list[Rect]:
+        """ drops rects which are inside another one, and merges everything into one rect, if there are too many """
+        rects = sorted(rects, key=lambda rect: rect.width * rect.height, reverse=True)
+        merged_rects = []
+        for rect in rects:
+            if not any(other.contains(rect) for other in merged_rects):
+                merged_rects.append(rect)
+
+        if len(merged_rects) > self.max_rects:
+            return [merged_rects[0].unionall(merged_rects[1:])]
+        return merged_rects
@@ -0,0 +1,98 @@
+import unittest
+from src.test import AbstractTestBase as TestCase
+
+from pygame.rect import Rect
+
+from src.engine.dirty_rects import DirtyRectTracker
+
+
+DISPLAY_RECT = Rect(0, 0, 480, 640)
+
+
+class DirtyRectsTestCases(TestCase):
+
+    # test utilities ---------------------------------------------------------------------------------------------------
+
+    @staticmethod
+    def make_tracker(*entries):
+        """ returns a tracker which has already presented one frame, with these (rect, key) entries """
+        tracker = DirtyRectTracker()
+        for rect, key in entries:
+            tracker.add(Rect(rect), key)
+        tracker.end_frame(DISPLAY_RECT)
+        return tracker
+
+    def test_framework_can_pass_a_test(self):
+        self.assertTrue(True)
+
+
+    # class DirtyRectTracker -------------------------------------------------------------------------------------------
+
+    def test__classDirtyRectTracker__exists(self):
+        self.assertIsNotNone(DirtyRectTracker)
+
+    def test__classDirtyRectTracker__fnEndFrame__returnsWholeDisplay__forFirstFrame(self):
+        tracker = DirtyRectTracker()
+        tracker.add(Rect(0, 0, 10, 10), 'a')
+        self.assertEqual(tracker.end_frame(DISPLAY_RECT), [DISPLAY_RECT])
+        self.assertFalse(tracker.is_full_update_needed())
+
+    def test__classDirtyRectTracker__fnEndFrame__returnsNothing__forUnchangedFrame(self):
+        tracker = self.make_tracker(((0, 0, 10, 10), 'a'), ((20, 0, 10, 10), 'b'))
+        tracker.add(Rect(0, 0, 10, 10), 'a')
+        tracker.add(Rect(20, 0, 10, 10), 'b')
+        self.assertEqual(tracker.end_frame(DISPLAY_RECT), [])
+
+    def test__classDirtyRectTracker__fnEndFrame__returnsOldAndNewBounds__forMovedSprite(self):
+        tracker = self.make_tracker(((0, 0, 10, 10), 'sprite'), ((100, 0, 10, 10), 'still'))
+        tracker.add(Rect(5, 0, 10, 10), 'sprite')
+        tracker.add(Rect(100, 0, 10, 10), 'still')
+        dirty_rects = tracker.end_frame(DISPLAY_RECT)
+        self.assertEqual(sorted(map(tuple, dirty_rects)), [(0, 0, 10, 10), (5, 0, 10, 10)])
+
+    def test__classDirtyRectTracker__fnEndFrame__returnsBounds__forChangedContent(self):
+        tracker = self.make_tracker(((0, 0, 40, 10), ('timer', '00m 01s')))
+        tracker.add(Rect(0, 0, 40, 10), ('timer', '00m 02s'))
+        self.assertEqual(tracker.end_frame(DISPLAY_RECT), [Rect(0, 0, 40, 10)])
+
+    def test__classDirtyRectTracker__fnEndFrame__returnsOverlap__whenDrawOrderSwaps(self):
+        tracker = self.make_tracker(((0, 0, 10, 10), 'player'), ((5, 5, 10, 10), 'cactus'), ((50, 50, 5, 5), 'gem'))
+        tracker.add(Rect(50, 50, 5, 5), 'gem')
+        tracker.add(Rect(5, 5, 10, 10), 'cactus')
+        tracker.add(Rect(0, 0, 10, 10), 'player')
+        dirty_rects = tracker.end_frame(DISPLAY_RECT)
+        self.assertEqual(sorted(map(tuple, dirty_rects)), [(0, 0, 10, 10), (5, 5, 10, 10)])
+
+    def test__classDirtyRectTracker__fnGetPreviousRects__returnsLastFramesRects(self):
+        tracker = self.make_tracker(((0, 0, 10, 10), 'a'), ((0, 0, 10, 10), 'b'))
+        self.assertEqual(tracker.get_previous_rects(), [Rect(0, 0, 10, 10)])
+
+    def test__classDirtyRectTracker__fnAdd__ignoresEmptyRects(self):
+        tracker = self.make_tracker()
+        tracker.add(Rect(0, 0, 0, 10), 'clipped')
+        tracker.add(None, 'nothing')
+        self.assertEqual(tracker.end_frame(DISPLAY_RECT), [])
+
+    def test__classDirtyRectTracker__fnInvalidate__returnsWholeDisplay(self):
+        tracker = self.make_tracker(((0, 0, 10, 10), 'a'))
+        tracker.invalidate()
+        tracker.add(Rect(0, 0, 10, 10), 'a')
+        self.assertEqual(tracker.end_frame(DISPLAY_RECT), [DISPLAY_RECT])
+
+    def test__classDirtyRectTracker__fnSetOverlayRects__clearsAndPresentsThemOnce(self):
+        tracker = self.make_tracker()
+        tracker.set_overlay_rects([Rect(0, 0, 10, 10)])
+        self.assertEqual(tracker.get_previous_rects(), [Rect(0, 0, 10, 10)])
+        self.assertEqual(tracker.end_frame(DISPLAY_RECT), [Rect(0, 0, 10, 10)])
+        self.assertEqual(tracker.changed_rects, [])
+        self.assertEqual(tracker.end_frame(DISPLAY_RECT), [])
+
+    def test__classDirtyRectTracker__fnMergeRects__dropsContainedRects__andMergesTooMany(self):
+        tracker = DirtyRectTracker(max_rects=2)
+        self.assertEqual(tracker.merge_rects([Rect(2, 2, 2, 2), Rect(0, 0, 10, 10)]), [Rect(0, 0, 10, 10)])
+        merged = tracker.merge_rects([Rect(0, 0, 1, 1), Rect(10, 0, 1, 1), Rect(0, 10, 1, 1)])
+        self.assertEqual(merged, [Rect(0, 0, 11, 11)])
+
+
+if __name__ == '__main__':
+    unittest.main()
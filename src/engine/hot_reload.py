@@ -0,0 +1,131 @@
+from dataclasses import dataclass
+from enum import Enum
+import os
+import queue
+import threading
+
+from pygame import (image as pygame_image,
+                    error as pygame_error)
+
+
+class EAssetKind(str, Enum):
+    """ The kinds of asset the AssetWatcher knows how to decode
+
+    IMAGE - decoded into an (unconverted) Surface on the watcher thread
+    FONT - read into bytes on the watcher thread, because a Font also needs a size, which the game knows
+    """
+    IMAGE = 'IMAGE',
+    FONT = 'FONT',
+
+
+@dataclass(frozen=True)
+class ReloadedAsset:
+    """ A changed asset, which has already been decoded, and is waiting to be swapped in by the main thread """
+    kind: EAssetKind
+    path: str
+    data: any = None
+
+
+class AssetWatcher:
+    """ The AssetWatcher polls the modification time of every watched file, on a background thread, at a low rate.
+    When a file changes, it is decoded on that thread, and queued.  The main thread drains the queue between frames
+    (see get_pending_changes), and swaps the new assets in, so the frame never waits on disk or on a decoder.
+
+    This is a development tool, so it's opt-in, see EngineData.hot_reload_assets
+    """
+    def __init__(self, poll_interval_s: float = 1.0):
+        self.poll_interval_s = poll_interval_s
+
+        # maps a path to (kind, last seen mtime_ns)
+        self.watched_files = {}
+
+        # decoded assets, waiting for the main thread
+        self.pending_changes = queue.Queue()
+
+        self._stop_event = threading.Event()
+        self._thread: threading.Thread = None
+
+    @staticmethod
+    def get_mtime_ns(path: str):
+        try:
+            return os.stat(path).st_mtime_ns
+        except OSError:
+            return None
+
+    def watch(self, path: str, kind: EAssetKind) -> bool:
+        """ Starts watching this file.  The current version is assumed to be loaded already
+
+        Returns:
+            was_added(bool) - False, if the path is invalid or already watched
+        """
+        if path is None or not path or not isinstance(path, str) or not isinstance(kind, EAssetKind):
+            return False
+        if path in self.watched_files:
+            return False
+        self.watched_files[path] = (kind, self.get_mtime_ns(path))
+        return True
+
+    @staticmethod
+    def decode(kind: EAssetKind, path: str):
+        """ does the expensive part of loading, which is safe to do off the main thread """
+        if kind == EAssetKind.IMAGE:
+            # convert_alpha needs the display, so that is left for the main thread
+            return pygame_image.load(path)
+        elif kind == EAssetKind.FONT:
+            with open(path, 'rb') as infile:
+                return infile.read()
+
+    def poll(self) -> int:
+        """ Checks every watched file once, and queues any which changed
+
+        Returns:
+            changed_count(int) - the number of assets which were queued
+        """
+        changed_count = 0
+        for path, (kind, last_mtime_ns) in list(self.watched_files.items()):
+            mtime_ns = self.get_mtime_ns(path)
+            if mtime_ns is None or mtime_ns == last_mtime_ns:
+                continue
+
+            try:
+                data = self.decode(kind, path)
+            except (pygame_error, OSError) as err:
+                # the file may be half written; the mtime isn't recorded, so this is retried on the next poll
+                print(f'Could not reload asset="{path}"\n{err}')
+                continue
+
+            self.watched_files[path] = (kind, mtime_ns)
+            self.pending_changes.put(ReloadedAsset(kind=kind, path=path, data=data))
+            changed_count += 1
+
+        return changed_count
+
+    def get_pending_changes(self) -> list[ReloadedAsset]:
+        """ returns every decoded asset which is waiting to be swapped in, without blocking """
+        changes = []
+        while True:
+            try:
+                changes.append(self.pending_changes.get_nowait())
+            except queue.Empty:
+                return changes
+
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> bool:
+        if self.is_running():
+            return False
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name='AssetWatcher', daemon=True)
+        self._thread.start()
+        return True
+
+    def stop(self):
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        while not self._stop_event.wait(self.poll_interval_s):
+            self.poll()
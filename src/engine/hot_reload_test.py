@@ -0,0 +1,132 @@
+import unittest
+from src.test import AbstractTestBase as TestCase
+
+import os
+import time
+
+import pygame
+
+from src.engine.hot_reload import AssetWatcher, EAssetKind, ReloadedAsset
+
+
+class HotReloadTestCases(TestCase):
+
+    # test utilities ---------------------------------------------------------------------------------------------------
+
+    def setUp(self):
+        self.test_image_path = 'deleteme.png'
+        self.test_font_path = 'deleteme.ttf'
+        self.write_test_image((2, 2))
+        self.assertCreateFile(self.test_font_path, 'font')
+
+    def tearDown(self):
+        for path in [self.test_image_path, self.test_font_path]:
+            if os.path.exists(path):
+                self.assertRemoveFile(path)
+
+    def write_test_image(self, size):
+        pygame.image.save(pygame.surface.Surface(size), self.test_image_path)
+
+    @staticmethod
+    def touch(path: str):
+        # bump the mtime forward, so the change is seen even on a coarse filesystem clock
+        stat = os.stat(path)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    def test_framework_can_pass_a_test(self):
+        self.assertTrue(True)
+
+
+    # EAssetKind -------------------------------------------------------------------------------------------------------
+
+    def test__enumEAssetKind__containsExpectedValues(self):
+        self.assertEqual(len(EAssetKind), 2)
+        self.assertEqual('IMAGE', EAssetKind.IMAGE)
+        self.assertEqual('FONT', EAssetKind.FONT)
+
+
+    # class AssetWatcher -----------------------------------------------------------------------------------------------
+
+    def test__classAssetWatcher__exists(self):
+        self.assertIsNotNone(AssetWatcher)
+
+    # fn watch ---------------------------------------------------------------------------------------------------------
+
+    def test__classAssetWatcher__fnWatch__returnsFalse__forBadArgs(self):
+        watcher = AssetWatcher()
+        self.assertFalse(watcher.watch(None, EAssetKind.IMAGE))
+        self.assertFalse(watcher.watch('', EAssetKind.IMAGE))
+        self.assertFalse(watcher.watch(self.test_image_path, None))
+
+    def test__classAssetWatcher__fnWatch__returnsFalse__forPathAlreadyWatched(self):
+        watcher = AssetWatcher()
+        self.assertTrue(watcher.watch(self.test_image_path, EAssetKind.IMAGE))
+        self.assertFalse(watcher.watch(self.test_image_path, EAssetKind.IMAGE))
+
+    # fn poll ----------------------------------------------------------------------------------------------------------
+
+    def test__classAssetWatcher__fnPoll__queuesNothing__forUnchangedFiles(self):
+        watcher = AssetWatcher()
+        watcher.watch(self.test_image_path, EAssetKind.IMAGE)
+        self.assertEqual(watcher.poll(), 0)
+        self.assertEqual(watcher.get_pending_changes(), [])
+
+    def test__classAssetWatcher__fnPoll__queuesDecodedImage__forChangedImage(self):
+        watcher = AssetWatcher()
+        watcher.watch(self.test_image_path, EAssetKind.IMAGE)
+
+        self.write_test_image((3, 4))
+        self.touch(self.test_image_path)
+        self.assertEqual(watcher.poll(), 1)
+
+        changes = watcher.get_pending_changes()
+        self.assertEqual(len(changes), 1)
+        self.assertIsInstance(changes[0], ReloadedAsset)
+        self.assertEqual(changes[0].kind, EAssetKind.IMAGE)
+        self.assertEqual(changes[0].data.get_size(), (3, 4))
+
+        # the change is only reported once
+        self.assertEqual(watcher.poll(), 0)
+
+    def test__classAssetWatcher__fnPoll__queuesFileBytes__forChangedFont(self):
+        watcher = AssetWatcher()
+        watcher.watch(self.test_font_path, EAssetKind.FONT)
+        self.touch(self.test_font_path)
+        watcher.poll()
+        self.assertEqual(watcher.get_pending_changes()[0].data, b'font')
+
+    def test__classAssetWatcher__fnPoll__retries__ifDecodeFails(self):
+        watcher = AssetWatcher()
+        watcher.watch(self.test_image_path, EAssetKind.IMAGE)
+
+        with open(self.test_image_path, 'w') as outfile:
+            outfile.write('half written')
+        self.touch(self.test_image_path)
+        self.assertEqual(watcher.poll(), 0)
+
+        self.write_test_image((5, 5))
+        self.touch(self.test_image_path)
+        self.assertEqual(watcher.poll(), 1)
+
+    # fn start / stop --------------------------------------------------------------------------------------------------
+
+    def test__classAssetWatcher__fnStart__pollsOnBackgroundThread(self):
+        watcher = AssetWatcher(poll_interval_s=0.01)
+        watcher.watch(self.test_image_path, EAssetKind.IMAGE)
+        self.assertTrue(watcher.start())
+        self.assertTrue(watcher.is_running())
+
+        self.touch(self.test_image_path)
+        changes = []
+        timeout_at = time.time() + 2.0
+        while not changes and time.time() < timeout_at:
+            time.sleep(0.01)
+            changes = watcher.get_pending_changes()
+
+        watcher.stop()
+        self.assertFalse(watcher.is_running())
+        self.assertEqual(len(changes), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,90 @@
+from collections import deque
+from dataclasses import dataclass, field
+import time
+
+
+@dataclass(frozen=True)
+class LoadJob:
+    """ a single unit of loading work, like loading one image, or binding the loaded images to the game data """
+    group: str
+    fn: callable
+    args: tuple = field(default_factory=tuple)
+
+
+class StreamingLoader:
+    """ The StreamingLoader spreads startup work across frames.  Jobs run in the order they were added, and each
+    call to update runs as many as fit into the time budget.  At least one job runs per update, so loading always
+    makes progress, even if a single job is larger than the budget.
+
+    Jobs are tagged with a group, so the game can ask if everything it needs (ie: all the fonts) is ready yet
+    """
+    def __init__(self, fn_time: callable = time.perf_counter):
+        self.fn_time = fn_time
+        self.pending_jobs = deque()
+
+        # maps a group name to the number of jobs which have not run yet
+        self.pending_count_by_group = {}
+
+        self.total_job_count: int = 0
+        self.completed_job_count: int = 0
+
+    def add_job(self, group: str, fn: callable, *args) -> bool:
+        if group is None or not group or not isinstance(group, str) or fn is None or not callable(fn):
+            return False
+
+        self.pending_jobs.append(LoadJob(group=group, fn=fn, args=args))
+        self.pending_count_by_group[group] = self.pending_count_by_group.get(group, 0) + 1
+        self.total_job_count += 1
+        return True
+
+    def run_next_job(self) -> bool:
+        if not self.pending_jobs:
+            return False
+
+        job = self.pending_jobs.popleft()
+        job.fn(*job.args)
+
+        self.pending_count_by_group[job.group] -= 1
+        self.completed_job_count += 1
+        return True
+
+    def update(self, budget_s: float) -> int:
+        """ Runs jobs until the budget is spent, or there are no more jobs
+
+        Args:
+            budget_s(float) - how long this frame can spend loading
+
+        Returns:
+            jobs_run(int) - the number of jobs which ran
+        """
+        started_at = self.fn_time()
+        jobs_run = 0
+        while self.pending_jobs:
+            self.run_next_job()
+            jobs_run += 1
+            if self.fn_time() - started_at >= budget_s:
+                break
+        return jobs_run
+
+    def finish(self) -> int:
+        """ runs every remaining job right now, regardless of budget """
+        jobs_run = 0
+        while self.run_next_job():
+            jobs_run += 1
+        return jobs_run
+
+    def has_group(self, group: str) -> bool:
+        """ True, if any job was ever added to this group """
+        return group in self.pending_count_by_group
+
+    def is_group_ready(self, group: str) -> bool:
+        return self.pending_count_by_group.get(group, 0) == 0
+
+    def is_complete(self) -> bool:
+        return len(self.pending_jobs) == 0
+
+    def get_progress(self) -> float:
+        """ returns how much of the loading is done, from 0.0 to 1.0 """
+        if self.total_job_count == 0:
+            return 1.0
+        return self.completed_job_count / self.total_job_count
@@ -0,0 +1,114 @@
+import unittest
+from src.test import AbstractTestBase as TestCase
+
+from src.engine.loader import LoadJob, StreamingLoader
+
+
+class LoaderTestCases(TestCase):
+
+    # test utilities ---------------------------------------------------------------------------------------------------
+
+    class MockClock:
+        """ every call advances time by one second, so budgets are easy to reason about """
+        def __init__(self):
+            self.now = 0.0
+
+        def __call__(self):
+            self.now += 1.0
+            return self.now
+
+    def test_framework_can_pass_a_test(self):
+        self.assertTrue(True)
+
+
+    # class LoadJob ----------------------------------------------------------------------------------------------------
+
+    def test__classLoadJob__isFrozenDataClass(self):
+        self.assertTrue(LoadJob('group', print).__dataclass_params__.frozen)
+
+
+    # class StreamingLoader --------------------------------------------------------------------------------------------
+
+    def test__classStreamingLoader__exists(self):
+        self.assertIsNotNone(StreamingLoader)
+
+    def test__classStreamingLoader__isComplete__whenEmpty(self):
+        loader = StreamingLoader()
+        self.assertTrue(loader.is_complete())
+        self.assertEqual(loader.get_progress(), 1.0)
+
+    # fn add_job -------------------------------------------------------------------------------------------------------
+
+    def test__classStreamingLoader__fnAddJob__returnsFalse__forBadArgs(self):
+        loader = StreamingLoader()
+        self.assertFalse(loader.add_job(None, print))
+        self.assertFalse(loader.add_job('', print))
+        self.assertFalse(loader.add_job('group', None))
+        self.assertFalse(loader.add_job('group', 'not callable'))
+        self.assertTrue(loader.is_complete())
+
+    def test__classStreamingLoader__fnAddJob__tracksPendingGroups(self):
+        loader = StreamingLoader()
+        self.assertTrue(loader.add_job('fonts', print))
+        self.assertFalse(loader.is_group_ready('fonts'))
+        self.assertTrue(loader.is_group_ready('images'))
+        self.assertFalse(loader.is_complete())
+
+    def test__classStreamingLoader__fnHasGroup__onlyForGroupsWithJobs(self):
+        loader = StreamingLoader()
+        loader.add_job('fonts', print)
+        loader.finish()
+        self.assertTrue(loader.has_group('fonts'))
+        self.assertFalse(loader.has_group('images'))
+
+    # fn update --------------------------------------------------------------------------------------------------------
+
+    def test__classStreamingLoader__fnUpdate__runsJobsInOrderWithArgs(self):
+        loader = StreamingLoader()
+        results = []
+        loader.add_job('a', results.append, 1)
+        loader.add_job('a', results.append, 2)
+        loader.update(budget_s=100.0)
+        self.assertEqual(results, [1, 2])
+
+    def test__classStreamingLoader__fnUpdate__stopsWhenBudgetIsSpent(self):
+        loader = StreamingLoader(fn_time=self.MockClock())
+        results = []
+        for i in range(5):
+            loader.add_job('a', results.append, i)
+
+        # each job "takes" one second on the mock clock
+        self.assertEqual(loader.update(budget_s=2.0), 2)
+        self.assertEqual(results, [0, 1])
+        self.assertEqual(loader.get_progress(), 2 / 5)
+
+    def test__classStreamingLoader__fnUpdate__alwaysRunsOneJob__forZeroBudget(self):
+        loader = StreamingLoader()
+        results = []
+        loader.add_job('a', results.append, 0)
+        loader.add_job('a', results.append, 1)
+        self.assertEqual(loader.update(budget_s=0.0), 1)
+
+    def test__classStreamingLoader__fnUpdate__marksGroupReady__afterItsLastJob(self):
+        loader = StreamingLoader()
+        results = []
+        loader.add_job('fonts', results.append, 'font')
+        loader.add_job('images', results.append, 'image')
+        loader.update(budget_s=0.0)
+        self.assertTrue(loader.is_group_ready('fonts'))
+        self.assertFalse(loader.is_group_ready('images'))
+
+    # fn finish --------------------------------------------------------------------------------------------------------
+
+    def test__classStreamingLoader__fnFinish__runsEveryJob(self):
+        loader = StreamingLoader()
+        results = []
+        for i in range(3):
+            loader.add_job('a', results.append, i)
+        self.assertEqual(loader.finish(), 3)
+        self.assertTrue(loader.is_complete())
+        self.assertEqual(loader.get_progress(), 1.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
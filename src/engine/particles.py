@@ -0,0 +1,181 @@
+import math
+
+from pygame.color import Color
+from pygame.locals import RLEACCEL
+from pygame.draw import circle as pygame_draw_circle
+from pygame.rect import Rect
+from pygame.surface import Surface
+
+# numpy is optional.  Without it, there's no ParticleSystem, and the game just doesn't show particles
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+def is_available() -> bool:
+    return np is not None
+
+
+class ParticleSystem:
+    """ The ParticleSystem keeps every particle's position, velocity, age, and lifetime in numpy arrays, one row per
+    particle, so update moves all of them with a few vectorized operations, instead of a python loop.
+
+    The arrays are allocated once, at capacity.  A dead particle's slot goes back on a free list, and the next emit
+    reuses it, so a burst of fireworks doesn't allocate anything.  When every slot is taken, emit drops the rest.
+
+    Each particle is drawn as a small circle, pre-rendered once per color, and once per fade step, shrinking as the
+    particle ages.  get_blit_sequence returns all of them for one Surface.blits call
+    """
+    def __init__(self, capacity: int = 4096, radius: int = 3, fade_steps: int = 6, seed: int = None,
+                 prepare_surface: callable = None):
+        assert is_available()
+
+        self.capacity = capacity
+        self.radius = radius
+        self.fade_steps = fade_steps
+
+        # converts each particle sprite into the display's format, after it's drawn (see pixel_format.prepare_surface)
+        self.prepare_surface: callable = prepare_surface
+
+        self._rng = np.random.default_rng(seed)
+
+        self.positions = np.zeros((capacity, 2), dtype=np.float32)
+        self.velocities = np.zeros((capacity, 2), dtype=np.float32)
+        self.ages = np.zeros(capacity, dtype=np.float32)
+        self.lifetimes = np.ones(capacity, dtype=np.float32)
+        # pixels/s^2 pulling each particle down, and the fraction of its velocity it loses each second
+        self.gravities = np.zeros(capacity, dtype=np.float32)
+        self.drags = np.zeros(capacity, dtype=np.float32)
+        self.color_indices = np.zeros(capacity, dtype=np.int32)
+        self.is_alive = np.zeros(capacity, dtype=bool)
+
+        # a stack of the free slots, the top _free_count entries are free
+        self._free_slots = np.arange(capacity - 1, -1, -1, dtype=np.int32)
+        self._free_count = capacity
+
+        # [Surface], color_index * fade_steps + fade step, and the offset from a particle's center to its sprite's
+        # top left corner, for each one
+        self._color_indices = {}
+        self._sprites = []
+        self._sprite_offsets = np.zeros((0, 2), dtype=np.float32)
+        self._max_sprite_size = 2 * radius + 1
+
+        # counted since the system was made
+        self.emitted_count: int = 0
+        self.dropped_count: int = 0
+
+    def __len__(self) -> int:
+        """ the number of live particles """
+        return self.capacity - self._free_count
+
+    def get_color_index(self, color) -> int:
+        """ returns the index of the color's sprites, drawing them the first time the color is used """
+        color = Color(color)
+        key = tuple(color)
+        if key in self._color_indices:
+            return self._color_indices[key]
+
+        color_index = len(self._color_indices)
+        self._color_indices[key] = color_index
+
+        offsets = []
+        for fade_step in range(self.fade_steps):
+            radius = max(1, round(self.radius * (1 - fade_step / self.fade_steps)))
+            sprite = Surface((2 * radius + 1, 2 * radius + 1))
+            # black is never a particle color, so it's the colorkey
+            sprite.fill((0, 0, 0))
+            pygame_draw_circle(sprite, color, (radius, radius), radius)
+            sprite.set_colorkey((0, 0, 0), RLEACCEL)
+            self._sprites.append(sprite if self.prepare_surface is None else self.prepare_surface(sprite))
+            offsets.append((radius, radius))
+        self._sprite_offsets = np.concatenate([self._sprite_offsets, np.array(offsets, dtype=np.float32)])
+        return color_index
+
+    def emit(self, position, count: int, color, speed=(40.0, 120.0), lifetime_s=(0.4, 0.8),
+             angle=(0.0, 2 * math.pi), gravity: float = 0.0, drag: float = 0.0, spread: float = 0.0) -> int:
+        """ Starts count particles at position, flying out in random directions
+
+        Args:
+            position - where they start, as a tuple or Vector2
+            count(int) - how many to start
+            color - a pygame color, or an EColor
+            speed(tuple) - the lowest and highest starting speed, in pixels/s
+            lifetime_s(tuple) - the shortest and longest lifetime
+            angle(tuple) - the range of directions, in radians, clockwise from the right, since y points down
+            gravity(float) - pixels/s^2, positive pulls down
+            drag(float) - the fraction of its velocity a particle loses each second
+            spread(float) - how far from position they can start, in pixels
+
+        Returns:
+            emitted_count(int) - how many started, which is fewer than count if the system is full
+        """
+        emitted_count = min(count, self._free_count)
+        self.dropped_count += count - emitted_count
+        if emitted_count <= 0:
+            return 0
+
+        self._free_count -= emitted_count
+        slots = self._free_slots[self._free_count:self._free_count + emitted_count]
+
+        rng = self._rng
+        angles = rng.uniform(angle[0], angle[1], emitted_count)
+        speeds = rng.uniform(speed[0], speed[1], emitted_count)
+        self.positions[slots, 0] = position[0] + rng.uniform(-spread, spread, emitted_count)
+        self.positions[slots, 1] = position[1] + rng.uniform(-spread, spread, emitted_count)
+        self.velocities[slots, 0] = np.cos(angles) * speeds
+        self.velocities[slots, 1] = np.sin(angles) * speeds
+        self.ages[slots] = 0.0
+        self.lifetimes[slots] = rng.uniform(lifetime_s[0], lifetime_s[1], emitted_count)
+        self.gravities[slots] = gravity
+        self.drags[slots] = drag
+        self.color_indices[slots] = self.get_color_index(color)
+        self.is_alive[slots] = True
+
+        self.emitted_count += emitted_count
+        return emitted_count
+
+    def update(self, delta_time_s: float):
+        """ moves every particle, and frees the slots of the ones which outlived their lifetime """
+        if self._free_count == self.capacity:
+            return
+
+        # dead slots are moved too, it's cheaper than selecting the live ones, and emit resets them anyway
+        self.velocities *= np.maximum(0.0, 1.0 - self.drags * delta_time_s)[:, None]
+        self.velocities[:, 1] += self.gravities * delta_time_s
+        self.positions += self.velocities * delta_time_s
+        self.ages += delta_time_s
+
+        expired_slots = np.flatnonzero(self.is_alive & (self.ages >= self.lifetimes))
+        expired_count = len(expired_slots)
+        if expired_count:
+            self.is_alive[expired_slots] = False
+            self._free_slots[self._free_count:self._free_count + expired_count] = expired_slots
+            self._free_count += expired_count
+
+    def clear(self):
+        """ kills every particle """
+        self.is_alive[:] = False
+        self._free_slots[:] = np.arange(self.capacity - 1, -1, -1, dtype=np.int32)
+        self._free_count = self.capacity
+
+    def get_blit_sequence(self) -> tuple[list, Rect]:
+        """ Returns a blit for every live particle, for Surface.blits, and the rect they cover together, or
+        ([], None) if there aren't any
+        """
+        slots = np.flatnonzero(self.is_alive)
+        if len(slots) == 0:
+            return [], None
+
+        fade_steps = self.fade_steps
+        fade_step = np.minimum((self.ages[slots] / self.lifetimes[slots] * fade_steps).astype(np.int32), fade_steps - 1)
+        sprite_indices = self.color_indices[slots] * fade_steps + fade_step
+        corners = (self.positions[slots] - self._sprite_offsets[sprite_indices]).astype(np.int32)
+
+        sprites = self._sprites
+        blit_sequence = [(sprites[sprite_index], corner) for sprite_index, corner in
+                         zip(sprite_indices.tolist(), corners.tolist())]
+
+        left, top = corners.min(axis=0).tolist()
+        right, bottom = (corners.max(axis=0) + self._max_sprite_size).tolist()
+        return blit_sequence, Rect(left, top, right - left, bottom - top)
@@ -0,0 +1,95 @@
+import unittest
+from src.test import AbstractTestBase as TestCase
+
+import pygame
+
+from src.engine.particles import ParticleSystem, is_available
+
+
+@unittest.skipUnless(is_available(), 'numpy is not installed')
+class ParticleSystemTestCases(TestCase):
+
+    # test utilities ---------------------------------------------------------------------------------------------------
+
+    def test_framework_can_pass_a_test(self):
+        self.assertTrue(True)
+
+
+    # class ParticleSystem ---------------------------------------------------------------------------------------------
+
+    def test__classParticleSystem__fnEmit__startsParticles(self):
+        particles = ParticleSystem(capacity=64, seed=1)
+        self.assertEqual(particles.emit((10, 20), 5, (255, 0, 0)), 5)
+        self.assertEqual(len(particles), 5)
+        self.assertEqual(particles.emitted_count, 5)
+
+    def test__classParticleSystem__fnEmit__dropsParticles__pastCapacity(self):
+        particles = ParticleSystem(capacity=8, seed=1)
+        self.assertEqual(particles.emit((0, 0), 5, (255, 0, 0)), 5)
+        self.assertEqual(particles.emit((0, 0), 5, (255, 0, 0)), 3)
+        self.assertEqual(particles.emit((0, 0), 5, (255, 0, 0)), 0)
+        self.assertEqual(particles.dropped_count, 7)
+
+    def test__classParticleSystem__fnUpdate__movesByVelocity__withGravityAndDrag(self):
+        particles = ParticleSystem(capacity=4, seed=1)
+        particles.emit((10, 10), 1, (255, 0, 0), speed=(100, 100), lifetime_s=(5, 5), angle=(0, 0), gravity=50.0)
+        slot = int(particles.is_alive.nonzero()[0][0])
+        particles.update(0.5)
+        self.assertAlmostEqual(float(particles.positions[slot, 0]), 60.0, places=3)
+        self.assertAlmostEqual(float(particles.positions[slot, 1]), 22.5, places=3)
+
+        particles.drags[slot] = 1.0
+        particles.update(0.5)
+        self.assertAlmostEqual(float(particles.velocities[slot, 0]), 50.0, places=3)
+
+    def test__classParticleSystem__fnUpdate__recyclesExpiredSlots(self):
+        particles = ParticleSystem(capacity=8, seed=1)
+        particles.emit((0, 0), 8, (255, 0, 0), lifetime_s=(0.1, 0.1))
+        particles.update(0.2)
+        self.assertEqual(len(particles), 0)
+        self.assertEqual(particles.emit((0, 0), 8, (255, 0, 0)), 8)
+        self.assertEqual(particles.dropped_count, 0)
+
+    def test__classParticleSystem__fnUpdate__doesNotGrowArrays(self):
+        particles = ParticleSystem(capacity=16, seed=1)
+        arrays = [particles.positions, particles.velocities, particles.ages, particles.is_alive]
+        for _ in range(10):
+            particles.emit((0, 0), 10, (255, 0, 0), lifetime_s=(0.05, 0.15))
+            particles.update(0.1)
+        self.assertEqual([id(array) for array in arrays],
+                         [id(array) for array in [particles.positions, particles.velocities, particles.ages,
+                                                  particles.is_alive]])
+        self.assertEqual(particles.positions.shape, (16, 2))
+
+    def test__classParticleSystem__fnGetBlitSequence__blitsEachLiveParticle__centered(self):
+        particles = ParticleSystem(capacity=8, radius=3, seed=1)
+        particles.emit((20, 20), 3, (255, 0, 0), speed=(0, 0))
+        blit_sequence, rect = particles.get_blit_sequence()
+        self.assertEqual(len(blit_sequence), 3)
+        self.assertEqual(rect, pygame.Rect(17, 17, 7, 7))
+
+        surface = pygame.Surface((40, 40))
+        surface.blits(blit_sequence, doreturn=False)
+        self.assertEqual(tuple(surface.get_at((20, 20)))[:3], (255, 0, 0))
+        self.assertEqual(tuple(surface.get_at((17, 17)))[:3], (0, 0, 0))
+
+    def test__classParticleSystem__fnGetBlitSequence__returnsNothing__withoutLiveParticles(self):
+        self.assertEqual(ParticleSystem(capacity=8).get_blit_sequence(), ([], None))
+
+    def test__classParticleSystem__fnGetColorIndex__drawsEachColorOnce(self):
+        particles = ParticleSystem(capacity=8, fade_steps=4)
+        self.assertEqual(particles.get_color_index('#FFEB99'), 0)
+        self.assertEqual(particles.get_color_index((255, 235, 153)), 0)
+        self.assertEqual(particles.get_color_index((0, 0, 255)), 1)
+        self.assertEqual(len(particles._sprites), 8)
+
+    def test__classParticleSystem__fnClear__freesEverySlot(self):
+        particles = ParticleSystem(capacity=8)
+        particles.emit((0, 0), 6, (255, 0, 0))
+        particles.clear()
+        self.assertEqual(len(particles), 0)
+        self.assertEqual(particles.emit((0, 0), 8, (255, 0, 0)), 8)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,130 @@
+from enum import Enum
+import random
+import time
+
+import pygame
+from pygame.locals import DOUBLEBUF, HWSURFACE, RLEACCEL, SCALED, SRCALPHA
+from pygame.mask import from_surface as mask_from_surface
+from pygame.surface import Surface
+
+
+SUPPORTED_DISPLAY_BIT_DEPTHS = (16, 24, 32)
+
+# binary alpha images are converted to a colorkey, and this is the key, unless an image uses it
+PREPARED_SURFACE_COLORKEY = (255, 0, 255)
+
+
+class EAlphaKind(str, Enum):
+    """ How a surface uses transparency, which decides the fastest format to blit it in
+
+    OPAQUE - every pixel is fully opaque, so it can be a plain copy in the display's format
+    BINARY - every pixel is fully opaque, or fully transparent, so a colorkey (with RLE) can stand in for alpha
+    BLENDED - some pixels are partly transparent (ie: antialiased edges, and text), so it needs per-pixel alpha
+    """
+    OPAQUE = 'opaque'
+    BINARY = 'binary'
+    BLENDED = 'blended'
+
+
+def get_display_flags(scaled: bool = False) -> int:
+    """ the flags on_init opens the display with.  SCALED lets the window be bigger than the resolution we draw at """
+    flags = HWSURFACE | DOUBLEBUF
+    if scaled:
+        flags |= SCALED
+    return flags
+
+def get_alpha_kind(surface: Surface) -> EAlphaKind:
+    if surface.get_colorkey() is not None:
+        return EAlphaKind.BINARY
+    if not surface.get_flags() & SRCALPHA:
+        return EAlphaKind.OPAQUE
+
+    width, height = surface.get_size()
+    # the masks count the pixels with alpha above the threshold
+    opaque_count = mask_from_surface(surface, 254).count()
+    if opaque_count == width * height:
+        return EAlphaKind.OPAQUE
+    if mask_from_surface(surface, 0).count() == opaque_count:
+        return EAlphaKind.BINARY
+    return EAlphaKind.BLENDED
+
+def prepare_surface(surface: Surface, display_surface: Surface = None) -> Surface:
+    """ Returns a copy of surface, in the fastest format to blit onto the display.  Without that, every blit has to
+    convert the pixels first, ie: a 32 bit image with alpha onto a 16 bit display
+
+    Args:
+        surface(Surface) - a loaded image, or rendered text
+        display_surface(Surface) - defaults to the display.  If there isn't one yet, surface is returned unchanged
+
+    Returns:
+        prepared(Surface) - in the display's format, with a colorkey, if it only needs binary transparency, or
+                            in the display's channel order with per-pixel alpha, if it needs blending
+    """
+    if surface is None:
+        return None
+    display_surface = display_surface or pygame.display.get_surface()
+    if display_surface is None:
+        return surface
+
+    alpha_kind = get_alpha_kind(surface)
+    if alpha_kind == EAlphaKind.OPAQUE:
+        prepared = Surface(surface.get_size(), 0, display_surface)
+        prepared.blit(surface, (0, 0))
+        return prepared
+
+    if alpha_kind == EAlphaKind.BINARY:
+        prepared = Surface(surface.get_size(), 0, display_surface)
+        prepared.fill(PREPARED_SURFACE_COLORKEY)
+        prepared.blit(surface, (0, 0))
+        prepared.set_colorkey(PREPARED_SURFACE_COLORKEY, RLEACCEL)
+
+        # if an opaque pixel was the colorkey's color (after the display rounded it), it would vanish
+        if mask_from_surface(prepared).count() == mask_from_surface(surface, 254).count():
+            return prepared
+
+    # convert_alpha only knows the display's channel order, so without a display, the surface is left as it is
+    if pygame.display.get_surface() is None:
+        return surface
+    return surface.convert_alpha()
+
+
+# benchmark ------------------------------------------------------------------------------------------------------------
+
+def time_blits(display_surface: Surface, surfaces: list[Surface], blit_count: int, seed: int = 0) -> float:
+    """ returns how many blits per second the display takes, of the surfaces, at random positions """
+    display_width, display_height = display_surface.get_size()
+    rng = random.Random(seed)
+    blit_sequence = [(surface, (rng.randrange(display_width), rng.randrange(display_height)))
+                     for surface in (surfaces[index % len(surfaces)] for index in range(blit_count))]
+
+    started_at = time.perf_counter()
+    display_surface.blits(blit_sequence, doreturn=False)
+    elapsed = time.perf_counter() - started_at
+    return blit_count / elapsed if elapsed > 0 else 0.0
+
+def benchmark_display_formats(window_size: tuple[int, int], surfaces: list[Surface], blit_count: int = 20000,
+                              bit_depths=SUPPORTED_DISPLAY_BIT_DEPTHS, scaled_options=(False, True)) -> list[dict]:
+    """ Opens the display in each format, and times blitting the surfaces as loaded (32 bit, with alpha, like
+    load_image returns them), and after prepare_surface.  The display has to be initialized, and is left open
+
+    Returns:
+        results(list[dict]) - bit_depth, scaled, actual_bit_depth, loaded_blits_per_s, prepared_blits_per_s,
+                              and error, if the display couldn't be opened in that format
+    """
+    results = []
+    for bit_depth in bit_depths:
+        for scaled in scaled_options:
+            result = {'bit_depth': bit_depth, 'scaled': scaled}
+            results.append(result)
+            try:
+                display_surface = pygame.display.set_mode(window_size, get_display_flags(scaled), bit_depth)
+            except pygame.error as error:
+                result['error'] = str(error)
+                continue
+
+            loaded = [surface.convert_alpha() for surface in surfaces]
+            prepared = [prepare_surface(surface) for surface in surfaces]
+            result['actual_bit_depth'] = display_surface.get_bitsize()
+            result['loaded_blits_per_s'] = time_blits(display_surface, loaded, blit_count)
+            result['prepared_blits_per_s'] = time_blits(display_surface, prepared, blit_count)
+    return results
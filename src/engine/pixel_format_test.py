@@ -0,0 +1,93 @@
+import unittest
+from src.test import AbstractTestBase as TestCase
+
+import pygame
+from pygame.locals import DOUBLEBUF, HWSURFACE, SCALED, SRCALPHA
+
+from src.engine.pixel_format import (EAlphaKind, PREPARED_SURFACE_COLORKEY, get_alpha_kind, get_display_flags,
+                                     prepare_surface)
+
+
+class PixelFormatTestCases(TestCase):
+
+    # test utilities ---------------------------------------------------------------------------------------------------
+
+    def setUp(self):
+        # stands in for a 16 bit display
+        self.display_surface = pygame.Surface((20, 20), 0, 16)
+
+    @staticmethod
+    def make_surface(alphas: list[int], color=(200, 40, 40)) -> pygame.Surface:
+        surface = pygame.Surface((len(alphas), 1), SRCALPHA)
+        for x, alpha in enumerate(alphas):
+            surface.set_at((x, 0), (*color, alpha))
+        return surface
+
+    def assertSameBlit(self, surface: pygame.Surface, prepared: pygame.Surface):
+        expected = pygame.Surface(surface.get_size(), 0, self.display_surface)
+        expected.blit(surface, (0, 0))
+        actual = pygame.Surface(surface.get_size(), 0, self.display_surface)
+        actual.blit(prepared, (0, 0))
+        self.assertEqual(pygame.image.tobytes(actual, 'RGB'), pygame.image.tobytes(expected, 'RGB'))
+
+    def test_framework_can_pass_a_test(self):
+        self.assertTrue(True)
+
+
+    # fn get_display_flags ---------------------------------------------------------------------------------------------
+
+    def test__fnGetDisplayFlags__addsScaled__onlyWhenAsked(self):
+        self.assertEqual(get_display_flags(), HWSURFACE | DOUBLEBUF)
+        self.assertEqual(get_display_flags(scaled=True), HWSURFACE | DOUBLEBUF | SCALED)
+
+
+    # fn get_alpha_kind ------------------------------------------------------------------------------------------------
+
+    def test__fnGetAlphaKind__returnsOpaque__forSurfaceWithoutAlpha(self):
+        self.assertEqual(get_alpha_kind(pygame.Surface((2, 2))), EAlphaKind.OPAQUE)
+        self.assertEqual(get_alpha_kind(self.make_surface([255, 255])), EAlphaKind.OPAQUE)
+
+    def test__fnGetAlphaKind__returnsBinary__forOnlyOpaqueAndTransparentPixels(self):
+        self.assertEqual(get_alpha_kind(self.make_surface([255, 0, 255])), EAlphaKind.BINARY)
+
+    def test__fnGetAlphaKind__returnsBinary__forColorkeySurface(self):
+        surface = pygame.Surface((2, 2))
+        surface.set_colorkey((0, 0, 0))
+        self.assertEqual(get_alpha_kind(surface), EAlphaKind.BINARY)
+
+    def test__fnGetAlphaKind__returnsBlended__forPartialAlpha(self):
+        self.assertEqual(get_alpha_kind(self.make_surface([255, 128, 0])), EAlphaKind.BLENDED)
+
+
+    # fn prepare_surface -----------------------------------------------------------------------------------------------
+
+    def test__fnPrepareSurface__returnsNone__forNone(self):
+        self.assertIsNone(prepare_surface(None, self.display_surface))
+
+    def test__fnPrepareSurface__convertsOpaqueToDisplayFormat(self):
+        prepared = prepare_surface(self.make_surface([255, 255]), self.display_surface)
+        self.assertEqual(prepared.get_bitsize(), 16)
+        self.assertFalse(prepared.get_flags() & SRCALPHA)
+
+    def test__fnPrepareSurface__usesColorkey__forBinaryAlpha(self):
+        surface = self.make_surface([255, 0, 255, 0])
+        prepared = prepare_surface(surface, self.display_surface)
+        self.assertEqual(prepared.get_bitsize(), 16)
+        self.assertIsNotNone(prepared.get_colorkey())
+        self.assertSameBlit(surface, prepared)
+
+    def test__fnPrepareSurface__keepsAlpha__whenImageUsesColorkeyColor(self):
+        surface = self.make_surface([255, 0], color=PREPARED_SURFACE_COLORKEY)
+        prepared = prepare_surface(surface, self.display_surface)
+        self.assertIsNone(prepared.get_colorkey())
+        self.assertSameBlit(surface, prepared)
+
+    def test__fnPrepareSurface__keepsAlpha__forBlended(self):
+        surface = self.make_surface([255, 128, 0])
+        prepared = prepare_surface(surface, self.display_surface)
+        self.assertTrue(prepared.get_flags() & SRCALPHA)
+        self.assertSameBlit(surface, prepared)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,118 @@
+from enum import IntEnum
+from operator import itemgetter
+
+from pygame.rect import Rect
+from pygame.surface import Surface
+
+from src.engine.dirty_rects import DirtyRectTracker
+
+
+class ERenderLayer(IntEnum):
+    """ The layers a RenderQueue draws, bottom first.  Within a layer, things are drawn in the order they were
+    submitted
+
+    FLOOR - the breathe box, and anything else under the whole scene
+    TEXT - titles, labels, and the hud
+    SPRITES - the player, the gem, and the cactus, which are drawn over the hud
+    """
+    FLOOR = 0
+    TEXT = 1
+    SPRITES = 2
+
+
+class RenderQueue:
+    """ The RenderQueue collects everything the render modes blit during a frame, and draws it with one
+    Surface.blits call per layer, instead of one Surface.blit call per sprite or string.  That's far fewer trips
+    from python into pygame.
+
+    Each command is one or more blits (a string from a GlyphAtlas is one command), the rect it covers, and a key for
+    the DirtyRectTracker, which is told about every command as it's drawn.
+
+    Anything drawn straight onto the surface, like a line, has to flush the queue first, so it ends up on top of
+    what was submitted before it
+    """
+    def __init__(self):
+        # [(layer, [(source, position) or (source, position, area)], rect, key)], in the order they were submitted
+        self._commands = []
+
+        # counted since the last end_frame
+        self.command_count: int = 0
+        self.blit_count: int = 0
+        self.blits_call_count: int = 0
+
+        # the counts for the last whole frame, for the debug overlay
+        self.frame_stats = {'commands': 0, 'blits': 0, 'blits_calls': 0}
+
+    def __len__(self) -> int:
+        return len(self._commands)
+
+    def submit(self, source: Surface, position, layer: int = 0, area: Rect = None, key=None) -> Rect:
+        """ queues one blit, and returns the rect it will cover (before clipping to the target surface)
+
+        Args:
+            source(Surface) - what to draw
+            position - the top left corner, as a tuple or Vector2
+            layer(int) - see ERenderLayer
+            area(Rect) - the part of source to draw, or None for all of it
+            key - what was drawn, for the DirtyRectTracker.  Defaults to the source surface's id, which is only safe
+                for long-lived surfaces, since a freed surface's id can be reused
+        """
+        if area is None:
+            blit = (source, position)
+            rect = Rect(position, source.get_size())
+        else:
+            blit = (source, position, area)
+            rect = Rect(position, Rect(area).clip(source.get_rect()).size)
+        self._commands.append((layer, [blit], rect, id(source) if key is None else key))
+        return rect
+
+    def submit_blits(self, blit_sequence: list, rect: Rect, layer: int = 0, key=None):
+        """ queues several blits as one command, ie: the glyphs of one string.  rect is what they cover together """
+        self._commands.append((layer, blit_sequence, Rect(rect), key))
+
+    def flush(self, target: Surface, dirty_rects: DirtyRectTracker = None) -> int:
+        """ draws everything queued onto target, a layer at a time, and empties the queue
+
+        Returns:
+            blits_call_count(int) - how many Surface.blits calls it took
+        """
+        if not self._commands:
+            return 0
+
+        # sort is stable, so each layer stays in the order it was submitted
+        commands = self._commands
+        self._commands = []
+        commands.sort(key=itemgetter(0))
+
+        clip = target.get_clip()
+        blits_call_count = 0
+        layer_blits = []
+        layer = commands[0][0]
+        for command_layer, blits, rect, key in commands:
+            if command_layer != layer:
+                target.blits(layer_blits, doreturn=False)
+                blits_call_count += 1
+                layer_blits = []
+                layer = command_layer
+
+            layer_blits.extend(blits)
+            if dirty_rects is not None:
+                dirty_rects.add(rect.clip(clip), key)
+        target.blits(layer_blits, doreturn=False)
+        blits_call_count += 1
+
+        self.command_count += len(commands)
+        self.blit_count += sum(len(blits) for _, blits, _, _ in commands)
+        self.blits_call_count += blits_call_count
+        return blits_call_count
+
+    def end_frame(self):
+        """ keeps this frame's counts in frame_stats, and starts counting the next frame """
+        self.frame_stats = {
+            'commands': self.command_count,
+            'blits': self.blit_count,
+            'blits_calls': self.blits_call_count,
+        }
+        self.command_count = 0
+        self.blit_count = 0
+        self.blits_call_count = 0
@@ -0,0 +1,85 @@
+import unittest
+from src.test import AbstractTestBase as TestCase
+
+import pygame
+
+from src.engine.dirty_rects import DirtyRectTracker
+from src.engine.render_queue import ERenderLayer, RenderQueue
+
+
+class RenderQueueTestCases(TestCase):
+
+    # test utilities ---------------------------------------------------------------------------------------------------
+
+    def setUp(self):
+        self.target = pygame.Surface((40, 40))
+        self.red = pygame.Surface((10, 10))
+        self.red.fill((255, 0, 0))
+        self.blue = pygame.Surface((10, 10))
+        self.blue.fill((0, 0, 255))
+
+    def test_framework_can_pass_a_test(self):
+        self.assertTrue(True)
+
+
+    # class RenderQueue ------------------------------------------------------------------------------------------------
+
+    def test__classRenderQueue__exists(self):
+        self.assertIsNotNone(RenderQueue)
+
+    def test__classRenderQueue__fnSubmit__drawsNothing__untilFlushed(self):
+        queue = RenderQueue()
+        queue.submit(self.red, (0, 0))
+        self.assertEqual(len(queue), 1)
+        self.assertEqual(tuple(self.target.get_at((0, 0)))[:3], (0, 0, 0))
+
+        queue.flush(self.target)
+        self.assertEqual(len(queue), 0)
+        self.assertEqual(tuple(self.target.get_at((0, 0)))[:3], (255, 0, 0))
+
+    def test__classRenderQueue__fnSubmit__returnsCoveredRect(self):
+        queue = RenderQueue()
+        self.assertEqual(queue.submit(self.red, (5.7, 3)), pygame.Rect(5, 3, 10, 10))
+        self.assertEqual(queue.submit(self.red, (0, 0), area=pygame.Rect(2, 2, 4, 20)), pygame.Rect(0, 0, 4, 8))
+
+    def test__classRenderQueue__fnFlush__drawsLayersBottomFirst__andKeepsOrderWithinLayer(self):
+        queue = RenderQueue()
+        queue.submit(self.blue, (0, 0), ERenderLayer.SPRITES)
+        queue.submit(self.red, (0, 0), ERenderLayer.TEXT)
+        queue.submit(self.red, (20, 0), ERenderLayer.SPRITES)
+        queue.submit(self.blue, (20, 0), ERenderLayer.SPRITES)
+        self.assertEqual(queue.flush(self.target), 2)
+        self.assertEqual(tuple(self.target.get_at((0, 0)))[:3], (0, 0, 255))
+        self.assertEqual(tuple(self.target.get_at((20, 0)))[:3], (0, 0, 255))
+
+    def test__classRenderQueue__fnFlush__reportsClippedRectsToDirtyRects(self):
+        queue = RenderQueue()
+        dirty_rects = DirtyRectTracker()
+        dirty_rects.end_frame(self.target.get_rect())
+        queue.submit(self.red, (35, 35), key='red')
+        queue.flush(self.target, dirty_rects)
+        self.assertEqual(dirty_rects.end_frame(self.target.get_rect()), [pygame.Rect(35, 35, 5, 5)])
+
+    def test__classRenderQueue__fnSubmitBlits__countsAsOneCommand(self):
+        queue = RenderQueue()
+        queue.submit_blits([(self.red, (0, 0)), (self.blue, (10, 0))], pygame.Rect(0, 0, 20, 10), key='text')
+        queue.flush(self.target)
+        self.assertEqual(tuple(self.target.get_at((10, 0)))[:3], (0, 0, 255))
+        self.assertEqual(queue.command_count, 1)
+        self.assertEqual(queue.blit_count, 2)
+
+    def test__classRenderQueue__fnEndFrame__keepsFrameStats__andResetsCounts(self):
+        queue = RenderQueue()
+        queue.submit(self.red, (0, 0))
+        queue.submit(self.blue, (0, 0), ERenderLayer.SPRITES)
+        queue.flush(self.target)
+        queue.end_frame()
+        self.assertEqual(queue.frame_stats, {'commands': 2, 'blits': 2, 'blits_calls': 2})
+        self.assertEqual(queue.blits_call_count, 0)
+
+    def test__classRenderQueue__fnFlush__doesNothing__forEmptyQueue(self):
+        self.assertEqual(RenderQueue().flush(self.target), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
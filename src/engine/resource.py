@@ -1,3 +1,4 @@
+from io import BytesIO
 import json
 import os
 
@@ -135,6 +136,66 @@ def write_json(path: str, obj) -> bool:
     jstr = json.dumps(obj)
     return write_text_file(path, jstr)
 
+def is_valid_json_file(path: str) -> bool:
+    try:
+        return load_json(path) is not None
+    except (ValueError, OSError):
+        return False
+
+def write_file_atomic(path: str, data: bytes, backup_path: str = None) -> bool:
+    """ Writes the data to a temp file, fsyncs it, and renames it over the path.  A crash at any point leaves
+    either the old file, or the new file, never a truncated one.
+
+    Args:
+        path(str) - the file to replace
+        data(bytes) - the complete new contents
+        backup_path(str) - if given, the current file is moved here first, so it stays around as the last-good copy
+
+    Returns:
+        was_written(bool)
+    """
+    temp_path = f'{path}.tmp'
+    try:
+        with open(temp_path, 'wb') as outfile:
+            outfile.write(data)
+            outfile.flush()
+            os.fsync(outfile.fileno())
+
+        if backup_path and os.path.isfile(path):
+            os.replace(path, backup_path)
+        os.replace(temp_path, path)
+
+        # the renames are only durable once the directory entry is on disk too
+        if hasattr(os, 'O_DIRECTORY'):
+            directory_fd = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY | os.O_DIRECTORY)
+            try:
+                os.fsync(directory_fd)
+            finally:
+                os.close(directory_fd)
+    except OSError as err:
+        print(f'Could not write file="{path}"\n{err}')
+        return False
+    return True
+
+def write_json_atomic(path: str, obj, backup_path: str = None) -> bool:
+    """ like write_json, but crash-safe (see write_file_atomic).  The current file only replaces the backup if it
+    is still valid json, so a damaged file can't push out the last good one
+    """
+    if backup_path and not is_valid_json_file(path):
+        backup_path = None
+    return write_file_atomic(path, json.dumps(obj).encode('utf-8'), backup_path)
+
+def load_json_or_backup(path: str, backup_path: str):
+    """ loads the json at path, and falls back to the backup, if the file is missing or damaged """
+    for candidate in [path, backup_path]:
+        try:
+            data = load_json(candidate) if candidate else None
+        except (ValueError, OSError) as err:
+            print(f'Could not load json file="{candidate}"\n{err}')
+            continue
+        if data is not None:
+            return data
+
 def load_image(path: str):
     if os.path.isfile(path):
         try:
@@ -157,3 +218,10 @@ def load_font(path: str, size: int):
             return pygame_font.Font(path, size)
         except pygame_error as err:
             print(f'Cannot load font="{path}"\n{err}')
+
+def load_font_from_bytes(data: bytes, size: int):
+    if data:
+        try:
+            return pygame_font.Font(BytesIO(data), size)
+        except pygame_error as err:
+            print(f'Cannot load font from bytes\n{err}')
@@ -7,7 +7,7 @@ import os
 from src.engine.resource import IMAGES_TO_LOAD, AUDIO_TO_LOAD, FONTS_TO_LOAD
 
 from src.engine.resource import (load_text_file, load_json, load_font, load_image, load_sound)
-from src.engine.resource import write_text_file, write_json
+from src.engine.resource import write_text_file, write_json, write_json_atomic, load_json_or_backup
 
 
 class ResourceTestCases(TestCase):
@@ -157,6 +157,42 @@ class ResourceTestCases(TestCase):
         self.assertTrue(write_json(self.test_file_path, self.get_json_test_object()))
         self.assertTrue(os.path.isfile(self.test_file_path))
 
+    # fn write_json_atomic ---------------------------------------------------------------------------------------------
+
+    def test__fnWriteJsonAtomic__writesFile__andLeavesNoTempFile(self):
+        self.assertTrue(write_json_atomic(self.test_file_path, self.get_json_test_object()))
+        self.assertEqual(load_json(self.test_file_path), self.get_json_test_object())
+        self.assertFalse(os.path.exists(f'{self.test_file_path}.tmp'))
+
+    def test__fnWriteJsonAtomic__rotatesPreviousFileIntoBackup(self):
+        backup_path = 'deleteme.file.backup'
+        write_json_atomic(self.test_file_path, {'save': 1}, backup_path)
+        write_json_atomic(self.test_file_path, {'save': 2}, backup_path)
+        self.assertEqual(load_json(backup_path), {'save': 1})
+        self.assertEqual(load_json(self.test_file_path), {'save': 2})
+        self.assertRemoveFile(backup_path)
+
+    def test__fnWriteJsonAtomic__keepsBackup__ifCurrentFileIsDamaged(self):
+        backup_path = 'deleteme.file.backup'
+        write_json(backup_path, {'save': 1})
+        write_text_file(self.test_file_path, self.get_invalid_json())
+
+        write_json_atomic(self.test_file_path, {'save': 2}, backup_path)
+        self.assertEqual(load_json(backup_path), {'save': 1})
+        self.assertRemoveFile(backup_path)
+
+    # fn load_json_or_backup -------------------------------------------------------------------------------------------
+
+    def test__fnLoadJsonOrBackup__returnsBackup__ifFileIsDamaged(self):
+        backup_path = 'deleteme.file.backup'
+        write_json(backup_path, {'save': 1})
+        write_text_file(self.test_file_path, self.get_invalid_json())
+        self.assertEqual(load_json_or_backup(self.test_file_path, backup_path), {'save': 1})
+        self.assertRemoveFile(backup_path)
+
+    def test__fnLoadJsonOrBackup__returnsNone__ifNeitherFileExists(self):
+        self.assertIsNone(load_json_or_backup('asdasdad', 'asdasdad.backup'))
+
     # fn load_image ----------------------------------------------------------------------------------------------------
 
     def test__fnLoadImage__exists(self):
@@ -0,0 +1,95 @@
+from collections import OrderedDict
+
+from pygame.surface import Surface
+
+
+class ScrollList:
+    """ The ScrollList shows a window of visible_row_count rows, out of a list which can be far longer.  Only the
+    visible rows are fetched and drawn, so a list of thousands of rows costs the same as a list of ten.
+
+    Each row is rendered into a Surface once, and cached, keyed by the row itself, so the rows have to be hashable,
+    and equal rows have to look the same.  Scrolling reuses the rows which are still visible, and only renders the
+    ones which scrolled in.  The least recently used rows are dropped past max_cached_rows
+    """
+    def __init__(self, row_height: int, visible_row_count: int, max_cached_rows: int = 256):
+        self.row_height = row_height
+        self.visible_row_count = visible_row_count
+        self.max_cached_rows = max_cached_rows
+
+        # the index of the row at the top of the window
+        self.first_visible_row: int = 0
+
+        # {row: Surface}, least recently used first
+        self._row_surfaces = OrderedDict()
+        self.hits: int = 0
+        self.misses: int = 0
+
+    def __len__(self) -> int:
+        """ the number of cached row surfaces """
+        return len(self._row_surfaces)
+
+    def get_max_first_visible_row(self, row_count: int) -> int:
+        return max(0, row_count - self.visible_row_count)
+
+    def scroll_to(self, row: int, row_count: int) -> bool:
+        """ puts row at the top of the window, as far as the list allows.  Returns True if the window moved """
+        row = min(max(0, row), self.get_max_first_visible_row(row_count))
+        if row == self.first_visible_row:
+            return False
+        self.first_visible_row = row
+        return True
+
+    def scroll(self, row_delta: int, row_count: int) -> bool:
+        """ moves the window by row_delta rows, negative is up.  Returns True if the window moved """
+        return self.scroll_to(self.first_visible_row + row_delta, row_count)
+
+    def get_visible_range(self, row_count: int) -> range:
+        # the list may have shrunk since the last scroll
+        first_row = min(self.first_visible_row, self.get_max_first_visible_row(row_count))
+        return range(first_row, min(first_row + self.visible_row_count, row_count))
+
+    def get_row_surface(self, row, fn_render_row: callable) -> Surface:
+        """ returns the cached surface for row, rendering it with fn_render_row(row) if there isn't one """
+        surface = self._row_surfaces.get(row)
+        if surface is not None:
+            self.hits += 1
+            self._row_surfaces.move_to_end(row)
+            return surface
+
+        self.misses += 1
+        surface = fn_render_row(row)
+        self._row_surfaces[row] = surface
+        while len(self._row_surfaces) > self.max_cached_rows:
+            self._row_surfaces.popitem(last=False)
+        return surface
+
+    def get_visible_rows(self, row_count: int, fn_get_rows: callable) -> list:
+        """ Returns the rows in the window
+
+        Args:
+            row_count(int) - the length of the whole list
+            fn_get_rows(callable) - fn_get_rows(start, stop) returns the rows in that slice of the list
+        """
+        visible_range = self.get_visible_range(row_count)
+        if not visible_range:
+            return []
+        return fn_get_rows(visible_range.start, visible_range.stop)
+
+    def get_blit_sequence(self, rows: list, fn_render_row: callable, position) -> list:
+        """ Returns a blit for each of the rows, from get_visible_rows, for Surface.blits
+
+        Args:
+            rows(list) - the visible rows
+            fn_render_row(callable) - fn_render_row(row) returns the row, rendered into a Surface
+            position - the top left corner of the first visible row
+        """
+        x_pos, y_pos = position
+        blit_sequence = []
+        for row in rows:
+            blit_sequence.append((self.get_row_surface(row, fn_render_row), (x_pos, y_pos)))
+            y_pos += self.row_height
+        return blit_sequence
+
+    def clear(self):
+        """ drops every cached row, ie: after the font changed """
+        self._row_surfaces.clear()
@@ -0,0 +1,87 @@
+import unittest
+from src.test import AbstractTestBase as TestCase
+
+import pygame
+
+from src.engine.scroll_list import ScrollList
+
+
+class ScrollListTestCases(TestCase):
+
+    # test utilities ---------------------------------------------------------------------------------------------------
+
+    def setUp(self):
+        self.rows = list(range(1000))
+        self.fetched_ranges = []
+        self.rendered_rows = []
+
+    def get_rows(self, start: int, stop: int) -> list:
+        self.fetched_ranges.append((start, stop))
+        return self.rows[start:stop]
+
+    def render_row(self, row) -> pygame.Surface:
+        self.rendered_rows.append(row)
+        return pygame.Surface((10, 5))
+
+    def get_blit_sequence(self, scroll_list: ScrollList, position) -> list:
+        rows = scroll_list.get_visible_rows(len(self.rows), self.get_rows)
+        return scroll_list.get_blit_sequence(rows, self.render_row, position)
+
+    def test_framework_can_pass_a_test(self):
+        self.assertTrue(True)
+
+
+    # class ScrollList -------------------------------------------------------------------------------------------------
+
+    def test__classScrollList__fnGetVisibleRows__fetchesOnlyVisibleRows(self):
+        scroll_list = ScrollList(row_height=5, visible_row_count=10)
+        blit_sequence = self.get_blit_sequence(scroll_list, (3, 20))
+        self.assertEqual(len(blit_sequence), 10)
+        self.assertEqual(self.fetched_ranges, [(0, 10)])
+        self.assertEqual(self.rendered_rows, list(range(10)))
+        self.assertEqual([position for _, position in blit_sequence][:2], [(3, 20), (3, 25)])
+
+    def test__classScrollList__fnGetBlitSequence__reusesCachedRows__whileScrolling(self):
+        scroll_list = ScrollList(row_height=5, visible_row_count=10)
+        self.get_blit_sequence(scroll_list, (0, 0))
+        scroll_list.scroll(3, len(self.rows))
+        self.get_blit_sequence(scroll_list, (0, 0))
+        self.assertEqual(self.rendered_rows, list(range(13)))
+        self.assertEqual(scroll_list.hits, 7)
+
+    def test__classScrollList__fnScroll__staysInsideTheList(self):
+        scroll_list = ScrollList(row_height=5, visible_row_count=10)
+        self.assertFalse(scroll_list.scroll(-1, 25))
+        self.assertTrue(scroll_list.scroll(100, 25))
+        self.assertEqual(scroll_list.first_visible_row, 15)
+        self.assertFalse(scroll_list.scroll(1, 25))
+        # the list shrank, so it goes back to the top
+        self.assertTrue(scroll_list.scroll(1, 4))
+        self.assertEqual(scroll_list.first_visible_row, 0)
+
+    def test__classScrollList__fnGetVisibleRange__handlesListShorterThanWindow__andShrinkingList(self):
+        scroll_list = ScrollList(row_height=5, visible_row_count=10)
+        self.assertEqual(scroll_list.get_visible_range(4), range(0, 4))
+        scroll_list.scroll_to(50, 100)
+        self.assertEqual(scroll_list.get_visible_range(55), range(45, 55))
+        self.assertEqual(scroll_list.get_visible_rows(0, self.get_rows), [])
+        self.assertEqual(self.fetched_ranges, [])
+
+    def test__classScrollList__fnGetRowSurface__dropsLeastRecentlyUsed__pastMaxCachedRows(self):
+        scroll_list = ScrollList(row_height=5, visible_row_count=2, max_cached_rows=3)
+        for row in ['a', 'b', 'c', 'a', 'd']:
+            scroll_list.get_row_surface(row, self.render_row)
+        self.assertEqual(len(scroll_list), 3)
+        scroll_list.get_row_surface('b', self.render_row)
+        self.assertEqual(self.rendered_rows, ['a', 'b', 'c', 'd', 'b'])
+
+    def test__classScrollList__fnClear__rendersRowsAgain(self):
+        scroll_list = ScrollList(row_height=5, visible_row_count=2)
+        scroll_list.get_row_surface('a', self.render_row)
+        scroll_list.clear()
+        scroll_list.get_row_surface('a', self.render_row)
+        self.assertEqual(self.rendered_rows, ['a', 'a'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,113 @@
+import hashlib
+import mmap
+import os
+import struct
+
+from pygame import (mixer as pygame_mixer,
+                    error as pygame_error)
+
+
+# decoded sound effects are stored here, relative to the working directory (like game.data)
+PCM_CACHE_DIRECTORY = '.cache/pcm'
+
+# header: magic, version, frequency, format (bits, negative is signed), channels, source mtime_ns, source size
+PCM_CACHE_MAGIC = b'GPCM'
+PCM_CACHE_VERSION = 1
+PCM_CACHE_HEADER = struct.Struct('<4sHiiiqq')
+
+
+class SoundCache:
+    """ The SoundCache stores every sound effect as raw PCM, already converted to the mixer's format.  The first
+    launch decodes the file through SDL_mixer, and writes the samples out.  Every launch after that memory-maps
+    the PCM file, and hands it to mixer.Sound(buffer=...), so there is no decoding and no resampling.
+
+    A cached file is only used if it was written for the current mixer format, and the source file has not
+    changed since (same mtime and size).  Otherwise, the sound is decoded again and the cache is rewritten.
+    """
+    def __init__(self, cache_directory: str = PCM_CACHE_DIRECTORY):
+        self.cache_directory = cache_directory
+
+        # counters, so we can see if the cache is doing its job
+        self.hits: int = 0
+        self.misses: int = 0
+
+    @staticmethod
+    def get_mixer_format():
+        """ returns (frequency, format, channels), or None if the mixer is not initialized """
+        if pygame_mixer:
+            return pygame_mixer.get_init()
+
+    def get_cache_path(self, path: str) -> str:
+        """ the cache file name contains a hash of the full source path, so equal file names don't collide """
+        stem = os.path.splitext(os.path.basename(path))[0]
+        digest = hashlib.sha1(os.path.abspath(path).encode('utf-8')).hexdigest()[:12]
+        return os.path.join(self.cache_directory, f'{stem}.{digest}.pcm')
+
+    @staticmethod
+    def build_header(mixer_format, source_stat) -> bytes:
+        frequency, sample_format, channels = mixer_format
+        return PCM_CACHE_HEADER.pack(PCM_CACHE_MAGIC, PCM_CACHE_VERSION, frequency, sample_format, channels,
+                                     source_stat.st_mtime_ns, source_stat.st_size)
+
+    def load(self, path: str):
+        """ Loads a sound, using the PCM cache when it is valid
+
+        Args:
+            path(str) - the path to the original sound file
+
+        Returns:
+            sound(pygame.mixer.Sound) - or None, if the sound can't be loaded
+        """
+        mixer_format = self.get_mixer_format()
+        if not mixer_format or not os.path.isfile(path):
+            return None
+
+        source_stat = os.stat(path)
+        header = self.build_header(mixer_format, source_stat)
+        cache_path = self.get_cache_path(path)
+
+        sound = self.load_cached(cache_path, header)
+        if sound is not None:
+            self.hits += 1
+            return sound
+
+        self.misses += 1
+        try:
+            sound = pygame_mixer.Sound(path)
+        except pygame_error as err:
+            print(f'Cannot load sound="{path}"\n{err}')
+            return None
+
+        self.write_cached(cache_path, header, sound.get_raw())
+        return sound
+
+    @staticmethod
+    def load_cached(cache_path: str, header: bytes):
+        """ returns a Sound built from the memory-mapped PCM file, or None if it is missing or stale """
+        if not os.path.isfile(cache_path) or os.path.getsize(cache_path) <= len(header):
+            return None
+
+        with open(cache_path, 'rb') as infile:
+            with mmap.mmap(infile.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                if mapped[:len(header)] != header:
+                    return None
+                with memoryview(mapped) as view:
+                    try:
+                        return pygame_mixer.Sound(buffer=view[len(header):])
+                    except pygame_error as err:
+                        print(f'Cannot load cached sound="{cache_path}"\n{err}')
+
+    @staticmethod
+    def write_cached(cache_path: str, header: bytes, samples: bytes) -> bool:
+        """ writes to a temp file first, so a crash never leaves a half-written cache file behind """
+        try:
+            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+            temp_path = cache_path + '.tmp'
+            with open(temp_path, 'wb') as outfile:
+                outfile.write(header)
+                outfile.write(samples)
+            os.replace(temp_path, cache_path)
+            return True
+        except OSError as err:
+            print(f'Cannot write sound cache="{cache_path}"\n{err}')
+            return False
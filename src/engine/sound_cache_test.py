@@ -0,0 +1,87 @@
+import unittest
+from src.test import AbstractTestBase as TestCase
+
+import os
+import struct
+import wave
+
+import pygame
+
+from src.engine.sound_cache import SoundCache, PCM_CACHE_HEADER
+
+
+class SoundCacheTestCases(TestCase):
+
+    # test utilities ---------------------------------------------------------------------------------------------------
+
+    def setUp(self):
+        # the Sound class can't be used unless the mixer is initialized
+        if not pygame.mixer.get_init():
+            pygame.mixer.init()
+
+        self.test_file_path = 'deleteme.wav'
+        self.test_cache_directory = 'deleteme_pcm_cache'
+        self.write_test_wav(self.test_file_path)
+
+    def tearDown(self):
+        if os.path.exists(self.test_file_path):
+            self.assertRemoveFile(self.test_file_path)
+        if os.path.isdir(self.test_cache_directory):
+            for name in os.listdir(self.test_cache_directory):
+                self.assertRemoveFile(os.path.join(self.test_cache_directory, name))
+            self.assertRemoveDirectory(self.test_cache_directory)
+
+    @staticmethod
+    def write_test_wav(path: str, frames: int = 441):
+        with wave.open(path, 'wb') as outfile:
+            outfile.setnchannels(1)
+            outfile.setsampwidth(2)
+            outfile.setframerate(22050)
+            outfile.writeframes(struct.pack(f'<{frames}h', *[(i * 50) % 3000 for i in range(frames)]))
+
+    def test_framework_can_pass_a_test(self):
+        self.assertTrue(True)
+
+
+    # class SoundCache -------------------------------------------------------------------------------------------------
+
+    def test__classSoundCache__exists(self):
+        self.assertIsNotNone(SoundCache)
+
+    def test__classSoundCache__fnLoad__returnsNone__forInvalidPath(self):
+        self.assertIsNone(SoundCache(self.test_cache_directory).load('asdasdad'))
+
+    def test__classSoundCache__fnLoad__writesPcmFile__onFirstLoad(self):
+        cache = SoundCache(self.test_cache_directory)
+        sound = cache.load(self.test_file_path)
+
+        self.assertIsInstance(sound, pygame.mixer.Sound)
+        self.assertEqual(cache.misses, 1)
+
+        cache_path = cache.get_cache_path(self.test_file_path)
+        self.assertTrue(os.path.isfile(cache_path))
+        self.assertEqual(os.path.getsize(cache_path), PCM_CACHE_HEADER.size + len(sound.get_raw()))
+
+    def test__classSoundCache__fnLoad__usesPcmFile__onSecondLoad(self):
+        cache = SoundCache(self.test_cache_directory)
+        decoded = cache.load(self.test_file_path)
+        cached = cache.load(self.test_file_path)
+
+        self.assertEqual(cache.hits, 1)
+        self.assertEqual(cache.misses, 1)
+        self.assertEqual(decoded.get_raw(), cached.get_raw())
+
+    def test__classSoundCache__fnLoad__decodesAgain__ifSourceChanged(self):
+        cache = SoundCache(self.test_cache_directory)
+        cache.load(self.test_file_path)
+
+        self.write_test_wav(self.test_file_path, frames=882)
+        sound = cache.load(self.test_file_path)
+
+        self.assertEqual(cache.misses, 2)
+        self.assertEqual(cache.hits, 0)
+        self.assertEqual(sound.get_raw(), cache.load(self.test_file_path).get_raw())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,194 @@
+from collections import OrderedDict
+from weakref import WeakKeyDictionary
+
+from pygame import BLEND_RGBA_MAX, SRCALPHA
+from pygame.font import Font
+from pygame.rect import Rect
+from pygame.surface import Surface
+
+
+# the hud is mostly numbers, so these glyphs are rasterized up front; anything else is added on first use
+DEFAULT_GLYPH_ATLAS_CHARACTERS = '0123456789 .:xhms'
+
+
+class GlyphAtlas:
+    """ The GlyphAtlas rasterizes each character of a font once, into a single surface, and remembers where each
+    glyph is and how far it advances the pen.  Strings are then composed with one Surface.blits call, instead of
+    a full Font.render, which is much cheaper for counters that change every frame.
+
+    NOTE: glyphs are placed by their advance, so kerning is ignored.  That is fine for the mono LCD font
+    """
+    def __init__(self, font: Font, antialias: bool, color, characters: str = DEFAULT_GLYPH_ATLAS_CHARACTERS,
+                 prepare_surface: callable = None):
+        self.font = font
+        self.antialias = antialias
+        self.color = color
+        self.height: int = font.get_height()
+
+        # converts the atlas into the display's format, after it's built (see pixel_format.prepare_surface)
+        self.prepare_surface: callable = prepare_surface
+
+        # the single surface every glyph is copied into, and where each glyph lives inside it
+        self.atlas_surface: Surface = None
+        self.glyph_rects = {}
+        self.glyph_advances = {}
+
+        self.build_atlas(characters)
+
+    def build_atlas(self, characters: str):
+        """ rasterizes every character (plus any already in the atlas), and packs them into one row """
+        characters = ''.join(dict.fromkeys(''.join(self.glyph_rects.keys()) + characters))
+
+        glyph_surfaces = [self.font.render(character, self.antialias, self.color) for character in characters]
+        width = max(1, sum(glyph.get_width() for glyph in glyph_surfaces))
+        height = max([self.height] + [glyph.get_height() for glyph in glyph_surfaces])
+
+        atlas = Surface((width, height), SRCALPHA)
+        atlas.fill((0, 0, 0, 0))
+
+        x = 0
+        for character, glyph in zip(characters, glyph_surfaces):
+            # the atlas starts fully transparent, so MAX copies the glyph's color and alpha exactly
+            atlas.blit(glyph, (x, 0), special_flags=BLEND_RGBA_MAX)
+            self.glyph_rects[character] = Rect(x, 0, glyph.get_width(), glyph.get_height())
+            metrics = self.font.metrics(character)
+            if metrics and metrics[0]:
+                self.glyph_advances[character] = metrics[0][4]
+            else:
+                self.glyph_advances[character] = glyph.get_width()
+            x += glyph.get_width()
+
+        self.atlas_surface = atlas if self.prepare_surface is None else self.prepare_surface(atlas)
+
+    def ensure_glyphs(self, text: str):
+        missing = [character for character in text if character not in self.glyph_rects]
+        if missing:
+            self.build_atlas(''.join(missing))
+
+    def size(self, text: str) -> tuple[int, int]:
+        """ returns the (width, height) the text will take up, like Font.size """
+        self.ensure_glyphs(text)
+        return sum(self.glyph_advances[character] for character in text), self.height
+
+    def get_blit_sequence(self, text: str, position) -> tuple[list, int]:
+        """ Returns the blits which draw the text, with its top left corner at position, for Surface.blits, or a
+        RenderQueue
+
+        Returns:
+            blit_sequence(list) - (atlas, position, glyph rect) for each character
+            width(int) - the width of the text
+        """
+        self.ensure_glyphs(text)
+
+        x, y = position
+        atlas = self.atlas_surface
+        blit_sequence = []
+        pen_x = 0
+        for character in text:
+            blit_sequence.append((atlas, (x + pen_x, y), self.glyph_rects[character]))
+            pen_x += self.glyph_advances[character]
+        return blit_sequence, pen_x
+
+    def render_to(self, surface: Surface, text: str, position) -> int:
+        """ Blits the text onto the surface, with its top left corner at position
+
+        Returns:
+            width(int) - the width of the text which was drawn
+        """
+        blit_sequence, width = self.get_blit_sequence(text, position)
+        surface.blits(blit_sequence, doreturn=False)
+        return width
+
+
+class TextRenderCache:
+    """ The TextRenderCache holds surfaces which were made by Font.render, keyed by (font, text, antialias, color).
+    Most of the text on screen doesn't change from frame to frame, so rasterizing it again every frame is wasted
+    work.  The cache is bounded, and evicts the least recently used surface once it is full.
+
+    NOTE: the returned surfaces are shared, so callers must blit them, and never draw onto them
+    """
+    def __init__(self, max_entries: int = 256, prepare_surface: callable = None):
+        self.max_entries = max_entries
+        self.rendered_surfaces = OrderedDict()
+
+        # {Surface: key}, for every rendered surface which is still alive, even after it was evicted.  The dirty rect
+        # tracker identifies text by this key, since an evicted surface's id can be reused by a different string
+        self._surface_keys = WeakKeyDictionary()
+
+        # converts rendered text into the display's format, once there is a display (see
+        # pixel_format.prepare_surface).  Surfaces already in the cache are not converted
+        self.prepare_surface: callable = prepare_surface
+
+        # glyph atlases are small, and there's one per (font, antialias, color), so they aren't evicted
+        self.glyph_atlases = {}
+
+        # counters, so we can confirm the cache is actually saving work
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+
+    @staticmethod
+    def make_key(font: Font, text: str, antialias: bool, color):
+        # colors can arrive as an EColor, a string, or a tuple/Color; a Color is not hashable, so use a tuple
+        if not isinstance(color, (str, tuple)):
+            color = tuple(color)
+        return font, text, bool(antialias), color
+
+    def render(self, font: Font, text: str, antialias: bool, color) -> Surface:
+        """ Returns the rendered text, calling Font.render only if this text has not been rendered recently
+
+        Args:
+            font(Font) - the font to render with
+            text(str) - the string to render
+            antialias(bool) - passed to Font.render
+            color(EColor/tuple) - passed to Font.render
+
+        Returns:
+            surface(Surface) - the rendered text
+        """
+        key = self.make_key(font, text, antialias, color)
+
+        if key in self.rendered_surfaces:
+            self.hits += 1
+            self.rendered_surfaces.move_to_end(key)
+            return self.rendered_surfaces[key]
+
+        self.misses += 1
+        surface = font.render(text, antialias, color)
+        if self.prepare_surface is not None:
+            surface = self.prepare_surface(surface)
+        self.rendered_surfaces[key] = surface
+        self._surface_keys[surface] = key
+
+        while len(self.rendered_surfaces) > self.max_entries:
+            self.rendered_surfaces.popitem(last=False)
+            self.evictions += 1
+
+        return surface
+
+    def get_surface_key(self, surface: Surface):
+        """ returns the (font, text, antialias, color) key surface was rendered from, or None if it isn't text """
+        return self._surface_keys.get(surface)
+
+    def get_glyph_atlas(self, font: Font, antialias: bool, color) -> GlyphAtlas:
+        """ returns the glyph atlas for this font and color, building it on the first request """
+        key = self.make_key(font, '', antialias, color)
+        if key not in self.glyph_atlases:
+            self.glyph_atlases[key] = GlyphAtlas(font, antialias, color, prepare_surface=self.prepare_surface)
+        return self.glyph_atlases[key]
+
+    def get_hit_rate(self) -> float:
+        """ returns the ratio of hits to lookups, from 0.0 to 1.0 """
+        lookups = self.hits + self.misses
+        if lookups == 0:
+            return 0.0
+        return self.hits / lookups
+
+    def reset_counters(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def clear(self):
+        self.rendered_surfaces.clear()
+        self.glyph_atlases.clear()
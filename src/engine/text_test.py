@@ -0,0 +1,158 @@
+import unittest
+from src.test import AbstractTestBase as TestCase
+
+import pygame
+
+from src.engine.text import GlyphAtlas, TextRenderCache
+from src.engine.ui import EColor
+
+
+class TextTestCases(TestCase):
+
+    # test utilities ---------------------------------------------------------------------------------------------------
+
+    def setUp(self):
+        if not pygame.font.get_init():
+            pygame.font.init()
+        self.font = pygame.font.Font(None, 20)
+
+    def test_framework_can_pass_a_test(self):
+        self.assertTrue(True)
+
+
+    # class TextRenderCache --------------------------------------------------------------------------------------------
+
+    def test__classTextRenderCache__exists(self):
+        self.assertIsNotNone(TextRenderCache)
+
+    def test__classTextRenderCache__constructsWithExpectedValues(self):
+        cache = TextRenderCache(max_entries=8)
+        self.assertEqual(cache.max_entries, 8)
+        self.assertEqual(len(cache.rendered_surfaces), 0)
+        self.assertEqual(cache.hits, 0)
+        self.assertEqual(cache.misses, 0)
+        self.assertEqual(cache.evictions, 0)
+
+    # fn render --------------------------------------------------------------------------------------------------------
+
+    def test__classTextRenderCache__fnRender__returnsSurface(self):
+        surface = TextRenderCache().render(self.font, 'text', True, EColor.WHITE)
+        self.assertIsInstance(surface, pygame.surface.Surface)
+
+    def test__classTextRenderCache__fnRender__returnsSameSurface__forSameArgs(self):
+        cache = TextRenderCache()
+        first = cache.render(self.font, 'text', True, EColor.WHITE)
+        second = cache.render(self.font, 'text', True, EColor.WHITE)
+        self.assertIs(first, second)
+        self.assertEqual(cache.hits, 1)
+        self.assertEqual(cache.misses, 1)
+
+    def test__classTextRenderCache__fnRender__rendersAgain__forDifferentColor(self):
+        cache = TextRenderCache()
+        first = cache.render(self.font, 'text', True, EColor.WHITE)
+        second = cache.render(self.font, 'text', True, EColor.PINK)
+        self.assertIsNot(first, second)
+        self.assertEqual(cache.misses, 2)
+
+    def test__classTextRenderCache__fnRender__preparesNewSurfaces(self):
+        prepared_surfaces = []
+        def prepare_surface(surface):
+            prepared_surfaces.append(surface)
+            return surface.copy()
+
+        cache = TextRenderCache(prepare_surface=prepare_surface)
+        cache.render(self.font, 'text', True, EColor.WHITE)
+        cache.render(self.font, 'text', True, EColor.WHITE)
+        cache.get_glyph_atlas(self.font, True, EColor.WHITE)
+        self.assertEqual(len(prepared_surfaces), 2)
+
+    def test__classTextRenderCache__fnRender__acceptsPygameColor(self):
+        cache = TextRenderCache()
+        first = cache.render(self.font, 'text', True, pygame.Color(1, 2, 3))
+        second = cache.render(self.font, 'text', True, pygame.Color(1, 2, 3))
+        self.assertIs(first, second)
+
+    def test__classTextRenderCache__fnRender__evictsLeastRecentlyUsed__whenFull(self):
+        cache = TextRenderCache(max_entries=2)
+        cache.render(self.font, 'a', True, EColor.WHITE)
+        cache.render(self.font, 'b', True, EColor.WHITE)
+        # touch 'a', so 'b' is the least recently used
+        cache.render(self.font, 'a', True, EColor.WHITE)
+        cache.render(self.font, 'c', True, EColor.WHITE)
+
+        self.assertEqual(cache.evictions, 1)
+        keys = [key[1] for key in cache.rendered_surfaces.keys()]
+        self.assertEqual(keys, ['a', 'c'])
+
+    # fn get_surface_key -----------------------------------------------------------------------------------------------
+
+    def test__classTextRenderCache__fnGetSurfaceKey__returnsRenderKey(self):
+        cache = TextRenderCache()
+        surface = cache.render(self.font, 'text', True, EColor.WHITE)
+        self.assertEqual(cache.get_surface_key(surface), TextRenderCache.make_key(self.font, 'text', True, EColor.WHITE))
+
+    def test__classTextRenderCache__fnGetSurfaceKey__returnsNone__forOtherSurfaces(self):
+        self.assertIsNone(TextRenderCache().get_surface_key(pygame.Surface((1, 1))))
+
+    def test__classTextRenderCache__fnGetSurfaceKey__returnsRenderKey__afterEviction(self):
+        cache = TextRenderCache(max_entries=1)
+        surface = cache.render(self.font, 'a', True, EColor.WHITE)
+        cache.render(self.font, 'b', True, EColor.WHITE)
+        self.assertEqual(cache.get_surface_key(surface), TextRenderCache.make_key(self.font, 'a', True, EColor.WHITE))
+
+    # fn get_hit_rate --------------------------------------------------------------------------------------------------
+
+    def test__classTextRenderCache__fnGetHitRate__returnsZero__forNoLookups(self):
+        self.assertEqual(TextRenderCache().get_hit_rate(), 0.0)
+
+    def test__classTextRenderCache__fnGetHitRate__returnsRatioOfHits(self):
+        cache = TextRenderCache()
+        for _ in range(4):
+            cache.render(self.font, 'text', True, EColor.WHITE)
+        self.assertEqual(cache.get_hit_rate(), 0.75)
+
+
+    # class GlyphAtlas -------------------------------------------------------------------------------------------------
+
+    def test__classGlyphAtlas__exists(self):
+        self.assertIsNotNone(GlyphAtlas)
+
+    def test__classGlyphAtlas__constructsWithDigits(self):
+        atlas = GlyphAtlas(self.font, True, EColor.WHITE)
+        self.assertIsInstance(atlas.atlas_surface, pygame.surface.Surface)
+        for digit in '0123456789':
+            self.assertTrue(digit in atlas.glyph_rects)
+            self.assertTrue(digit in atlas.glyph_advances)
+
+    def test__classGlyphAtlas__fnSize__matchesFontSize__forDigits(self):
+        atlas = GlyphAtlas(self.font, True, EColor.WHITE)
+        self.assertEqual(atlas.size('1234'), (self.font.size('1234')[0], self.font.get_height()))
+
+    def test__classGlyphAtlas__fnSize__addsMissingGlyphs(self):
+        atlas = GlyphAtlas(self.font, True, EColor.WHITE, characters='0')
+        self.assertFalse('Q' in atlas.glyph_rects)
+        atlas.size('Q0')
+        self.assertTrue('Q' in atlas.glyph_rects)
+        self.assertTrue('0' in atlas.glyph_rects)
+
+    def test__classGlyphAtlas__fnRenderTo__drawsGlyphsOntoSurface(self):
+        atlas = GlyphAtlas(self.font, True, (255, 255, 255))
+        surface = pygame.surface.Surface(atlas.size('88'))
+        surface.fill((0, 0, 0))
+
+        width = atlas.render_to(surface, '88', (0, 0))
+
+        self.assertEqual(width, surface.get_width())
+        self.assertNotEqual(pygame.transform.average_color(surface)[:3], (0, 0, 0))
+
+    # fn get_glyph_atlas -----------------------------------------------------------------------------------------------
+
+    def test__classTextRenderCache__fnGetGlyphAtlas__returnsSameAtlas__forSameFontAndColor(self):
+        cache = TextRenderCache()
+        first = cache.get_glyph_atlas(self.font, True, EColor.WHITE)
+        self.assertIs(first, cache.get_glyph_atlas(self.font, True, EColor.WHITE))
+        self.assertIsNot(first, cache.get_glyph_atlas(self.font, True, EColor.PINK))
+
+
+if __name__ == '__main__':
+    unittest.main()
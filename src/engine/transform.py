@@ -0,0 +1,122 @@
+from pygame.surface import Surface
+from pygame.transform import (flip as pygame_transform_flip,
+                              scale_by as pygame_transform_scale_by,
+                              rotate as pygame_transform_rotate)
+
+from src.engine.animation import SpriteAnimation
+
+
+class TransformCache:
+    """ The TransformCache builds derived surfaces (flipped, scaled, rotated) from loaded assets, exactly once.
+    Every variant is keyed by (source asset, flip_x, flip_y, scale, rotation), so anyone who asks for the same
+    variant shares the same Surface, and no one pays for a transform during a frame
+    """
+    def __init__(self, source_surfaces: dict):
+        # maps an asset name (the file stem) to the loaded surface, ie: loaded_image_surfaces
+        self.source_surfaces = source_surfaces
+
+        # maps a transform key to the derived surface
+        self.transformed_surfaces = {}
+
+        # counters, so we can see how often a variant is reused
+        self.hits: int = 0
+        self.misses: int = 0
+
+    @staticmethod
+    def make_key(source, flip_x: bool = False, flip_y: bool = False, scale: float = 1.0, rotation: float = 0.0):
+        """ Returns the tuple used to store a transformed surface
+
+        Args:
+            source(str/Surface) - the name of a loaded asset, or a surface which is not in the source assets
+            flip_x(bool) - mirror across the vertical axis
+            flip_y(bool) - mirror across the horizontal axis
+            scale(float) - scale factor, applied to both axes
+            rotation(float) - degrees, counter-clockwise
+
+        Returns:
+            key(tuple) - or None, for an invalid source
+        """
+        if source is None or not isinstance(source, (str, Surface)):
+            return None
+        return source, bool(flip_x), bool(flip_y), float(scale), float(rotation) % 360.0
+
+    @staticmethod
+    def build_transformed_surface(surface: Surface, flip_x: bool, flip_y: bool, scale: float, rotation: float):
+        """ applies the transforms in a fixed order: flip, then scale, then rotate """
+        result = surface
+        if flip_x or flip_y:
+            result = pygame_transform_flip(result, flip_x, flip_y)
+        if scale != 1.0:
+            result = pygame_transform_scale_by(result, scale)
+        if rotation != 0.0:
+            result = pygame_transform_rotate(result, rotation)
+        return result
+
+    def get_source_surface(self, source):
+        if isinstance(source, Surface):
+            return source
+        if source in self.source_surfaces:
+            return self.source_surfaces[source]
+
+    def get(self, source, flip_x: bool = False, flip_y: bool = False, scale: float = 1.0, rotation: float = 0.0):
+        """ Returns the requested variant of the source asset, building it on the first request
+
+        Returns:
+            surface(Surface) - the transformed surface
+                             - the source surface itself, if no transform was requested
+                             - None, if the source asset is not loaded
+        """
+        key = self.make_key(source, flip_x, flip_y, scale, rotation)
+        if key is None:
+            return None
+
+        if key in self.transformed_surfaces:
+            self.hits += 1
+            return self.transformed_surfaces[key]
+
+        surface = self.get_source_surface(source)
+        if surface is None:
+            return None
+
+        self.misses += 1
+        _, flip_x, flip_y, scale, rotation = key
+        transformed = self.build_transformed_surface(surface, flip_x, flip_y, scale, rotation)
+        self.transformed_surfaces[key] = transformed
+        return transformed
+
+    def get_flipped(self, source, flip_x: bool = True, flip_y: bool = False):
+        return self.get(source, flip_x=flip_x, flip_y=flip_y)
+
+    def get_scaled(self, source, scale: float):
+        return self.get(source, scale=scale)
+
+    def get_rotated(self, source, rotation: float):
+        return self.get(source, rotation=rotation)
+
+    def invalidate(self, source) -> int:
+        """ Removes every variant built from this source, so the next request rebuilds it.
+
+        Returns:
+            removed(int) - the number of variants which were removed
+        """
+        to_remove = [key for key in self.transformed_surfaces.keys() if key[0] == source]
+        for key in to_remove:
+            del self.transformed_surfaces[key]
+        return len(to_remove)
+
+    def clear(self):
+        self.transformed_surfaces.clear()
+
+    def build_animation(self, engine, sources: list, duration_s: float,
+                        flip_x: bool = False, flip_y: bool = False, scale: float = 1.0, rotation: float = 0.0):
+        """ Builds a SpriteAnimation, where every frame is the requested variant of a source asset """
+        surfaces = [self.get(source, flip_x, flip_y, scale, rotation) for source in sources]
+        return SpriteAnimation(engine, surfaces, duration_s)
+
+    def build_mirrored_animation(self, animation: SpriteAnimation, flip_x: bool = True, flip_y: bool = False):
+        """ Builds a mirrored copy of an existing SpriteAnimation.  Frames that came from a loaded asset are keyed
+        by that asset's name, so they are shared with any other request for the same variant
+        """
+        names_by_surface = {surface: name for name, surface in self.source_surfaces.items()}
+        sources = [names_by_surface.get(surface, surface) for surface in animation.animation_surfaces]
+        return self.build_animation(animation.engine, sources, animation.duration_s, flip_x, flip_y)
@@ -0,0 +1,135 @@
+import unittest
+from src.test import AbstractTestBase as TestCase
+
+import time
+
+from pygame.surface import Surface as PySurface
+
+from src.engine.animation import SpriteAnimation, SpriteAnimator
+from src.engine.transform import TransformCache
+
+
+class TransformTestCases(TestCase):
+
+    # test utilities ---------------------------------------------------------------------------------------------------
+
+    class TestEngine:
+        @staticmethod
+        def now():
+            return time.time()
+
+    @staticmethod
+    def get_source_surfaces():
+        return {
+            'wide': PySurface((4, 2)),
+            'square': PySurface((2, 2)),
+        }
+
+    def test_framework_can_pass_a_test(self):
+        self.assertTrue(True)
+
+
+    # class TransformCache ---------------------------------------------------------------------------------------------
+
+    def test__classTransformCache__exists(self):
+        self.assertIsNotNone(TransformCache)
+
+    def test__classTransformCache__constructsWithExpectedValues(self):
+        sources = self.get_source_surfaces()
+        cache = TransformCache(sources)
+        self.assertEqual(cache.source_surfaces, sources)
+        self.assertEqual(cache.transformed_surfaces, {})
+        self.assertEqual(cache.hits, 0)
+        self.assertEqual(cache.misses, 0)
+
+    # fn make_key ------------------------------------------------------------------------------------------------------
+
+    def test__classTransformCache__fnMakeKey__returnsNone__forBadSourceArg(self):
+        self.assertIsNone(TransformCache.make_key(None))
+        self.assertIsNone(TransformCache.make_key(1))
+        self.assertIsNone(TransformCache.make_key({}))
+
+    def test__classTransformCache__fnMakeKey__normalizesValues(self):
+        self.assertEqual(TransformCache.make_key('a', 1, 0, 1, 360), ('a', True, False, 1.0, 0.0))
+
+    # fn get -----------------------------------------------------------------------------------------------------------
+
+    def test__classTransformCache__fnGet__returnsNone__forUnknownSource(self):
+        self.assertIsNone(TransformCache(self.get_source_surfaces()).get('missing', flip_x=True))
+
+    def test__classTransformCache__fnGet__buildsEachVariantOnlyOnce(self):
+        cache = TransformCache(self.get_source_surfaces())
+        first = cache.get('wide', flip_x=True)
+        second = cache.get('wide', flip_x=True)
+        self.assertIs(first, second)
+        self.assertEqual(cache.misses, 1)
+        self.assertEqual(cache.hits, 1)
+
+    def test__classTransformCache__fnGet__keepsVariantsSeparate(self):
+        cache = TransformCache(self.get_source_surfaces())
+        flipped_x = cache.get_flipped('wide')
+        flipped_y = cache.get_flipped('wide', flip_x=False, flip_y=True)
+        self.assertIsNot(flipped_x, flipped_y)
+        self.assertEqual(len(cache.transformed_surfaces), 2)
+
+    def test__classTransformCache__fnGetScaled__scalesSurface(self):
+        cache = TransformCache(self.get_source_surfaces())
+        self.assertEqual(cache.get_scaled('wide', 0.5).get_size(), (2, 1))
+
+    def test__classTransformCache__fnGetRotated__rotatesSurface(self):
+        cache = TransformCache(self.get_source_surfaces())
+        self.assertEqual(cache.get_rotated('wide', 90).get_size(), (2, 4))
+
+    def test__classTransformCache__fnGet__acceptsSurfaceAsSource(self):
+        cache = TransformCache({})
+        surface = PySurface((3, 1))
+        self.assertIs(cache.get_flipped(surface), cache.get_flipped(surface))
+
+    # fn invalidate ----------------------------------------------------------------------------------------------------
+
+    def test__classTransformCache__fnInvalidate__removesOnlyVariantsOfThatSource(self):
+        cache = TransformCache(self.get_source_surfaces())
+        cache.get_flipped('wide')
+        cache.get_scaled('wide', 2.0)
+        cache.get_flipped('square')
+        self.assertEqual(cache.invalidate('wide'), 2)
+        self.assertEqual(len(cache.transformed_surfaces), 1)
+
+    # fn build_mirrored_animation --------------------------------------------------------------------------------------
+
+    def test__classTransformCache__fnBuildMirroredAnimation__sharesFramesWithOtherRequests(self):
+        sources = self.get_source_surfaces()
+        cache = TransformCache(sources)
+        animation = cache.build_animation(self.TestEngine, ['wide', 'square'], 2.0)
+        mirrored = cache.build_mirrored_animation(animation)
+
+        self.assertIsInstance(mirrored, SpriteAnimation)
+        self.assertEqual(mirrored.duration_s, 2.0)
+        self.assertIs(mirrored.animation_surfaces[0], cache.get_flipped('wide'))
+        self.assertIs(mirrored.animation_surfaces[1], cache.get_flipped('square'))
+
+
+    # class SpriteAnimator, flipped animations -------------------------------------------------------------------------
+
+    def test__classSpriteAnimator__fnRegisterMirroredAnimation__fillsFlippedAnimations(self):
+        cache = TransformCache(self.get_source_surfaces())
+        animator = SpriteAnimator()
+        animator.register_animation('walk', cache.build_animation(self.TestEngine, ['wide'], 1.0))
+        animator.register_mirrored_animation('walk', cache)
+
+        self.assertTrue('walk' in animator.flipped_animations)
+        self.assertIs(animator.get_animation_frame('walk', flipped=True), cache.get_flipped('wide'))
+
+    def test__classSpriteAnimator__fnUpdateAnimationDuration__alsoUpdatesFlippedAnimation(self):
+        cache = TransformCache(self.get_source_surfaces())
+        animator = SpriteAnimator()
+        animator.register_animation('walk', cache.build_animation(self.TestEngine, ['wide'], 1.0))
+        animator.register_mirrored_animation('walk', cache)
+
+        animator.update_animation_duration('walk', 0.5)
+        self.assertEqual(animator.animations['walk'].duration_s, 0.5)
+        self.assertEqual(animator.flipped_animations['walk'].duration_s, 0.5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,5 +1,7 @@
 from enum import IntEnum
-from collections import deque
+from bisect import bisect_left, insort
+from collections import Counter, deque
+import os
 import time
 
 from pygame.math import Vector2
@@ -9,10 +11,23 @@ from src.engine.animation import SpriteAnimator
 from src.engine.cache import EngineCache
 from src.engine.ui import EColor
 from src.engine.utilities import clamp
+from src.gembo import streak_analytics
+from src.gembo.rollups import ERollupPeriod, StatisticsRollups
+from src.gembo.save_format import CompactHistory, SAVE_FILE_SCALARS
+from src.gembo.streak_log import StreakLog
 
 # file path for the information stored about the play session
 PLAYER_STATS_FILE = 'game.data'
 
+# the previous good copy of game.data, rotated on every save
+PLAYER_STATS_BACKUP_FILE = 'game.data.backup'
+
+# file path for the append-only log of every streak the player has finished
+PLAYER_STREAK_LOG_FILE = 'game.streaks'
+
+# file path for the sqlite database, used instead of the files above if StatisticsData.use_statistics_database is set
+PLAYER_STATS_DATABASE_FILE = 'game.db'
+
 
 class AudioData:
     def __init__(self):
@@ -50,6 +65,25 @@ class EngineData:
         self.print_avg_fps: bool = False
         # if true, will render the avg fps to the screen
         self.render_avg_fps: bool = True
+        # the display's bits per pixel (16, 24, or 32).  Images and text are converted to match it when loaded
+        self.display_bit_depth: int = 16
+        # if true, the window can be resized, and the picture is scaled to fit it
+        self.display_scaled: bool = False
+        # the window is this many times APPLICATION_WINDOW_SIZE.  The game still draws at APPLICATION_WINDOW_SIZE, into a
+        # back buffer, which is scaled up into the window each frame, so the pixels stay sharp (see BackBuffer)
+        self.window_scale: int = 1
+        # if true, only the parts of the screen which changed are presented, with display.update, instead of flip
+        self.render_dirty_rects_only: bool = True
+        # if true, the presented parts are outlined (for debugging)
+        self.render_dirty_rect_overlay: bool = False
+        # during startup, this much of each frame can be spent loading assets
+        self.asset_loading_budget_s: float = 0.010
+        # if true, images and fonts are reloaded from disk when they change (for artists)
+        self.hot_reload_assets: bool = False
+        # while playing, stats are saved at most this often, no matter how many gems are collected
+        self.autosave_min_interval_s: float = 5.0
+        # and at least this often, so the play time is kept up to date
+        self.autosave_periodic_interval_s: float = 60.0
 
         # this should hold about 3 seconds of frame-times
         self.frame_time_dequeue = deque(maxlen=90)
@@ -489,25 +523,71 @@ class StatisticsData:
             'total_gems_collected': 0,
             'total_points': 0,
             'longest_streak': 0,
-            'player_streak_history':[]
         }
         self.player_stats_file_path = PLAYER_STATS_FILE
+        self.player_stats_backup_file_path = PLAYER_STATS_BACKUP_FILE
+
+        # set whenever the stats change, and cleared when the autosave takes a snapshot
+        self.has_unsaved_changes: bool = False
+
+        # the streak history lives in its own file, so each streak is one small append, instead of a rewrite
+        self.player_streak_history = StreakLog(PLAYER_STREAK_LOG_FILE)
+
+        # if set, the stats and streaks are kept in a sqlite database instead (see load_statistics_store).  game.data
+        # and game.streaks are still read the first time, to fill the database, but are never written
+        self.use_statistics_database: bool = False
+        self.statistics_database_file_path = PLAYER_STATS_DATABASE_FILE
+        self.statistics_store = None
+
+        # the older part of the streak history, as it's compressed in game.data
+        self.compact_history: CompactHistory = None
+        # once the log has this many records, they're compacted into game.data, when the game closes
+        self.compact_streak_history_after_n_records = 1024
+
+        # a numpy copy of the history, rebuilt only when the history has grown (see get_streak_analytics)
+        self._streak_analytics = None
+
+        # per-session, per-day, and per-week totals, kept up to date as things happen
+        self.rollups = StatisticsRollups()
+        # saves from before rollups existed have none, so the day and week buckets are filled in from the first
+        # this many records, once the history has loaded (see update_rollups_backfill)
+        self._rollups_backfill_record_count = None
+
+        # streaks older than this are dropped from the raw history when it's compacted.  They are still counted in
+        # the rollups, and in streak_counts.  The slack stops the history being rewritten for every save
+        self.streak_history_retention_s = 365 * 86400
+        self.streak_history_retention_slack_s = 7 * 86400
 
         self.playtime_for_all_prior_sessions_duration_s = 0
         self.playtime_this_session_started_at_time = None
 
         # after parsing player history, this holds a dict where keys are the length of a streak, and
-        # values are the number of times that streak has been achieved
+        # values are the number of times that streak has been achieved.  It is saved in game.data, and kept up to
+        # date as streaks happen, so the history is only walked if the saved counts are missing or stale
         self.streak_counts = None
 
-        # this many of the top streaks will be displayed
+        # the stats menu shows this many rows of the streak table at a time
         self.display_n_top_streaks = 10
 
+        # every distinct streak length, in ascending order.  It's updated with each new streak length, so the stats
+        # menu never has to sort streak_counts
+        self.streak_lengths = []
+        # goes up whenever streak_counts changes, so the stats menu knows when to draw the table again
+        self.streak_counts_version: int = 0
+
     def add_one_point(self):
         self.player_stats['total_points'] += 1
+        self.rollups.record_point(time.time())
+        self.has_unsaved_changes = True
 
     def collect_one_gem(self):
         self.player_stats['total_gems_collected'] += 1
+        self.rollups.record_gem(time.time())
+        self.has_unsaved_changes = True
+
+    def start_session(self):
+        self.playtime_this_session_started_at_time = time.time()
+        self.rollups.start_session(self.playtime_this_session_started_at_time)
 
     def get_points(self):
         return self.player_stats['total_points']
@@ -516,7 +596,7 @@ class StatisticsData:
         return self.player_stats['longest_streak']
 
     def get_streak_history(self):
-        return self.player_stats['player_streak_history']
+        return self.player_streak_history
 
     def update_longest_streak(self, value):
         key = 'longest_streak'
@@ -525,28 +605,291 @@ class StatisticsData:
         elif self.player_stats[key] < value:
             self.player_stats[key] = value
             print(f'New longest streak! {value}')
+        self.has_unsaved_changes = True
 
     def update_streak_history(self, value):
-        key = 'player_streak_history'
-        if not key in self.player_stats:
-            self.player_stats[key] = []
-        self.player_stats[key].append((time.time(), value))
-        # print(f'Streak: {value}')
+        timestamp = time.time()
+        self.player_streak_history.append(value, timestamp)
+        self.rollups.record_streak(timestamp, value)
+        if self.statistics_store is not None:
+            self.statistics_store.append_streak(value, timestamp)
+        if self.streak_counts is not None:
+            if value not in self.streak_counts:
+                self.streak_counts[value] = 0
+                insort(self.streak_lengths, value)
+            self.streak_counts[value] += 1
+            self.streak_counts_version += 1
+        self.has_unsaved_changes = True
+
+    def rebuild_streak_lengths(self):
+        """ called when streak_counts is replaced """
+        self.streak_lengths = sorted(self.streak_counts or {})
+        self.streak_counts_version += 1
+
+    def set_display_n_top_streaks(self, value: int):
+        self.display_n_top_streaks = value
+
+    def get_top_streaks(self) -> list[tuple[int, int]]:
+        """ returns [(streak length, count)] for the longest display_n_top_streaks streak lengths, longest first """
+        if self.is_streak_table_in_store():
+            return self.statistics_store.get_top_streaks(self.display_n_top_streaks)
+        lengths = self.streak_lengths
+        top_lengths = lengths[max(0, len(lengths) - self.display_n_top_streaks):]
+        return [(length, self.streak_counts[length]) for length in reversed(top_lengths)]
+
+    def is_streak_table_in_store(self) -> bool:
+        """ True if the stats table can be read from the database's length index.  Streaks dropped from the history
+        before the database existed are only counted in the rollups, so then it comes from streak_counts instead
+        """
+        return self.statistics_store is not None and not self.rollups.retired_streak_counts
+
+    def get_streak_row_count(self) -> int:
+        """ the number of rows in the full streak table, one for each distinct streak length """
+        if self.is_streak_table_in_store():
+            return self.statistics_store.get_streak_length_count()
+        return len(self.streak_lengths)
+
+    def get_streak_rows(self, start: int, stop: int) -> list[tuple[int, int]]:
+        """ returns [(streak length, count)] for rows start to stop of the full table, longest first """
+        if self.is_streak_table_in_store():
+            return self.statistics_store.get_streak_rows(start, stop)
+        lengths = self.streak_lengths
+        row_count = len(lengths)
+        start = max(0, start)
+        stop = min(stop, row_count)
+        return [(lengths[row_count - 1 - row], self.streak_counts[lengths[row_count - 1 - row]])
+                for row in range(start, stop)]
+
+    def count_streaks_at_least(self, length: int) -> int:
+        """ the number of streaks at least length long, from the database's length index, if there is one """
+        if self.is_streak_table_in_store():
+            return self.statistics_store.count_streaks_at_least(length)
+        return sum(count for streak_length, count in (self.streak_counts or {}).items() if streak_length >= length)
+
+    def count_streaks_this_week(self) -> int:
+        """ the number of streaks since the start of this week, from the database's timestamp index, if there is one,
+        or else from this week's rollup.  Retired streaks are long past, so they never count
+        """
+        week_start = self.rollups.get_bucket_start(ERollupPeriod.WEEK, time.time())
+        if self.statistics_store is not None:
+            return self.statistics_store.count_streaks_since(week_start)
+        weeks = self.rollups.get_buckets(ERollupPeriod.WEEK)
+        return weeks[-1].streak_count if weeks and weeks[-1].start == week_start else 0
+
+    def load_streak_history(self, lazy: bool = False):
+        """ Opens the streak log.  If lazy is set, the records are left on disk, to be read in chunks later (see
+        StreakLog.load_chunk).  The saved streak_counts don't need the records, so this is quick, unless the counts
+        are stale, and have to be rebuilt.
+
+        The oldest records are compacted into game.data (see save_format), and come first.  Older versions of
+        game.data were json, and kept the history in player_stats, as a list of [timestamp, length].  If the log is
+        empty, that list is moved into it.  Either way, these are dropped from player_stats
+        """
+        saved_streak_counts = self.player_stats.pop('streak_counts', None)
+        saved_streak_counts_record_count = self.player_stats.pop('streak_counts_record_count', None)
+        legacy_history = self.player_stats.pop('player_streak_history', None)
+        saved_rollups = self.player_stats.pop('rollups', None)
+
+        self.compact_history = self.player_stats.pop('compact_history', None)
+        expected_log_id = None
+        if self.compact_history is not None:
+            expected_log_id = self.compact_history.log_id
+            self.player_streak_history.set_compacted_records(self.compact_history.record_count,
+                                                             self.compact_history.iter_chunks())
+
+        was_opened = self.player_streak_history.open(lazy=lazy, expected_log_id=expected_log_id)
+        if legacy_history and (not was_opened or self.player_streak_history.get_log_record_count() == 0):
+            # if the log didn't open, these stay in memory, and are compacted into game.data on the next save
+            self.player_streak_history.extend(legacy_history)
+
+        self.load_saved_summaries(saved_streak_counts, saved_streak_counts_record_count, saved_rollups)
+        return was_opened
+
+    def load_saved_summaries(self, saved_streak_counts: dict, saved_streak_counts_record_count: int, saved_rollups):
+        """ takes the saved rollups and streak counts, once the history has been opened.  Missing rollups are
+        backfilled later, and missing or stale streak counts are rebuilt now
+        """
+        if saved_rollups is not None:
+            # the session started before the save was loaded, so it moves over
+            session = self.rollups.get_current_session()
+            self.rollups = saved_rollups
+            if session is not None:
+                self.rollups.start_session(session.start)
+        else:
+            self._rollups_backfill_record_count = len(self.player_streak_history)
+
+        # the counts are only trusted if they were saved for exactly this many records.  If the game crashed
+        # between appending a streak and saving, the log is ahead of the counts
+        if saved_streak_counts is not None and saved_streak_counts_record_count == len(self.player_streak_history):
+            # json turns the keys into strings
+            self.streak_counts = {int(length): count for length, count in saved_streak_counts.items()}
+            self.rebuild_streak_lengths()
+        else:
+            self.rebuild_streak_counts()
+
+    def load_statistics_store(self, store, lazy: bool = False) -> bool:
+        """ Switches to the sqlite backend.  Call this instead of load_streak_history, once game.data has been read
+        into player_stats.  The first time, the database is empty, and game.data and game.streaks are copied into it.
+        After that, the stats come from the database, and game.data is ignored
+
+        Args:
+            store(StatisticsStore) - the database, which is opened here
+            lazy(bool) - if True, the streaks are read later, in chunks (see StreakLog.load_chunk)
+
+        Returns:
+            is_using_database(bool) - False, if the database couldn't be used, and the files were loaded instead
+        """
+        if not store.open():
+            self.load_streak_history(lazy=lazy)
+            return False
+
+        if store.is_empty():
+            # a missing log isn't created, it would never be written
+            if not os.path.exists(self.player_streak_history.path):
+                self.player_streak_history.path = None
+            self.load_streak_history()
+            history = self.player_streak_history
+            if not store.import_save_data(self.get_save_data(), history.timestamps, history.lengths):
+                # the log is still open, so the files carry on as usual
+                store.close()
+                return False
+            # the log stays in memory, but its file is finished with
+            history.close()
+        else:
+            self.player_stats = dict.fromkeys(SAVE_FILE_SCALARS, 0) | store.read_save_data()
+            saved_streak_counts = self.player_stats.pop('streak_counts')
+            saved_streak_counts_record_count = self.player_stats.pop('streak_counts_record_count')
+
+            # the rows are handed to the log the way compacted records are, so they load in chunks the same way
+            self.player_streak_history = StreakLog()
+            self.player_streak_history.set_compacted_records(saved_streak_counts_record_count,
+                                                             store.iter_streak_chunks())
+            if not lazy:
+                self.player_streak_history.load_all()
+            self.load_saved_summaries(saved_streak_counts, saved_streak_counts_record_count,
+                                      self.player_stats.pop('rollups', None))
+
+        self.statistics_store = store
+        return True
+
+    def update_rollups_backfill(self):
+        """ fills the day and week buckets from the history saved before rollups existed, once it has loaded """
+        record_count = self._rollups_backfill_record_count
+        history = self.player_streak_history
+        if record_count is None or not history.is_loaded():
+            return
+        self.rollups.add_streak_history(history.timestamps[:record_count], history.lengths[:record_count])
+        self._rollups_backfill_record_count = None
+
+    def get_expired_streak_count(self, now: float = None) -> int:
+        """ returns the number of streaks at the start of the history which are past the retention window, or 0
+        until the oldest one is past it by more than the slack.  Always 0 while the history is still loading
+        """
+        history = self.player_streak_history
+        if not history.is_loaded() or not len(history):
+            return 0
+        cutoff = (time.time() if now is None else now) - self.streak_history_retention_s
+        if history.timestamps[0] >= cutoff - self.streak_history_retention_slack_s:
+            return 0
+        return bisect_left(history.timestamps, cutoff)
+
+    def should_compact_streak_history(self) -> bool:
+        """ compacting compresses the new records into a stream of their own (see CompactHistory), so it only happens
+        once enough new records have built up, or old records are past the retention window, which rebuilds the whole
+        history, or if the log couldn't be opened, and the records would be lost otherwise
+        """
+        if self.statistics_store is not None:
+            # the database keeps every streak, it has nothing to compact into
+            return False
+        log_record_count = self.player_streak_history.get_log_record_count()
+        if not self.player_streak_history.is_open():
+            return log_record_count > 0
+        return (log_record_count >= self.compact_streak_history_after_n_records
+                or self.get_expired_streak_count() > 0)
+
+    def compact_streak_history(self) -> CompactHistory:
+        """ Returns a new CompactHistory, with every record in it, except the ones past the retention window.
+        Nothing changes until it has been saved, and passed to apply_compacted_streak_history
+        """
+        history = self.player_streak_history
+        dropped_record_count = self.get_expired_streak_count()
+        if dropped_record_count:
+            # the start of the compressed history changes, so it's rebuilt
+            compact_history = CompactHistory(dropped_record_count=dropped_record_count)
+            start = dropped_record_count
+        else:
+            compact_history = self.compact_history or CompactHistory()
+            start = compact_history.record_count
+        return compact_history.extend(history.timestamps[start:], history.lengths[start:], StreakLog.new_log_id())
+
+    def apply_compacted_streak_history(self, compact_history: CompactHistory):
+        """ call this once game.data has been written with this compact_history, to empty the log, and drop the
+        records which were left out of it
+        """
+        self.compact_history = compact_history
+        self.player_streak_history.rotate(compact_history.log_id)
+
+        dropped_record_count = compact_history.dropped_record_count
+        if dropped_record_count:
+            self.update_rollups_backfill()
+            self.rollups.retire_streaks(self.player_streak_history.lengths[:dropped_record_count])
+            self.player_streak_history.drop_compacted_records(dropped_record_count)
+            self._streak_analytics = None
+
+    def close_streak_history(self):
+        self.player_streak_history.close()
+        if self.statistics_store is not None:
+            self.statistics_store.close()
+
+    def rebuild_streak_counts(self):
+        """ walks the whole history, so this is only for loading and migrating.  Streaks dropped from the history
+        are still counted, from the rollups
+        """
+        streak_counts = Counter(self.rollups.retired_streak_counts)
+        streak_counts.update(self.player_streak_history.lengths)
+        self.streak_counts = dict(streak_counts)
+        self.rebuild_streak_lengths()
 
     def parse_player_history(self):
-        def count_streak_lengths(data):
-            streaks = [y for x,y in data]
-            result = {}
-            for streak in streaks:
-                if streak not in result:
-                    result[streak] = 1
-                else:
-                    result[streak] += 1
-            return result
-
-        history = self.get_streak_history()
-        streaks = count_streak_lengths(history)
-        self.streak_counts = streaks
+        """ makes sure streak_counts exists.  Once it does, update_streak_history keeps it current, so this is cheap
+        to call every time the stats menu opens
+        """
+        if self.streak_counts is None:
+            self.rebuild_streak_counts()
+
+    def get_streak_analytics(self):
+        """ Returns a StreakAnalytics for the whole history, or None if numpy isn't installed, or the history is still
+        loading.  The same one is returned until there are new streaks
+        """
+        history = self.player_streak_history
+        if not streak_analytics.is_available() or not history.is_loaded():
+            return None
+        if self._streak_analytics is None or len(self._streak_analytics) != len(history):
+            self._streak_analytics = streak_analytics.StreakAnalytics(history.timestamps, history.lengths)
+        return self._streak_analytics
+
+    def get_save_data(self, compact_history: CompactHistory = None) -> dict:
+        """ returns a copy of everything that goes in game.data, which is safe to hand to another thread
+
+        Args:
+            compact_history(CompactHistory) - a newly compacted history to save, instead of the current one
+        """
+        save_data = dict(self.player_stats)
+        dropped_record_count = compact_history.dropped_record_count if compact_history is not None else 0
+        if self.streak_counts is not None:
+            save_data['streak_counts'] = dict(self.streak_counts)
+            save_data['streak_counts_record_count'] = len(self.player_streak_history) - dropped_record_count
+        save_data['compact_history'] = (compact_history or self.compact_history
+                                        or CompactHistory(log_id=self.player_streak_history.log_id))
+
+        # until the backfill has happened, the rollups are left out, so the next load tries again
+        self.update_rollups_backfill()
+        if self._rollups_backfill_record_count is None:
+            rollups = self.rollups.copy()
+            if dropped_record_count:
+                rollups.retire_streaks(self.player_streak_history.lengths[:dropped_record_count])
+            save_data['rollups'] = rollups
+        return save_data
 
 class UIData:
     """ the UIData class holds information related to drawing UI on screen, regardless of which
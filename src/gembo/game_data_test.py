@@ -1,10 +1,315 @@
 import unittest
 
+import os
+import time
+
+from src.gembo import streak_analytics
+from src.gembo.rollups import ERollupPeriod
+from src.gembo.game_data import StatisticsData
+from src.gembo.save_format import decode_save_file, encode_save_file
+from src.gembo.statistics_store import StatisticsStore
+
 
 class GameDataTestCases(unittest.TestCase):
 
     def test_framework_can_pass_a_test(self):
         self.assertTrue(True)
 
+
+    # class StatisticsData ---------------------------------------------------------------------------------------------
+
+    def make_statistics(self):
+        statistics = StatisticsData()
+        statistics.player_streak_history.path = 'deleteme.streaks'
+        self.addCleanup(lambda: os.path.exists('deleteme.streaks') and os.remove('deleteme.streaks'))
+        self.addCleanup(statistics.close_streak_history)
+        return statistics
+
+    def test__classStatisticsData__fnLoadStreakHistory__movesLegacyListIntoLog(self):
+        statistics = self.make_statistics()
+        statistics.player_stats['player_streak_history'] = [[1.0, 2], [3.0, 4]]
+
+        self.assertTrue(statistics.load_streak_history())
+        self.assertFalse('player_streak_history' in statistics.player_stats)
+        self.assertEqual(list(statistics.get_streak_history()), [(1.0, 2), (3.0, 4)])
+
+    def test__classStatisticsData__fnLoadStreakHistory__leavesRecordsOnDisk__whenLazyAndCountsAreSaved(self):
+        statistics = self.make_statistics()
+        statistics.load_streak_history()
+        statistics.update_streak_history(2)
+        save_data = statistics.get_save_data()
+        statistics.close_streak_history()
+
+        reloaded = self.make_statistics()
+        reloaded.player_stats = save_data
+        reloaded.load_streak_history(lazy=True)
+        self.assertFalse(reloaded.player_streak_history.is_loaded())
+        self.assertEqual(reloaded.streak_counts, {2: 1})
+
+    def test__classStatisticsData__fnParsePlayerHistory__countsStreakLengths(self):
+        statistics = self.make_statistics()
+        statistics.load_streak_history()
+        for value in [1, 2, 2, 5]:
+            statistics.update_streak_history(value)
+
+        statistics.parse_player_history()
+        self.assertEqual(statistics.streak_counts, {1: 1, 2: 2, 5: 1})
+
+    def test__classStatisticsData__fnUpdateStreakHistory__updatesCountsWithoutRebuilding(self):
+        statistics = self.make_statistics()
+        statistics.streak_counts = {}
+        statistics.update_streak_history(3)
+        statistics.update_streak_history(3)
+        self.assertEqual(statistics.streak_counts, {3: 2})
+
+    def test__classStatisticsData__fnLoadStreakHistory__usesSavedCounts__whenRecordCountMatches(self):
+        statistics = self.make_statistics()
+        statistics.player_stats['player_streak_history'] = [[1.0, 2]]
+        # deliberately different from the history, to prove the history wasn't walked
+        statistics.player_stats['streak_counts'] = {'7': 1}
+        statistics.player_stats['streak_counts_record_count'] = 1
+
+        statistics.load_streak_history()
+        self.assertEqual(statistics.streak_counts, {7: 1})
+        self.assertFalse('streak_counts' in statistics.player_stats)
+
+    def test__classStatisticsData__fnLoadStreakHistory__rebuildsCounts__whenSavedCountsAreStale(self):
+        statistics = self.make_statistics()
+        statistics.player_stats['player_streak_history'] = [[1.0, 2], [2.0, 2]]
+        statistics.player_stats['streak_counts'] = {'2': 1}
+        statistics.player_stats['streak_counts_record_count'] = 1
+
+        statistics.load_streak_history()
+        self.assertEqual(statistics.streak_counts, {2: 2})
+
+    def test__classStatisticsData__fnGetTopStreaks__returnsLongestFirst__afterLoad(self):
+        statistics = self.make_statistics()
+        statistics.display_n_top_streaks = 3
+        statistics.player_stats['player_streak_history'] = [[0.0, n] for n in [1, 5, 2, 9, 5, 7, 3]]
+        statistics.load_streak_history()
+        self.assertEqual(statistics.get_top_streaks(), [(9, 1), (7, 1), (5, 2)])
+
+    def test__classStatisticsData__fnGetTopStreaks__tracksNewStreaks(self):
+        statistics = self.make_statistics()
+        statistics.display_n_top_streaks = 2
+        statistics.load_streak_history()
+        for value in [3, 1, 4, 1, 2, 4]:
+            statistics.update_streak_history(value)
+        self.assertEqual(statistics.get_top_streaks(), [(4, 2), (3, 1)])
+
+    def test__classStatisticsData__fnUpdateStreakHistory__keepsStreakLengthsSorted(self):
+        statistics = self.make_statistics()
+        statistics.load_streak_history()
+        for value in [3, 1, 4, 1]:
+            statistics.update_streak_history(value)
+        self.assertEqual(statistics.streak_lengths, [1, 3, 4])
+
+    def test__classStatisticsData__fnSetDisplayNTopStreaks__changesNumberOfTopStreaks(self):
+        statistics = self.make_statistics()
+        statistics.display_n_top_streaks = 1
+        statistics.load_streak_history()
+        for value in [3, 1, 4]:
+            statistics.update_streak_history(value)
+        statistics.set_display_n_top_streaks(3)
+        self.assertEqual([length for length, _ in statistics.get_top_streaks()], [4, 3, 1])
+
+    def test__classStatisticsData__fnCountStreaksAtLeast__countsFromStreakCounts(self):
+        statistics = self.make_statistics()
+        statistics.player_stats['player_streak_history'] = [[0.0, n] for n in [1, 5, 2, 9, 5, 7, 3]]
+        statistics.load_streak_history()
+        self.assertEqual(statistics.count_streaks_at_least(5), 4)
+        self.assertEqual(statistics.count_streaks_at_least(10), 0)
+
+    def test__classStatisticsData__fnCountStreaksThisWeek__countsFromThisWeeksRollup(self):
+        statistics = self.make_statistics()
+        statistics.load_streak_history()
+        self.assertEqual(statistics.count_streaks_this_week(), 0)
+        for value in [3, 1, 4]:
+            statistics.update_streak_history(value)
+        self.assertEqual(statistics.count_streaks_this_week(), 3)
+
+    def test__classStatisticsData__fnGetStreakRows__returnsSliceOfFullTable__longestFirst(self):
+        statistics = self.make_statistics()
+        statistics.display_n_top_streaks = 2
+        statistics.player_stats['player_streak_history'] = [[0.0, n] for n in [1, 5, 2, 9, 5, 7, 3]]
+        statistics.load_streak_history()
+        self.assertEqual(statistics.get_streak_row_count(), 6)
+        self.assertEqual(statistics.get_streak_rows(1, 3), [(7, 1), (5, 2)])
+        self.assertEqual(statistics.get_streak_rows(5, 10), [(1, 1)])
+
+    def test__classStatisticsData__fnUpdateStreakHistory__bumpsStreakCountsVersion(self):
+        statistics = self.make_statistics()
+        statistics.load_streak_history()
+        version = statistics.streak_counts_version
+        for value in [3, 1, 4, 1]:
+            statistics.update_streak_history(value)
+        self.assertEqual(statistics.streak_counts_version, version + 4)
+
+    def test__classStatisticsData__fnGetSaveData__copiesCounts(self):
+        statistics = self.make_statistics()
+        statistics.load_streak_history()
+        statistics.update_streak_history(4)
+
+        save_data = statistics.get_save_data()
+        statistics.update_streak_history(4)
+        self.assertEqual(save_data['streak_counts'], {4: 1})
+        self.assertEqual(save_data['streak_counts_record_count'], 1)
+
+    def test__classStatisticsData__fnCompactStreakHistory__movesLogIntoSaveData(self):
+        statistics = self.make_statistics()
+        statistics.compact_streak_history_after_n_records = 2
+        statistics.load_streak_history()
+        for value in [1, 2, 3]:
+            statistics.update_streak_history(value)
+        self.assertTrue(statistics.should_compact_streak_history())
+
+        compact_history = statistics.compact_streak_history()
+        save_data = decode_save_file(encode_save_file(statistics.get_save_data(compact_history)))
+        statistics.apply_compacted_streak_history(compact_history)
+        self.assertEqual(statistics.player_streak_history.get_log_record_count(), 0)
+        statistics.update_streak_history(4)
+        statistics.close_streak_history()
+
+        reloaded = self.make_statistics()
+        reloaded.player_stats = save_data
+        reloaded.load_streak_history(lazy=True)
+        self.assertEqual(list(reloaded.player_streak_history.lengths), [1, 2, 3, 4])
+        self.assertEqual(reloaded.streak_counts, {1: 1, 2: 1, 3: 1, 4: 1})
+
+    def test__classStatisticsData__fnLoadStreakHistory__ignoresStaleLog__afterCrashDuringCompaction(self):
+        statistics = self.make_statistics()
+        statistics.load_streak_history()
+        statistics.update_streak_history(5)
+
+        # game.data is written, but the game dies before the log is rotated
+        save_data = decode_save_file(encode_save_file(
+            statistics.get_save_data(statistics.compact_streak_history())))
+        statistics.close_streak_history()
+
+        reloaded = self.make_statistics()
+        reloaded.player_stats = save_data
+        reloaded.load_streak_history()
+        self.assertEqual(list(reloaded.player_streak_history.lengths), [5])
+
+    @unittest.skipUnless(streak_analytics.is_available(), 'numpy is not installed')
+    def test__classStatisticsData__fnGetStreakAnalytics__isRebuiltOnlyForNewStreaks(self):
+        statistics = self.make_statistics()
+        statistics.load_streak_history()
+        statistics.update_streak_history(2)
+
+        analytics = statistics.get_streak_analytics()
+        self.assertIs(analytics, statistics.get_streak_analytics())
+
+        statistics.update_streak_history(5)
+        self.assertIsNot(analytics, statistics.get_streak_analytics())
+        self.assertEqual(statistics.get_streak_analytics().get_longest_streak(), 5)
+
+    def test__classStatisticsData__updatesRollups__asThingsHappen(self):
+        statistics = self.make_statistics()
+        statistics.start_session()
+        statistics.load_streak_history()
+        statistics.collect_one_gem()
+        statistics.add_one_point()
+        statistics.update_streak_history(3)
+
+        session = statistics.rollups.get_current_session()
+        self.assertEqual((session.gems, session.points, session.streak_count, session.longest_streak), (1, 1, 1, 3))
+        self.assertEqual(statistics.get_save_data()['rollups'].get_current_session(), session)
+
+    def test__classStatisticsData__fnLoadStreakHistory__backfillsRollups__forOlderSaves(self):
+        statistics = self.make_statistics()
+        statistics.start_session()
+        statistics.player_stats['player_streak_history'] = [[1000.0, 2], [2000.0, 5]]
+        statistics.load_streak_history()
+        statistics.update_streak_history(1)
+
+        save_data = statistics.get_save_data()
+        days = save_data['rollups'].get_buckets(ERollupPeriod.DAY)
+        self.assertEqual(sum(day.streak_count for day in days), 3)
+        self.assertEqual(statistics.rollups.get_current_session().streak_count, 1)
+
+    def test__classStatisticsData__fnCompactStreakHistory__dropsExpiredStreaks__intoRollups(self):
+        statistics = self.make_statistics()
+        now = time.time()
+        old = now - statistics.streak_history_retention_s - 30 * 86400
+        statistics.player_stats['player_streak_history'] = [[old, 8], [old + 1, 8], [now - 10, 2]]
+        statistics.load_streak_history()
+        self.assertEqual(statistics.get_expired_streak_count(), 2)
+        self.assertTrue(statistics.should_compact_streak_history())
+
+        compact_history = statistics.compact_streak_history()
+        self.assertEqual(compact_history.record_count, 1)
+        save_data = statistics.get_save_data(compact_history)
+        self.assertEqual(save_data['streak_counts_record_count'], 1)
+        self.assertEqual(save_data['rollups'].retired_streak_counts, {8: 2})
+
+        statistics.apply_compacted_streak_history(compact_history)
+        self.assertEqual(list(statistics.get_streak_history().lengths), [2])
+        self.assertEqual(statistics.streak_counts, {8: 2, 2: 1})
+        statistics.rebuild_streak_counts()
+        self.assertEqual(statistics.streak_counts, {8: 2, 2: 1})
+        self.assertEqual(statistics.get_expired_streak_count(), 0)
+
+    def test__classStatisticsData__fnGetExpiredStreakCount__waitsForSlack(self):
+        statistics = self.make_statistics()
+        now = time.time()
+        statistics.player_stats['player_streak_history'] = [[now - statistics.streak_history_retention_s - 60, 1]]
+        statistics.load_streak_history()
+        self.assertEqual(statistics.get_expired_streak_count(now), 0)
+
+    def make_statistics_store(self):
+        for path in ['deleteme.db', 'deleteme.db-wal', 'deleteme.db-shm']:
+            self.addCleanup(lambda path=path: os.path.exists(path) and os.remove(path))
+        return StatisticsStore('deleteme.db')
+
+    def test__classStatisticsData__fnLoadStatisticsStore__migratesGameData__thenReadsFromDatabase(self):
+        statistics = self.make_statistics()
+        statistics.player_stats['total_points'] = 12
+        statistics.player_stats['player_streak_history'] = [[1.0, 2], [3.0, 4]]
+        self.assertTrue(statistics.load_statistics_store(self.make_statistics_store()))
+        self.assertFalse(os.path.exists('deleteme.streaks'))
+
+        statistics.update_streak_history(4)
+        statistics.add_one_point()
+        self.assertTrue(statistics.is_streak_table_in_store())
+        self.assertEqual(statistics.get_streak_row_count(), 2)
+        self.assertEqual(statistics.get_streak_rows(0, 10), [(4, 2), (2, 1)])
+        self.assertEqual(statistics.count_streaks_at_least(4), 2)
+        # the migrated streaks are from 1970, only the new one is from this week
+        self.assertEqual(statistics.count_streaks_this_week(), 1)
+        self.assertFalse(statistics.should_compact_streak_history())
+        self.assertTrue(statistics.statistics_store.write_save_data(statistics.get_save_data()))
+        statistics.close_streak_history()
+
+        reloaded = self.make_statistics()
+        self.assertTrue(reloaded.load_statistics_store(self.make_statistics_store(), lazy=True))
+        self.assertEqual(reloaded.get_points(), 13)
+        self.assertEqual(reloaded.streak_counts, {2: 1, 4: 2})
+        self.assertEqual(reloaded.get_top_streaks(), [(4, 2), (2, 1)])
+        self.assertFalse(reloaded.get_streak_history().is_loaded())
+        self.assertEqual(list(reloaded.get_streak_history().lengths), [2, 4, 4])
+
+    def test__classStatisticsData__fnGetStreakRows__usesCounts__whenStreaksWereRetiredBeforeDatabase(self):
+        statistics = self.make_statistics()
+        statistics.player_stats['player_streak_history'] = [[1.0, 2]]
+        self.assertTrue(statistics.load_statistics_store(self.make_statistics_store()))
+        statistics.rollups.retired_streak_counts = {7: 3}
+        statistics.streak_counts[7] = 3
+        statistics.rebuild_streak_lengths()
+
+        self.assertFalse(statistics.is_streak_table_in_store())
+        self.assertEqual(statistics.get_streak_rows(0, 10), [(7, 3), (2, 1)])
+        self.assertEqual(statistics.count_streaks_at_least(5), 3)
+        statistics.close_streak_history()
+
+    def test__classStatisticsData__fnLoadStatisticsStore__fallsBackToFiles__ifDatabaseCantOpen(self):
+        statistics = self.make_statistics()
+        self.make_statistics_store()
+        with open('deleteme.db', 'w') as outfile:
+            outfile.write('not a database, but long enough that sqlite reads the header of it')
+        self.assertFalse(statistics.load_statistics_store(StatisticsStore('deleteme.db')))
+        self.assertIsNone(statistics.statistics_store)
+        self.assertTrue(statistics.get_streak_history().is_open())
+
 if __name__ == '__main__':
     unittest.main()
@@ -1,3 +1,3 @@
 
 from src.gembo.gameplay.game_object import GameObject
-
+from src.gembo.gameplay.render_graph import RenderGraph, ESceneLayer
@@ -59,6 +59,23 @@ class GameObject:
         assert isinstance(image, PySurface)
         self._image = image
 
+    def get_render_layer(self) -> int:
+        return self._render_layer
+
+    def set_render_layer(self, new_layer: int):
+        """ NOTE: once the object is in a RenderGraph, change its layer with RenderGraph.set_render_layer """
+        self._render_layer = new_layer
+
+    def get_do_not_render(self) -> bool:
+        return self._do_not_render
+
+    def set_do_not_render(self, do_not_render: bool):
+        self._do_not_render = do_not_render
+
+    def get_sort_y(self) -> float:
+        """ within a render layer, objects with a greater sort y are drawn on top of the others """
+        return self._position.y
+
 
     def render(self, render_to: PySurface) -> bool:
         """ Render is called as the last step during a frame.  Classes derived from GameObject can override
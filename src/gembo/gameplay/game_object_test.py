@@ -289,6 +289,23 @@ class GameObjectTestCases(TestCase):
         obj = self.MockGameObject()
         self.assertIsNotNone(obj.update)
 
+    # render graph accessors -------------------------------------------------------------------------------------------
+
+    def test__classGameObject__fnSetRenderLayer__setsLayer(self):
+        obj = self.MockGameObject()
+        obj.set_render_layer(3)
+        self.assertEqual(obj.get_render_layer(), 3)
+
+    def test__classGameObject__fnSetDoNotRender__stopsRender(self):
+        obj = self.MockGameObject()
+        obj.set_do_not_render(True)
+        self.assertTrue(obj.get_do_not_render())
+
+    def test__classGameObject__fnGetSortY__returnsPositionY(self):
+        obj = self.MockGameObject()
+        obj.set_position(PyVector2(5, 7))
+        self.assertEqual(obj.get_sort_y(), 7)
+
 
 
 
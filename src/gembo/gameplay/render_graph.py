@@ -0,0 +1,103 @@
+from bisect import insort
+from enum import IntEnum
+
+from pygame.surface import Surface as PySurface
+
+from src.gembo.gameplay.game_object import GameObject
+
+
+class ESceneLayer(IntEnum):
+    """ The render layers gameplay uses, back to front
+
+    GROUND - drawn under everything, ie: the patch of dirt under the cactus
+    SPRITES - the player, the gem, and the cactus, sorted by y
+    """
+    GROUND = 0
+    SPRITES = 1
+
+
+class RenderGraph:
+    """ The RenderGraph holds GameObjects by their render layer, and keeps each layer sorted by y, so objects lower on
+    the screen are drawn in front of the ones behind them.
+
+    Objects barely move between frames, so a layer is almost always still sorted, or a swap or two away from it.
+    That makes insertion sort the right sort: it's linear for a sorted layer, and it's stable, so objects at the
+    same y don't flicker between orders.  Objects with _do_not_render set stay in the graph, but aren't drawn
+    """
+    def __init__(self):
+        # render layer -> [GameObject], sorted by get_sort_y
+        self._layers = {}
+        self._layer_order = []
+
+        # how many places objects moved in the last sort, for tests and profiling
+        self.last_sort_move_count: int = 0
+
+    def __len__(self) -> int:
+        return sum(len(game_objects) for game_objects in self._layers.values())
+
+    def __contains__(self, game_object: GameObject) -> bool:
+        return game_object in self._layers.get(game_object.get_render_layer(), [])
+
+    def add(self, game_object: GameObject):
+        """ adds the object to its render layer, in front of the objects already at its y """
+        layer = game_object.get_render_layer()
+        if layer not in self._layers:
+            self._layers[layer] = []
+            insort(self._layer_order, layer)
+
+        game_objects = self._layers[layer]
+        game_objects.append(game_object)
+        self.sort_layer(game_objects)
+
+    def remove(self, game_object: GameObject):
+        layer = game_object.get_render_layer()
+        game_objects = self._layers.get(layer)
+        if game_objects is None or game_object not in game_objects:
+            return
+        game_objects.remove(game_object)
+        if not game_objects:
+            del self._layers[layer]
+            self._layer_order.remove(layer)
+
+    def set_render_layer(self, game_object: GameObject, new_layer: int):
+        """ moves an object which is already in the graph to another layer """
+        self.remove(game_object)
+        game_object.set_render_layer(new_layer)
+        self.add(game_object)
+
+    def sort_layer(self, game_objects: list[GameObject]) -> int:
+        """ insertion sorts one layer by y, in place, and returns how many places objects moved """
+        sort_ys = [game_object.get_sort_y() for game_object in game_objects]
+        move_count = 0
+        for index in range(1, len(game_objects)):
+            sort_y = sort_ys[index]
+            if sort_ys[index - 1] <= sort_y:
+                continue
+
+            game_object = game_objects[index]
+            insert_at = index - 1
+            while insert_at > 0 and sort_ys[insert_at - 1] > sort_y:
+                insert_at -= 1
+            game_objects[insert_at + 1:index + 1] = game_objects[insert_at:index]
+            sort_ys[insert_at + 1:index + 1] = sort_ys[insert_at:index]
+            game_objects[insert_at] = game_object
+            sort_ys[insert_at] = sort_y
+            move_count += index - insert_at
+        return move_count
+
+    def sort(self) -> int:
+        """ call this once a frame, after the objects have moved, and before drawing them """
+        self.last_sort_move_count = sum(self.sort_layer(self._layers[layer]) for layer in self._layer_order)
+        return self.last_sort_move_count
+
+    def get_draw_order(self):
+        """ yields the objects which should be drawn, back to front """
+        for layer in self._layer_order:
+            for game_object in self._layers[layer]:
+                if not game_object.get_do_not_render():
+                    yield game_object
+
+    def render(self, render_to: PySurface) -> int:
+        """ sorts, and then calls render on every object, back to front.  Returns how many were drawn """
+        self.sort()
+        return sum(1 for game_object in self.get_draw_order() if game_object.render(render_to))
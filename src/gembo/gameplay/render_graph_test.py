@@ -0,0 +1,116 @@
+import unittest
+
+from src.test import AbstractTestBase as TestCase
+
+import pygame
+from pygame.math import Vector2 as PyVector2
+
+from src.gembo.gameplay import GameObject, RenderGraph, ESceneLayer
+
+
+class RenderGraphTestCases(TestCase):
+
+    # test utilities ---------------------------------------------------------------------------------------------------
+
+    @staticmethod
+    def make_game_object(y: float, layer: int = ESceneLayer.SPRITES) -> GameObject:
+        game_object = GameObject(None)
+        game_object.set_position(PyVector2(0, y))
+        game_object.set_render_layer(layer)
+        return game_object
+
+    def test_framework_can_pass_a_test(self):
+        self.assertTrue(True)
+
+
+    # class RenderGraph ------------------------------------------------------------------------------------------------
+
+    def test__classRenderGraph__exists(self):
+        self.assertIsNotNone(RenderGraph)
+
+    def test__classRenderGraph__fnAdd__keepsLayerSortedByY(self):
+        graph = RenderGraph()
+        lower, upper = self.make_game_object(50), self.make_game_object(10)
+        graph.add(lower)
+        graph.add(upper)
+        self.assertEqual(list(graph.get_draw_order()), [upper, lower])
+        self.assertEqual(len(graph), 2)
+        self.assertIn(lower, graph)
+
+    def test__classRenderGraph__fnGetDrawOrder__drawsLowerLayersFirst(self):
+        graph = RenderGraph()
+        sprite = self.make_game_object(0, ESceneLayer.SPRITES)
+        ground = self.make_game_object(100, ESceneLayer.GROUND)
+        graph.add(sprite)
+        graph.add(ground)
+        self.assertEqual(list(graph.get_draw_order()), [ground, sprite])
+
+    def test__classRenderGraph__fnGetDrawOrder__skipsDoNotRender(self):
+        graph = RenderGraph()
+        hidden, shown = self.make_game_object(0), self.make_game_object(1)
+        hidden.set_do_not_render(True)
+        graph.add(hidden)
+        graph.add(shown)
+        self.assertEqual(list(graph.get_draw_order()), [shown])
+
+    def test__classRenderGraph__fnSort__reordersObjectsWhichMoved(self):
+        graph = RenderGraph()
+        game_objects = [self.make_game_object(y) for y in range(5)]
+        for game_object in game_objects:
+            graph.add(game_object)
+
+        game_objects[0].set_position(PyVector2(0, 3.5))
+        self.assertEqual(graph.sort(), 3)
+        self.assertEqual(list(graph.get_draw_order()),
+                         [game_objects[1], game_objects[2], game_objects[3], game_objects[0], game_objects[4]])
+
+    def test__classRenderGraph__fnSort__movesNothing__whenAlreadySorted(self):
+        graph = RenderGraph()
+        for y in range(100):
+            graph.add(self.make_game_object(y))
+        self.assertEqual(graph.sort(), 0)
+
+    def test__classRenderGraph__fnSort__isStable__forEqualY(self):
+        graph = RenderGraph()
+        first, second = self.make_game_object(10), self.make_game_object(10)
+        graph.add(first)
+        graph.add(second)
+        graph.sort()
+        self.assertEqual(list(graph.get_draw_order()), [first, second])
+
+    def test__classRenderGraph__fnSetRenderLayer__movesObjectToLayer(self):
+        graph = RenderGraph()
+        game_object = self.make_game_object(0, ESceneLayer.SPRITES)
+        other = self.make_game_object(10, ESceneLayer.SPRITES)
+        graph.add(game_object)
+        graph.add(other)
+        graph.set_render_layer(other, ESceneLayer.GROUND)
+        self.assertEqual(other.get_render_layer(), ESceneLayer.GROUND)
+        self.assertEqual(list(graph.get_draw_order()), [other, game_object])
+
+    def test__classRenderGraph__fnRemove__dropsEmptyLayer(self):
+        graph = RenderGraph()
+        game_object = self.make_game_object(0)
+        graph.add(game_object)
+        graph.remove(game_object)
+        graph.remove(game_object)
+        self.assertEqual(len(graph), 0)
+        self.assertEqual(list(graph.get_draw_order()), [])
+
+    def test__classRenderGraph__fnRender__rendersBackToFront(self):
+        graph = RenderGraph()
+        surface = pygame.Surface((4, 4))
+        for y, color in [(0, (0, 0, 255)), (-1, (255, 0, 0))]:
+            image = pygame.Surface((4, 4))
+            image.fill(color)
+            game_object = self.make_game_object(y)
+            game_object.set_image(image)
+            game_object.set_position(PyVector2(0, 0))
+            game_object.get_sort_y = lambda y=y: y
+            graph.add(game_object)
+        self.assertEqual(graph.render(surface), 2)
+        self.assertEqual(tuple(surface.get_at((0, 0)))[:3], (0, 0, 255))
+
+
+if __name__ == '__main__':
+    unittest.main()
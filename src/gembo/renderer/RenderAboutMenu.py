@@ -9,8 +9,11 @@ class RenderAboutMenu(RenderMenuBase):
         self.about_menu_font = self.value_or_default('about_menu_font')
         self.homily_font = self.value_or_default('homily_font')
 
-    def render(self):
-        self.render_menu_floor_box()
+    def get_static_layer_key(self):
+        # nothing on the about menu ever changes
+        return ()
+
+    def render_static_layer(self):
         self.render_ellie_loves_games()
         self.render_homily()
 
@@ -19,9 +22,9 @@ class RenderAboutMenu(RenderMenuBase):
         loves = 'love\'s'
         games = 'games'
 
-        ellie_renderable_text = self.about_menu_font.render(ellie, True, EColor.WHITE)
-        loves_renderable_text = self.about_menu_font.render(loves, True, EColor.PINK)
-        games_renderable_text = self.about_menu_font.render(games, True, EColor.LIGHT_BLUE)
+        ellie_renderable_text = self.render_text(self.about_menu_font, ellie, True, EColor.WHITE)
+        loves_renderable_text = self.render_text(self.about_menu_font, loves, True, EColor.PINK)
+        games_renderable_text = self.render_text(self.about_menu_font, games, True, EColor.LIGHT_BLUE)
 
         renderable_texts = [ellie_renderable_text, loves_renderable_text, games_renderable_text]
 
@@ -30,7 +33,7 @@ class RenderAboutMenu(RenderMenuBase):
             text_width, _ = renderable_text.get_size()
             x_pos = (self.surface_width / 2) - (text_width / 2)
             y_pos += 40
-            self.render_surface.blit(renderable_text, (x_pos, y_pos))
+            self.blit(renderable_text, (x_pos, y_pos))
 
 
     def render_homily(self):
@@ -38,7 +41,7 @@ class RenderAboutMenu(RenderMenuBase):
         # text1 = 'For my friend Greg'
         # text2 = 'who wanted to make small games.'
 
-        renderable_text1 = self.homily_font.render(text1, True, EColor.COOL_GREY)
+        renderable_text1 = self.render_text(self.homily_font, text1, True, EColor.COOL_GREY)
         # renderable_text2 = self.homily_font.render(text2, True, EColor.COOL_GREY)
 
         renderable_texts = [
@@ -51,6 +54,6 @@ class RenderAboutMenu(RenderMenuBase):
             text_width, _ = renderable_text.get_size()
             x_pos = (self.surface_width / 2) - (text_width / 2)
             y_pos += 30
-            self.render_surface.blit(renderable_text, (x_pos, y_pos))
+            self.blit(renderable_text, (x_pos, y_pos))
 
 
@@ -7,15 +7,22 @@ class RenderDemo(RenderMenuBase):
         super().__init__(engine, surface, mode, render_dict)
         self.demo_title_font = self.value_or_default('demo_title_font')
         self.window_title = self.value_or_default('window_title')
+        self.fn_get_loading_progress: callable = self.value_or_default('fn_get_loading_progress')
 
-    def render(self):
-        self.render_menu_floor_box()
+    def get_static_layer_key(self):
+        return self.window_title
+
+    def render_static_layer(self):
         self.render_demo_title()
 
+    def render_animated_layer(self):
+        super().render_animated_layer()
+        self.render_loading_progress()
+
     def render_demo_title(self):
         demo_mode_title_string = self.window_title
-        demo_mode_title_renderable_text = self.demo_title_font.render(demo_mode_title_string, True,
-                                                                    EColor.HIGHLIGHT_YELLOW)
+        demo_mode_title_renderable_text = self.render_text(self.demo_title_font, demo_mode_title_string, True,
+                                                           EColor.HIGHLIGHT_YELLOW)
 
         # calculate centered on screen position
         text_width, _ = demo_mode_title_renderable_text.get_size()
@@ -24,5 +31,19 @@ class RenderDemo(RenderMenuBase):
         pos_x = (self.surface_width / 2) - (text_width / 2)
 
         # blit
-        self.render_surface.blit(demo_mode_title_renderable_text, (pos_x, pos_y))
-
+        self.blit(demo_mode_title_renderable_text, (pos_x, pos_y))
+
+    def render_loading_progress(self):
+        """ while assets are streaming in, a thin bar under the title shows how far along loading is """
+        if self.fn_get_loading_progress is None:
+            return
+
+        progress = self.fn_get_loading_progress()
+        if progress >= 1.0:
+            return
+
+        bar_width = self.surface_width / 2
+        left = (self.surface_width / 2) - (bar_width / 2)
+        pos_y = 220
+        self.draw_line(EColor.COOL_GREY, (left, pos_y), (left + bar_width, pos_y), 1)
+        self.draw_line(EColor.HIGHLIGHT_YELLOW, (left, pos_y), (left + bar_width * progress, pos_y), 1)
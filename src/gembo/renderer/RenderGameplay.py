@@ -6,12 +6,14 @@ from pygame.math import lerp as pygame_lerp
 from pygame.time import set_timer as pygame_set_timer
 
 # engine
+from src.engine.render_queue import ERenderLayer
 from src.engine.time_utility import TimeConstants
 from src.engine.utilities import clamp
 
 # game
+from src.gembo.gameplay import GameObject, RenderGraph, ESceneLayer
 from src.gembo.renderer.render_mode import (AbstractRenderMode, Surface, EUpdateMode, EColor, Padding,
-                                            render_breathe_box, pygame_draw_line, pygame_draw_circle)
+                                            pygame_draw_line, pygame_draw_circle)
 
 
 # update_modes
@@ -34,24 +36,32 @@ class RenderGameplay(AbstractRenderMode):
 
         self.player_streak_font = self.value_or_default('player_streak_font')
 
+        # None, if numpy isn't installed
+        self._particles = self.value_or_default('particles')
+
+        # the sprites are drawn through a render graph, which keeps them sorted by y, so whichever one is lower on
+        # the screen is drawn in front.  The nodes are synced from the game data every frame
+        self._scene = RenderGraph()
+        self._player_node = self.add_scene_node(ESceneLayer.SPRITES)
+        self._gem_node = self.add_scene_node(ESceneLayer.SPRITES)
+        self._cactus_node = self.add_scene_node(ESceneLayer.SPRITES)
+        self._cactus_base_node = self.add_scene_node(ESceneLayer.GROUND)
+
+    def add_scene_node(self, layer: ESceneLayer) -> GameObject:
+        node = GameObject(self.engine)
+        node.set_render_layer(layer)
+        node.set_do_not_render(True)
+        self._scene.add(node)
+        return node
+
 
     def render(self):
         self.render_gameplay_floor()
         self.render_gameplay_timer()
         self.render_gameplay_points()
         self.render_current_streak_popup()
-
-        # changes the render order, depending on whether the player is "lower" on the screen,
-        # (ie: closer to the bottom) or the cactus is.  This allows the player image to be on
-        # top of the cactus, when the player is in front of it
-        if self._player.position.y > self._cactus.position.y:
-            self.render_gem_image()
-            self.render_cactus_image()
-            self.render_player_image()
-        else:
-            self.render_player_image()
-            self.render_gem_image()
-            self.render_cactus_image()
+        self.render_scene()
+        self.render_particles()
 
 
     def render_gameplay_floor(self):
@@ -80,13 +90,14 @@ class RenderGameplay(AbstractRenderMode):
 
             floor_line_width = self._gameplay.gem_streak_length
 
-        render_breathe_box(
+        self.breathe_boxes.render(
             surface=self.render_surface,
             padding=Padding(left, top, right, bottom),
             color=floor_line_color,
             width=floor_line_width,
-            is_animated=True,
-            breathe_ratio=5.0
+            breathe_ratio=5.0,
+            dirty_rects=self.dirty_rects,
+            render_queue=self.render_queue
         )
 
     def render_gameplay_timer(self):
@@ -110,15 +121,17 @@ class RenderGameplay(AbstractRenderMode):
             else:
                 self._ui.unhighlight_time_played_text()
 
+            # the timer changes every second, so it's composed from the glyph atlas instead of rendered
+            timer_string = timer_string.strip()
+            timer_glyphs = self.get_glyph_atlas(self._gameplay.font, True, self._ui.time_played_text_color)
+
             # calculate centered-on-screen position for the update_modes timer
-            gameplay_timer_renderable_text = self._gameplay.font.render(timer_string.strip(), True,
-                                                                        self._ui.time_played_text_color)
-            gameplay_timer_width, _ = gameplay_timer_renderable_text.get_size()
+            gameplay_timer_width, _ = timer_glyphs.size(timer_string)
             _, pos_y = self._ui.time_played_text_position
             pos_x = (self.surface_width / 2) - (gameplay_timer_width / 2)
 
             # blit
-            self.render_surface.blit(gameplay_timer_renderable_text, (pos_x, pos_y))
+            self.render_glyphs(timer_glyphs, timer_string, (pos_x, pos_y))
 
 
     def render_gameplay_points(self):
@@ -128,15 +141,15 @@ class RenderGameplay(AbstractRenderMode):
 
             # build points string
             point_total_string = f'{total}'
-            point_total_renderable_text = self._gameplay.font.render(point_total_string, True, self._ui.point_total_text_color)
+            point_total_glyphs = self.get_glyph_atlas(self._gameplay.font, True, self._ui.point_total_text_color)
 
             # calculate centered on screen position
-            point_total_width, _ = point_total_renderable_text.get_size()
+            point_total_width, _ = point_total_glyphs.size(point_total_string)
             _, pos_y = self._ui.point_total_text_position
             pos_x = (self.surface_width/2) - (point_total_width/2)
 
             # blit
-            self.render_surface.blit(point_total_renderable_text, (pos_x, pos_y))
+            self.render_glyphs(point_total_glyphs, point_total_string, (pos_x, pos_y))
 
 
     def render_current_streak_popup(self):
@@ -144,9 +157,9 @@ class RenderGameplay(AbstractRenderMode):
         if self.fn_player_streak_popup_is_visible():
             streak = self._gameplay.gem_streak_length
             streak_string = f'x{streak}'
-            streak_renderable_text = self.player_streak_font.render(streak_string, True, EColor.HIGHLIGHT_YELLOW)
+            streak_glyphs = self.get_glyph_atlas(self.player_streak_font, True, EColor.HIGHLIGHT_YELLOW)
 
-            text_width, _ = streak_renderable_text.get_size()
+            text_width, _ = streak_glyphs.size(streak_string)
             pos_x = (self.surface_width/2)-(text_width/2)
 
             final_pos_y = self.surface_height - 90
@@ -162,7 +175,7 @@ class RenderGameplay(AbstractRenderMode):
                 start_pos_y = self.surface_height + 90
                 pos_y = pygame_lerp(start_pos_y, final_pos_y, t_progress)
 
-            self.render_surface.blit(streak_renderable_text, (pos_x, pos_y))
+            self.render_glyphs(streak_glyphs, streak_string, (pos_x, pos_y))
 
             """ When the player starts a streak, they have 1 point.  We will hide the current_streak_popup,
             until the player has 3 points.  Then the popup should:
@@ -175,8 +188,34 @@ class RenderGameplay(AbstractRenderMode):
             """
 
 
-    def render_player_image(self):
-        """ The player image can be mirrored left or right, and anima
+    def render_scene(self):
+        """ draws the sprites, in the order the render graph sorted them into """
+        self.update_player_node()
+        self.update_gem_node()
+        self.update_cactus_nodes()
+        self._scene.sort()
+
+        for node in self._scene.get_draw_order():
+            self.blit(node.get_image(), node.get_position() + node.get_rendering_offset(), layer=ERenderLayer.SPRITES)
+
+    def render_particles(self):
+        """ draws every live particle with one blits command, over the sprites """
+        if self._particles is None:
+            return
+        blit_sequence, rect = self._particles.get_blit_sequence()
+        if rect is not None:
+            # particles move every frame, so the key does too
+            self.blits(blit_sequence, rect, ('particles', self.engine.frame_count), ERenderLayer.SPRITES)
+
+    @staticmethod
+    def sync_scene_node(node: GameObject, image: Surface, position, is_visible: bool = True):
+        node.set_do_not_render(not is_visible or image is None)
+        if image is not None:
+            node.set_image(image)
+        node.set_position(position)
+
+    def update_player_node(self):
+        """ The player image can be mirrored left or right, and animated while moving
         """
         # handle "standing" case
         blit_image = self._player.image
@@ -185,21 +224,15 @@ class RenderGameplay(AbstractRenderMode):
 
         # handle "moving" case
         if self._player.is_moving:
-            if self._player.render_mirrored:
-                blit_image = self._player.sprite_animator.get_animation_frame('walk_flipped')
-            else:
-                blit_image = self._player.sprite_animator.get_animation_frame('walk')
-
-        self.render_surface.blit(blit_image, self._player.position)
-
-
+            blit_image = self._player.sprite_animator.get_animation_frame('walk', flipped=self._player.render_mirrored)
 
-    def render_gem_image(self):
-        if self._gameplay.gem_is_active:
-            self.render_surface.blit(self._gem.image, self._gem.position)
+        self.sync_scene_node(self._player_node, blit_image, self._player.position)
 
-    def render_cactus_image(self):
-        if self._cactus.cactus_is_active:
-            self.render_surface.blit(self._cactus.base_image, self._cactus.position + self._cactus.base_image_offset)
-            self.render_surface.blit(self._cactus.image, self._cactus.position)
+    def update_gem_node(self):
+        self.sync_scene_node(self._gem_node, self._gem.image, self._gem.position, self._gameplay.gem_is_active)
 
+    def update_cactus_nodes(self):
+        is_visible = self._cactus.cactus_is_active
+        self.sync_scene_node(self._cactus_node, self._cactus.image, self._cactus.position, is_visible)
+        self.sync_scene_node(self._cactus_base_node, self._cactus.base_image, self._cactus.position, is_visible)
+        self._cactus_base_node.set_rendering_offset(self._cactus.base_image_offset)
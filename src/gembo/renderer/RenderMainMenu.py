@@ -14,9 +14,10 @@ class RenderMainMenu(RenderMenuBase):
         self.menu = self.value_or_default('menu_data', [])
 
 
-    def render(self):
-        """  """
-        self.render_menu_floor_box()
+    def get_static_layer_key(self):
+        return self.menu.selected_option
+
+    def render_static_layer(self):
         self.render_title_text('Menu')
         self.render_menu_mode_options_text()
 
@@ -32,8 +33,8 @@ class RenderMainMenu(RenderMenuBase):
             color = EColor.COOL_GREY
             if option_enum == self.menu.selected_option:
                 color = EColor.HIGHLIGHT_YELLOW
-            renderable_text = self.title_font.render(option_str, True, color)
+            renderable_text = self.render_text(self.title_font, option_str, True, color)
             text_width, _ = renderable_text.get_size()
             x_pos = (self.surface_width/2) - 90
-            self.render_surface.blit(renderable_text, (x_pos, y_pos))
+            self.blit(renderable_text, (x_pos, y_pos))
 
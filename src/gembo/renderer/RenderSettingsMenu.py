@@ -9,8 +9,10 @@ class RenderSettingsMenu(RenderMenuBase):
         self.settings = self.value_or_default('settings')
         self.selection_font = self.value_or_default('selection_font')
 
-    def render(self):
-        self.render_menu_floor_box()
+    def get_static_layer_key(self):
+        return tuple(self.settings.get_settings_options()), self.engine.ui.get_unhighlight_color()
+
+    def render_static_layer(self):
         self.render_title_text('Settings')
         self.render_settings_mode_options_text()
 
@@ -21,8 +23,8 @@ class RenderSettingsMenu(RenderMenuBase):
         for settings_property, is_selected, value in options:
             string = settings_property
             color = self.engine.ui.get_highlight_color() if is_selected else self.engine.ui.get_unhighlight_color()
-            text = self.selection_font.render(string, True, color)
-            self.render_surface.blit(text, (x_pos, y_pos))
+            text = self.render_text(self.selection_font, string, True, color)
+            self.blit(text, (x_pos, y_pos))
 
             if is_selected:
                 if settings_property in ['sfx']:
@@ -30,7 +32,7 @@ class RenderSettingsMenu(RenderMenuBase):
                 elif settings_property in ['mute']:
                     self.render_on_off_toggle(self.selection_font ,(x_pos+150, y_pos), value)
                 elif settings_property in ['color']:
-                    renderable_text = self.selection_font.render(value, True, self.engine.ui.get_highlight_color())
-                    self.render_surface.blit(renderable_text, (x_pos+150, y_pos))
+                    renderable_text = self.render_text(self.selection_font, value, True, self.engine.ui.get_highlight_color())
+                    self.blit(renderable_text, (x_pos+150, y_pos))
 
             y_pos += 60
@@ -1,4 +1,7 @@
 
+from pygame.locals import RLEACCEL
+
+from src.engine.scroll_list import ScrollList
 from src.gembo.renderer.render_mode import RenderMenuBase, EUpdateMode, EColor, Surface
 
 
@@ -10,44 +13,125 @@ class RenderStatsMenu(RenderMenuBase):
         self.score_font = self.value_or_default('score_font')
         self._statistics = self.value_or_default('statistics')
 
+        # the streak table scrolls through every streak length, display_n_top_streaks rows at a time.  App scrolls it
+        stats_list = self.value_or_default('stats_list')
+        self.stats_list = stats_list if isinstance(stats_list, ScrollList) else ScrollList(
+            30, self._statistics.display_n_top_streaks)
+
+        # where the streak and count columns are centered, under their headings (see render_stats_menu_heading)
+        self._streak_column_center_x = 0
+        self._count_column_center_x = 0
+
+        # the visible rows' blits, which only change when the table does, or it scrolls, so the database isn't
+        # queried every frame
+        self._visible_rows_key = None
+        self._visible_rows_blit_sequence = []
+
+        # the summary lines only change when there are new streaks
+        self._summary_lines = []
+        self._summary_record_count = None
+        self.summary_rolling_average_window = 50
+
+
+    def get_static_layer_key(self):
+        return tuple(self.get_summary_lines())
 
-    def render(self):
-        self.render_menu_floor_box()
+    def render_static_layer(self):
         self.render_title_text('Stats')
-        self.render_stats_menu_stats()
+        self.render_stats_menu_heading()
+        self.render_stats_menu_summary()
 
-    def render_stats_menu_stats(self):
-        assert self._statistics.streak_counts
-        streaks = list(
-            reversed(
-                sorted(
-                    [(x, y) for x, y in self._statistics.streak_counts.items()]
-                )
-            )
-        )
+    def render_animated_layer(self):
+        """ the table's rows are drawn every frame, from the stats list's cached rows, so scrolling doesn't
+        rebuild the static layer
+        """
+        self.render_stats_menu_rows()
+        super().render_animated_layer()
 
-        streaks_to_display = streaks[:self._statistics.display_n_top_streaks]
+    def render_stats_menu_heading(self):
+        """ renders the heading of the streak table, and lines the columns up under it """
+        assert self._statistics.streak_counts
 
         y_pos = 90
 
         text = f'Streak        Count'
-        renderable_text = self.score_font.render(text, True, EColor.COOL_GREY)
+        renderable_text = self.render_text(self.score_font, text, True, EColor.COOL_GREY)
         text_width, _ = renderable_text.get_size()
         x_pos = (self.surface_width / 2) - (text_width / 2)
-        self.render_surface.blit(renderable_text, (x_pos, y_pos))
+        self.blit(renderable_text, (x_pos, y_pos))
 
-        y_pos += 30
-        for streak, count in streaks_to_display:
-            y_pos += 30
+        # each value is centered under its word in the heading
+        streak_heading_width, _ = self.score_font.size('Streak')
+        count_heading_width, _ = self.score_font.size('Count')
+        self._streak_column_center_x = x_pos + streak_heading_width / 2
+        self._count_column_center_x = x_pos + text_width - count_heading_width / 2
+
+    def render_stats_menu_rows(self):
+        """ blits the visible rows of the streak table, below the heading """
+        # the number of rows can be changed with StatisticsData.set_display_n_top_streaks
+        self.stats_list.visible_row_count = self._statistics.display_n_top_streaks
+
+        key = (self._statistics.streak_counts_version, self.stats_list.first_visible_row,
+               self.stats_list.visible_row_count, self._count_column_center_x)
+        if key != self._visible_rows_key:
+            stats_list = self.stats_list
+            visible_rows = stats_list.get_visible_rows(self._statistics.get_streak_row_count(),
+                                                       self._statistics.get_streak_rows)
+            blit_sequence = stats_list.get_blit_sequence(visible_rows, self.render_stats_row, (0, 150))
+            self._visible_rows_blit_sequence = list(zip(visible_rows, blit_sequence))
+            self._visible_rows_key = key
 
-            streak_text = f'{streak}'
-            streak_renderable_text = self.score_font.render(streak_text, True, EColor.COOL_GREY)
-            streak_text_width, _ = renderable_text.get_size()
-            x_pos = (self.surface_width / 2) - (streak_text_width / 2) + 30
-            self.render_surface.blit(streak_renderable_text, (x_pos, y_pos))
-
-            count_text = f'{count}'
-            count_renderable_text = self.score_font.render(count_text, True, EColor.COOL_GREY)
-            count_text_width, _ = renderable_text.get_size()
-            x_pos = (self.surface_width / 1) - (count_text_width / 2)
-            self.render_surface.blit(count_renderable_text, (x_pos, y_pos))
+        for row, (row_surface, position) in self._visible_rows_blit_sequence:
+            # row surfaces can be dropped from the stats list's cache, so they're identified by the row
+            self.blit(row_surface, position, key=('stats row', row))
+
+    def render_stats_row(self, row: tuple[int, int]) -> Surface:
+        """ renders one (streak, count) row of the table, the width of the screen, for the stats list to cache """
+        streak, count = row
+        row_surface = Surface((self.surface_width, self.stats_list.row_height), 0, self.render_surface)
+        row_surface.fill(EColor.BLACK)
+
+        streak_renderable_text = self.render_text(self.score_font, f'{streak}', True, EColor.COOL_GREY)
+        streak_text_width, _ = streak_renderable_text.get_size()
+        row_surface.blit(streak_renderable_text, (self._streak_column_center_x - (streak_text_width / 2), 0))
+
+        count_renderable_text = self.render_text(self.score_font, f'{count}', True, EColor.COOL_GREY)
+        count_text_width, _ = count_renderable_text.get_size()
+        row_surface.blit(count_renderable_text, (self._count_column_center_x - (count_text_width / 2), 0))
+
+        # the menu is drawn on black, so black can be left out of the blit
+        row_surface.set_colorkey(EColor.BLACK, RLEACCEL)
+        return row_surface
+
+    def build_summary_lines(self, analytics) -> list[str]:
+        p50, p90, p99 = analytics.get_percentiles((50, 90, 99))
+        lines = [f'p50 {p50:.0f}  p90 {p90:.0f}  p99 {p99:.0f}']
+
+        rolling_average = analytics.get_rolling_average(self.summary_rolling_average_window)
+        if len(rolling_average):
+            lines.append(f'last {self.summary_rolling_average_window} avg {rolling_average[-1]:.1f}')
+
+        best_day = analytics.get_best_day()
+        if best_day is not None:
+            lines.append(f'best day {best_day[1]} streaks')
+        return lines
+
+    def get_summary_lines(self) -> list[str]:
+        """ returns the summary lines, which are only built again when there are new streaks """
+        analytics = self._statistics.get_streak_analytics()
+        if analytics is None:
+            return []
+
+        if self._summary_record_count != len(analytics):
+            self._summary_lines = self.build_summary_lines(analytics)
+            self._summary_record_count = len(analytics)
+        return self._summary_lines
+
+    def render_stats_menu_summary(self):
+        """ renders percentiles, and a few other numbers, below the table, if numpy is installed """
+        y_pos = 500
+        for line in self.get_summary_lines():
+            renderable_text = self.render_text(self.score_font, line, True, EColor.COOL_GREY)
+            x_pos = (self.surface_width / 2) - (renderable_text.get_width() / 2)
+            self.blit(renderable_text, (x_pos, y_pos))
+            y_pos += 30
@@ -0,0 +1,253 @@
+import unittest
+from src.test import AbstractTestBase as TestCase
+
+from types import SimpleNamespace
+import time
+
+import pygame
+
+from src.engine.cache import EngineCache, ECacheStatus
+from src.engine.dirty_rects import DirtyRectTracker
+from src.engine.render_queue import RenderQueue
+from src.engine.scroll_list import ScrollList
+from src.engine.text import TextRenderCache
+from src.engine.ui import EColor
+from src.gembo.game_data import MenuData, StatisticsData, UIData
+from src.gembo.renderer.RenderAboutMenu import RenderAboutMenu
+from src.gembo.renderer.RenderMainMenu import RenderMainMenu
+from src.gembo.renderer.RenderStatisticsMenu import RenderStatsMenu
+from src.gembo.renderer.render_mode import (BreatheBoxCache, Padding, draw_breathe_box_lines,
+                                            get_breathe_box_bounds)
+from src.gembo.update_modes import EUpdateMode
+
+
+class RenderMenuTestCases(TestCase):
+
+    # test utilities ---------------------------------------------------------------------------------------------------
+
+    def setUp(self):
+        if not pygame.font.get_init():
+            pygame.font.init()
+        self.font = pygame.font.Font(None, 20)
+        self.surface = pygame.Surface((120, 200))
+
+        self.dirty_rects = DirtyRectTracker()
+        cache = EngineCache(time.time)
+        cache.register('dirty_rects', self.dirty_rects, ECacheStatus.NO_EVICT)
+        self.engine = SimpleNamespace(cache=cache, ui=UIData())
+
+        self.menu = MenuData(time.time, lambda *args: None)
+
+    def make_main_menu(self) -> RenderMainMenu:
+        return RenderMainMenu(self.engine, self.surface, EUpdateMode.UPDATE_MENU,
+                              {'title_font': self.font, 'menu_data': self.menu})
+
+    def make_stats_menu(self, row_count: int) -> RenderStatsMenu:
+        self.statistics = StatisticsData()
+        self.statistics.streak_counts = {length: length % 7 + 1 for length in range(1, row_count + 1)}
+        self.statistics.rebuild_streak_lengths()
+        self.stats_list = ScrollList(row_height=30, visible_row_count=10)
+        self.surface = pygame.Surface((480, 640))
+        return RenderStatsMenu(self.engine, self.surface, EUpdateMode.UPDATE_STATISTICS,
+                               {'title_font': self.font, 'score_font': self.font, 'statistics': self.statistics,
+                                'stats_list': self.stats_list})
+
+    def test_framework_can_pass_a_test(self):
+        self.assertTrue(True)
+
+
+    # class RenderMenuBase ---------------------------------------------------------------------------------------------
+
+    def test__classRenderMenuBase__fnRender__buildsStaticLayerOnce__whileInputsDontChange(self):
+        render_mode = self.make_main_menu()
+        for _ in range(3):
+            render_mode.render()
+        self.assertEqual(render_mode.static_layer_build_count, 1)
+
+    def test__classRenderMenuBase__fnRender__rebuildsStaticLayer__whenSelectionChanges(self):
+        render_mode = self.make_main_menu()
+        render_mode.render()
+        self.menu.selected_option = MenuData.EMenuOptions.ABOUT_MENU
+        render_mode.render()
+        render_mode.render()
+        self.assertEqual(render_mode.static_layer_build_count, 2)
+
+    def test__classRenderMenuBase__fnRender__rebuildsStaticLayer__whenHighlightColorChanges(self):
+        render_mode = self.make_main_menu()
+        render_mode.render()
+        self.engine.ui.highlight_color = EColor.PINK
+        render_mode.render()
+        self.assertEqual(render_mode.static_layer_build_count, 2)
+
+    def test__classRenderMenuBase__fnInvalidateStaticLayer__rebuildsOnNextRender(self):
+        render_mode = self.make_main_menu()
+        render_mode.render()
+        render_mode.invalidate_static_layer()
+        render_mode.render()
+        self.assertEqual(render_mode.static_layer_build_count, 2)
+
+    def test__classRenderMenuBase__fnRender__drawsSameAsWithoutCache(self):
+        render_mode = self.make_main_menu()
+        render_mode.render_animated_layer = lambda: None
+        render_mode.render()
+
+        expected = pygame.Surface(self.surface.get_size())
+        render_mode.render_surface = expected
+        render_mode.render_static_layer()
+        render_mode.render_surface = self.surface
+
+        self.assertEqual(pygame.image.tobytes(self.surface, 'RGB'), pygame.image.tobytes(expected, 'RGB'))
+
+    def test__classRenderMenuBase__fnRender__staticLayerIsNotDirty__whileInputsDontChange(self):
+        render_mode = RenderAboutMenu(self.engine, self.surface, EUpdateMode.UPDATE_ABOUT,
+                                      {'about_menu_font': self.font, 'homily_font': self.font})
+        render_mode.render_animated_layer = lambda: None
+        render_mode.render()
+        self.dirty_rects.end_frame(self.surface.get_rect())
+        render_mode.render()
+        self.assertEqual(self.dirty_rects.end_frame(self.surface.get_rect()), [])
+
+    def test__classRenderMenuBase__fnRender__drawsSame__withRenderQueue(self):
+        self.make_main_menu().render()
+        expected = pygame.image.tobytes(self.surface, 'RGB')
+
+        self.surface.fill(EColor.BLACK)
+        render_queue = RenderQueue()
+        self.engine.cache.register('render_queue', render_queue, ECacheStatus.NO_EVICT)
+        self.make_main_menu().render()
+        render_queue.flush(self.surface, self.dirty_rects)
+        self.assertEqual(pygame.image.tobytes(self.surface, 'RGB'), expected)
+
+    def test__classRenderMenuBase__fnRenderAnimatedLayer__drawsBreatheBox(self):
+        render_mode = self.make_main_menu()
+        render_mode.render_animated_layer()
+        render_mode.flush_render_queue()
+        self.assertGreater(pygame.mask.from_threshold(self.surface, pygame.Color(EColor.COOL_GREY), (1, 1, 1, 255)).count(), 0)
+        self.assertGreater(len(self.dirty_rects.end_frame(self.surface.get_rect())), 0)
+
+    def test__classRenderMenuBase__fnRenderAnimatedLayer__drawsBreatheBoxFromCache(self):
+        render_mode = self.make_main_menu()
+        render_mode.render_animated_layer()
+        render_mode.render_animated_layer()
+        self.assertEqual(render_mode.breathe_boxes.hits + render_mode.breathe_boxes.misses, 2)
+
+    def test__classRenderMenuBase__fnBlit__keysTextOnWhatItSays(self):
+        render_mode = self.make_main_menu()
+        text = render_mode.render_text(self.font, 'text', True, EColor.WHITE)
+        self.assertEqual(render_mode.get_blit_key(text),
+                         ('text', TextRenderCache.make_key(self.font, 'text', True, EColor.WHITE)))
+        self.assertEqual(render_mode.get_blit_key(self.surface), id(self.surface))
+
+    def test__classRenderMenuBase__fnBlit__marksTextDirty__whenNewTextReusesASurfaceId(self):
+        # every string comes back as the same surface, like an evicted surface whose id was given to new text
+        shared_surface = pygame.Surface((40, 20))
+        self.engine.cache.register('text_cache', TextRenderCache(prepare_surface=lambda surface: shared_surface),
+                                   ECacheStatus.NO_EVICT)
+        render_mode = self.make_main_menu()
+
+        render_mode.blit(render_mode.render_text(self.font, 'old', True, EColor.WHITE), (10, 10))
+        self.dirty_rects.end_frame(self.surface.get_rect())
+        render_mode.blit(render_mode.render_text(self.font, 'new', True, EColor.WHITE), (10, 10))
+        self.assertEqual(self.dirty_rects.end_frame(self.surface.get_rect()), [pygame.Rect(10, 10, 40, 20)])
+
+    def test__classRenderMenuBase__fnBuildStaticLayer__restoresRenderSurface(self):
+        render_mode = self.make_main_menu()
+        render_mode.build_static_layer()
+        self.assertIs(render_mode.render_surface, self.surface)
+        self.assertIs(render_mode.dirty_rects, self.dirty_rects)
+
+
+    # class RenderStatsMenu --------------------------------------------------------------------------------------------
+
+    def test__classRenderStatsMenu__fnRenderStaticLayer__rendersOnlyVisibleRows__ofLongTable(self):
+        render_mode = self.make_stats_menu(5000)
+        render_mode.render()
+        self.assertEqual(len(self.stats_list), 10)
+        self.assertEqual(self.stats_list.misses, 10)
+
+    def test__classRenderStatsMenu__fnRender__reusesRows__andKeepsStaticLayer__whenScrolled(self):
+        render_mode = self.make_stats_menu(5000)
+        render_mode.render()
+        self.stats_list.scroll(2, 5000)
+        render_mode.render()
+        render_mode.render()
+        self.assertEqual(render_mode.static_layer_build_count, 1)
+        self.assertEqual(self.stats_list.misses, 12)
+        self.assertEqual(self.stats_list.hits, 8)
+
+    def test__classRenderStatsMenu__fnRender__showsDisplayNTopStreaksRows(self):
+        render_mode = self.make_stats_menu(5000)
+        render_mode.render()
+        self.statistics.set_display_n_top_streaks(4)
+        render_mode.render()
+        self.assertEqual(len(render_mode._visible_rows_blit_sequence), 4)
+        # scrolling stops when the last row is at the bottom of the shorter window
+        self.stats_list.scroll_to(5000, 5000)
+        self.assertEqual(self.stats_list.first_visible_row, 4996)
+
+    def test__classRenderStatsMenu__fnRenderStatsRow__centersValuesUnderHeadings(self):
+        render_mode = self.make_stats_menu(3)
+        render_mode.render_stats_menu_heading()
+        heading_width, _ = self.font.size('Streak        Count')
+        heading_left = 240 - heading_width / 2
+        self.assertEqual(render_mode._streak_column_center_x, heading_left + self.font.size('Streak')[0] / 2)
+        self.assertEqual(render_mode._count_column_center_x,
+                         heading_left + heading_width - self.font.size('Count')[0] / 2)
+
+        # the count is drawn around its own center, not offset by the heading's width
+        row_surface = render_mode.render_stats_row((3, 1234))
+        count_columns = [x for x in range(row_surface.get_width()) for y in range(row_surface.get_height())
+                         if x > 240 and tuple(row_surface.get_at((x, y)))[:3] != (0, 0, 0)]
+        count_center = (min(count_columns) + max(count_columns)) / 2
+        self.assertLess(abs(count_center - render_mode._count_column_center_x), 3)
+
+
+    # class BreatheBoxCache --------------------------------------------------------------------------------------------
+
+    def test__classBreatheBoxCache__fnRenderPhase__drawsSameAsDrawingTheLines(self):
+        cache = BreatheBoxCache(phase_count=16)
+        padding = Padding(10, 10, 110, 190)
+        for phase_index in [0, 7, 15]:
+            self.surface.fill(EColor.BLACK)
+            cache.render_phase(self.surface, padding, EColor.COOL_GREY, 3, 5.0, phase_index)
+
+            expected = pygame.Surface(self.surface.get_size())
+            bounds = get_breathe_box_bounds(expected.get_size(), padding, cache.get_phase_scaled_sin(phase_index), 5.0)
+            draw_breathe_box_lines(expected, EColor.COOL_GREY, 3, bounds)
+            self.assertEqual(pygame.image.tobytes(self.surface, 'RGB'), pygame.image.tobytes(expected, 'RGB'))
+
+    def test__classBreatheBoxCache__fnRenderPhase__buildsEachPhaseOnce(self):
+        cache = BreatheBoxCache(phase_count=16)
+        padding = Padding(10, 10, 110, 190)
+        for phase_index in [3, 3, 4, 3]:
+            cache.render_phase(self.surface, padding, EColor.COOL_GREY, 1, 20.0, phase_index)
+        self.assertEqual(cache.misses, 2)
+        self.assertEqual(cache.hits, 2)
+
+    def test__classBreatheBoxCache__fnRenderPhase__reportsStripsAsDirtyRects(self):
+        cache = BreatheBoxCache(phase_count=16)
+        rects = cache.render_phase(self.surface, Padding(10, 10, 110, 190), EColor.COOL_GREY, 1, 20.0, 0,
+                                   self.dirty_rects)
+        self.assertEqual(len(rects), 4)
+        # thin strips, not the whole box
+        self.assertLess(sum(rect.width * rect.height for rect in rects), 120 * 200 / 4)
+        self.assertEqual(len(self.dirty_rects.end_frame(self.surface.get_rect())), 1)
+
+    def test__classBreatheBoxCache__fnRenderPhase__evictsOldestBox__pastMaxBytes(self):
+        cache = BreatheBoxCache(phase_count=16, max_bytes=1)
+        padding = Padding(10, 10, 110, 190)
+        cache.render_phase(self.surface, padding, EColor.COOL_GREY, 1, 20.0, 0)
+        cache.render_phase(self.surface, padding, EColor.COOL_GREY, 2, 20.0, 0)
+        self.assertEqual(cache.evictions, 1)
+        self.assertEqual(len(cache._boxes), 1)
+        self.assertEqual(cache.total_bytes, sum(cache._box_bytes.values()))
+
+    def test__classBreatheBoxCache__fnGetPhaseIndex__coversEveryPhase(self):
+        cache = BreatheBoxCache(phase_count=16)
+        self.assertEqual(cache.get_phase_index(0.0), 0)
+        self.assertEqual(cache.get_phase_index(1.0), 15)
+        self.assertEqual(cache.get_phase_index(cache.get_phase_scaled_sin(9)), 9)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,18 +1,25 @@
 # python imports
 
 from abc import ABC, abstractmethod
-from math import sin
+from collections import OrderedDict
+from math import sin, sqrt
 import time
 
 import pygame.font
 from pygame.font import Font as pygame_font
+from pygame.locals import RLEACCEL
 
 # pygame imports
+from pygame.color import Color
+from pygame.rect import Rect
 from pygame.surface import Surface
 from pygame.draw import (line as pygame_draw_line,
                          circle as pygame_draw_circle)
 
 # engine imports
+from src.engine.dirty_rects import DirtyRectTracker
+from src.engine.render_queue import ERenderLayer, RenderQueue
+from src.engine.text import GlyphAtlas, TextRenderCache
 from src.engine.ui import Padding, EColor
 
 # game imports
@@ -33,8 +40,11 @@ def get_scaled_sin(x: float):
         return (sin(x) * 0.5) + 0.5
 
 
-def render_breathe_box(surface: Surface, padding: Padding, color: EColor, width: int = 1, is_animated=True, breathe_ratio: float = 20):
+def render_breathe_box(surface: Surface, padding: Padding, color: EColor, width: int = 1, is_animated=True, breathe_ratio: float = 20.0,
+                       dirty_rects: DirtyRectTracker = None):
     """ The "breathe box" is a box that rhythmically contracts, according to the value 'breathe_ratio'.  This value could range (20, 3)
+
+    If dirty_rects is given, the band each line and corner covers is reported to it
     """
     if surface is None or not isinstance(surface, Surface):
         return False
@@ -50,44 +60,177 @@ def render_breathe_box(surface: Surface, padding: Padding, color: EColor, width:
         return False
 
 
-    # don't delete this, it isn't using the surface from the outer scope
-    surface_width, surface_height = surface.get_size()
-
-    # line positions
-    left = padding.left
-    right = padding.right
-    top = padding.top
-    bottom = padding.bottom
-
     if is_animated:
         # this animation causes the lines to contract (is this cubic?)
-        time_now = time.time()
-        scaled_sin = get_scaled_sin(time_now)
+        bounds = get_breathe_box_bounds(surface.get_size(), padding, get_scaled_sin(time.time()), breathe_ratio)
+        drawn_rects = draw_breathe_box_lines(surface, color, width, bounds)
 
-        # offset both scales by an amount determined by that axis of the screen, and its length
-        # this keeps the aspect ratio the same
-        offset_w = surface_width / breathe_ratio * scaled_sin
-        offset_h = surface_height / breathe_ratio * scaled_sin
+        if dirty_rects is not None:
+            for rect in drawn_rects:
+                dirty_rects.add(rect, ('breathe box', color, width))
 
-        left += scaled_sin * offset_w
-        right += scaled_sin * -offset_w
-        top += scaled_sin * offset_h
-        bottom += scaled_sin * -offset_h
+    return True
 
-        pygame_draw_line(surface, color, (left, top), (right, top), width)
-        pygame_draw_line(surface, color, (left, top), (left, bottom), width)
-        pygame_draw_line(surface, color, (right, top), (right, bottom), width)
-        pygame_draw_line(surface, color, (left, bottom), (right, bottom), width)
 
-        half_width = width/2
-        width_minus_one = width - 1
+def get_breathe_box_bounds(surface_size: tuple[int, int], padding: Padding, scaled_sin: float,
+                           breathe_ratio: float) -> tuple[float, float, float, float]:
+    """ returns the (left, top, right, bottom) of the breathe box, when the animation is at scaled_sin(0.0 - 1.0) """
+    surface_width, surface_height = surface_size
 
-        pygame_draw_circle(surface, color, (left, top), radius=half_width, width=width_minus_one)
-        pygame_draw_circle(surface, color, (right, top), radius=half_width, width=width_minus_one)
-        pygame_draw_circle(surface, color, (left, bottom), radius=half_width, width=width_minus_one)
-        pygame_draw_circle(surface, color, (right, bottom), radius=half_width, width=width_minus_one)
+    # offset both scales by an amount determined by that axis of the screen, and its length
+    # this keeps the aspect ratio the same
+    offset_w = surface_width / breathe_ratio * scaled_sin
+    offset_h = surface_height / breathe_ratio * scaled_sin
 
-    return True
+    left = padding.left + scaled_sin * offset_w
+    right = padding.right + scaled_sin * -offset_w
+    top = padding.top + scaled_sin * offset_h
+    bottom = padding.bottom + scaled_sin * -offset_h
+    return left, top, right, bottom
+
+
+def draw_breathe_box_lines(surface: Surface, color, width: int, bounds: tuple[float, float, float, float]) -> list[Rect]:
+    """ draws the box's four lines, and then its four rounded corners, and returns the rect each one covered """
+    left, top, right, bottom = bounds
+    drawn_rects = [
+        pygame_draw_line(surface, color, (left, top), (right, top), width),
+        pygame_draw_line(surface, color, (left, top), (left, bottom), width),
+        pygame_draw_line(surface, color, (right, top), (right, bottom), width),
+        pygame_draw_line(surface, color, (left, bottom), (right, bottom), width),
+    ]
+
+    half_width = width/2
+    width_minus_one = width - 1
+
+    drawn_rects += [
+        pygame_draw_circle(surface, color, (left, top), radius=half_width, width=width_minus_one),
+        pygame_draw_circle(surface, color, (right, top), radius=half_width, width=width_minus_one),
+        pygame_draw_circle(surface, color, (left, bottom), radius=half_width, width=width_minus_one),
+        pygame_draw_circle(surface, color, (right, bottom), radius=half_width, width=width_minus_one),
+    ]
+    return drawn_rects
+
+
+class BreatheBoxCache:
+    """ The BreatheBoxCache pre-renders the breathe box, so drawing it is a few blits, instead of eight draw calls.
+
+    The box's position only depends on scaled_sin squared, which is split into phase_count phases.  Each phase is
+    kept as four strips (top and bottom, with their corners, then left and right), so the dirty rects stay as thin
+    as the lines are.  Phases are rendered the first time they're shown.
+
+    Gameplay changes the width with the streak length, and cycles colors, so every (size, padding, color, width,
+    breathe_ratio) is a separate box.  The least recently used boxes are dropped once the strips take up more
+    than max_bytes
+    """
+    def __init__(self, phase_count: int = 64, max_bytes: int = 32 * 1024 * 1024):
+        self.phase_count = phase_count
+        self.max_bytes = max_bytes
+
+        # box key -> {phase index: [(strip surface, position)]}, least recently used first
+        self._boxes = OrderedDict()
+        self._box_bytes = {}
+        self.total_bytes: int = 0
+
+        # the phases are drawn here, and then their strips are copied out
+        self._scratch: Surface = None
+
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+
+    def clear(self):
+        self._boxes.clear()
+        self._box_bytes.clear()
+        self.total_bytes = 0
+        self._scratch = None
+
+    def get_phase_index(self, scaled_sin: float) -> int:
+        """ returns the phase nearest to scaled_sin """
+        return round(scaled_sin * scaled_sin * (self.phase_count - 1))
+
+    def get_phase_scaled_sin(self, phase_index: int) -> float:
+        return sqrt(phase_index / (self.phase_count - 1))
+
+    def render(self, surface: Surface, padding: Padding, color, width: int = 1, breathe_ratio: float = 20.0,
+               dirty_rects: DirtyRectTracker = None, render_queue: RenderQueue = None) -> list[Rect]:
+        """ like render_breathe_box, for an animated box, but without the argument checks """
+        phase_index = self.get_phase_index(get_scaled_sin(time.time()))
+        return self.render_phase(surface, padding, color, width, breathe_ratio, phase_index, dirty_rects, render_queue)
+
+    def render_phase(self, surface: Surface, padding: Padding, color, width: int, breathe_ratio: float,
+                     phase_index: int, dirty_rects: DirtyRectTracker = None,
+                     render_queue: RenderQueue = None) -> list[Rect]:
+        """ blits one phase of the box, or submits it on the FLOOR layer of the render queue, if there is one, and
+        returns the rects it covers
+        """
+        key = (surface.get_size(), (padding.left, padding.top, padding.right, padding.bottom), color, width,
+               breathe_ratio)
+        strips = self.get_phase(surface, key, phase_index)
+        if not strips:
+            return []
+
+        if render_queue is not None:
+            # the queue tells the dirty rect tracker, when it's flushed
+            return [render_queue.submit(strip, position, ERenderLayer.FLOOR, key=strip) for strip, position in strips]
+
+        rects = surface.blits(strips)
+        if dirty_rects is not None:
+            for (strip, _), rect in zip(strips, rects):
+                dirty_rects.add(rect, strip)
+        return rects
+
+    def get_phase(self, surface: Surface, key: tuple, phase_index: int) -> list[tuple[Surface, tuple[int, int]]]:
+        phases = self._boxes.get(key)
+        if phases is None:
+            phases = self._boxes[key] = {}
+            self._box_bytes[key] = 0
+        else:
+            self._boxes.move_to_end(key)
+
+        strips = phases.get(phase_index)
+        if strips is not None:
+            self.hits += 1
+            return strips
+
+        self.misses += 1
+        strips = phases[phase_index] = self.build_phase(surface, key, phase_index)
+        strip_bytes = sum(strip.get_width() * strip.get_height() * strip.get_bytesize() for strip, _ in strips)
+        self._box_bytes[key] += strip_bytes
+        self.total_bytes += strip_bytes
+
+        # the box being drawn is newest, so it's never the one dropped
+        while self.total_bytes > self.max_bytes and len(self._boxes) > 1:
+            evicted_key, _ = self._boxes.popitem(last=False)
+            self.total_bytes -= self._box_bytes.pop(evicted_key)
+            self.evictions += 1
+        return strips
+
+    def build_phase(self, surface: Surface, key: tuple, phase_index: int) -> list[tuple[Surface, tuple[int, int]]]:
+        """ draws one phase of the box, and copies out its strips, in the target surface's format """
+        size, padding, color, width, breathe_ratio = key
+        if self._scratch is None or self._scratch.get_size() != size \
+                or self._scratch.get_bitsize() != surface.get_bitsize():
+            self._scratch = Surface(size, 0, surface)
+
+        # the strips are transparent wherever the box isn't, so the colorkey can't be the box's color
+        colorkey = EColor.PINK if Color(color) == Color(EColor.BLACK) else EColor.BLACK
+        scratch = self._scratch
+        scratch.fill(colorkey)
+
+        bounds = get_breathe_box_bounds(size, Padding(*padding), self.get_phase_scaled_sin(phase_index), breathe_ratio)
+        drawn_rects = [rect.clip(scratch.get_rect()) for rect in draw_breathe_box_lines(scratch, color, width, bounds)]
+        top, left, right, bottom, top_left, top_right, bottom_left, bottom_right = drawn_rects
+
+        strips = []
+        for rects in [[top, top_left, top_right], [bottom, bottom_left, bottom_right], [left], [right]]:
+            rects = [rect for rect in rects if rect.width > 0 and rect.height > 0]
+            if not rects:
+                continue
+            strip_rect = rects[0].unionall(rects[1:])
+            strip = scratch.subsurface(strip_rect).copy()
+            strip.set_colorkey(colorkey, RLEACCEL)
+            strips.append((strip, strip_rect.topleft))
+        return strips
 
 
 class AbstractRenderMode(ABC):
@@ -99,12 +242,85 @@ class AbstractRenderMode(ABC):
 
         self.surface_width, self.surface_height = self.render_surface.get_size()
 
+        # all text is rendered through the shared text cache, or a private one if the engine doesn't have one
+        text_cache = self.engine.cache.lookup('text_cache')
+        self.text_cache = text_cache if isinstance(text_cache, TextRenderCache) else TextRenderCache()
+
+        # everything drawn is reported here, so only what changed is presented (see App.on_render)
+        dirty_rects = self.engine.cache.lookup('dirty_rects')
+        self.dirty_rects = dirty_rects if isinstance(dirty_rects, DirtyRectTracker) else DirtyRectTracker()
+
+        # the breathe box is drawn from pre-rendered phases, shared by every render mode
+        breathe_boxes = self.engine.cache.lookup('breathe_boxes')
+        self.breathe_boxes = breathe_boxes if isinstance(breathe_boxes, BreatheBoxCache) else BreatheBoxCache()
+
+        # blits are batched in the shared render queue, which App flushes once per frame.  Without one, everything
+        # is drawn straight away
+        render_queue = self.engine.cache.lookup('render_queue')
+        self.render_queue = render_queue if isinstance(render_queue, RenderQueue) else None
+
 
     def value_or_default(self, key, default = None):
         if key and key in self.render_data:
             return self.render_data[key]
         return default
 
+    def render_text(self, font: pygame_font, text: str, antialias: bool, color) -> Surface:
+        """ use this instead of font.render, so text which hasn't changed is not rasterized again """
+        return self.text_cache.render(font, text, antialias, color)
+
+    def get_glyph_atlas(self, font: pygame_font, antialias: bool, color) -> GlyphAtlas:
+        """ use this for text that changes often, like counters, instead of render_text """
+        return self.text_cache.get_glyph_atlas(font, antialias, color)
+
+    def get_blit_key(self, source: Surface):
+        """ Returns the key which identifies source for the dirty rect tracker.  Text from render_text is keyed on
+        what it says, since the text cache evicts surfaces, and a new surface can get an old one's id.  Anything
+        else is keyed on its id, so it has to be long-lived
+        """
+        text_key = self.text_cache.get_surface_key(source)
+        return id(source) if text_key is None else ('text', text_key)
+
+    def blit(self, source: Surface, position, key=None, area: Rect = None, layer: int = ERenderLayer.TEXT) -> Rect:
+        """ use this instead of render_surface.blit, so the blit is batched, and the dirty rect tracker knows what
+        was drawn where.  The key identifies what was drawn, and defaults to get_blit_key(source)
+        """
+        if key is None:
+            key = self.get_blit_key(source)
+
+        if self.render_queue is not None:
+            return self.render_queue.submit(source, position, layer, area, key)
+
+        rect = self.render_surface.blit(source, position, area)
+        self.dirty_rects.add(rect, key)
+        return rect
+
+    def render_glyphs(self, glyphs: GlyphAtlas, text: str, position, layer: int = ERenderLayer.TEXT) -> Rect:
+        """ use this instead of glyphs.render_to, for the same reason as blit """
+        blit_sequence, width = glyphs.get_blit_sequence(text, position)
+        return self.blits(blit_sequence, Rect(position, (width, glyphs.height)), (id(glyphs), text), layer)
+
+    def blits(self, blit_sequence: list, rect: Rect, key, layer: int = ERenderLayer.TEXT) -> Rect:
+        """ like blit, for several blits which cover rect together, and are identified by one key """
+        if self.render_queue is not None:
+            self.render_queue.submit_blits(blit_sequence, rect, layer, key)
+            return rect
+
+        self.render_surface.blits(blit_sequence, doreturn=False)
+        self.dirty_rects.add(rect, key)
+        return rect
+
+    def flush_render_queue(self):
+        """ draws everything submitted so far.  Call this before drawing straight onto the render surface """
+        if self.render_queue is not None:
+            self.render_queue.flush(self.render_surface, self.dirty_rects)
+
+    def draw_line(self, color, start, end, width: int = 1) -> Rect:
+        self.flush_render_queue()
+        rect = pygame_draw_line(self.render_surface, color, start, end, width)
+        self.dirty_rects.add(rect, ('line', color, tuple(start), tuple(end), width))
+        return rect
+
     @abstractmethod
     def render(self):
         """ all render modes need to override this fn with their own version """
@@ -113,10 +329,69 @@ class AbstractRenderMode(ABC):
 
 # MenuBase
 class RenderMenuBase(AbstractRenderMode):
+    """ Menus are drawn in two layers.  The static layer is everything which only changes when the menu's inputs do
+    (titles, labels, the selection), it's rendered once onto a cached surface, and blitted each frame.  The animated
+    layer (the breathe box, from the BreatheBoxCache) is drawn every frame, with it.
+
+    Subclasses draw their static layer in render_static_layer, and return everything it depends on from
+    get_static_layer_key.  The layer is rebuilt only when that key changes
+    """
     def __init__(self, engine, surface: Surface, mode: EUpdateMode, render_data: dict):
         super().__init__(engine, surface, mode, render_data)
         self.title_font = self.value_or_default('title_font')
 
+        self._static_layer: Surface = None
+        self._static_layer_key = None
+        self._static_layer_bounds: Rect = None
+
+        # the number of times the static layer was rendered, for tests and profiling
+        self.static_layer_build_count: int = 0
+
+    def get_static_layer_key(self):
+        """ override this, and return a hashable of everything render_static_layer depends on """
+        return None
+
+    def render_static_layer(self):
+        """ override this, and draw the parts of the menu which don't animate, as if drawing onto the screen """
+        pass
+
+    def render_animated_layer(self):
+        """ draws what changes every frame, on top of the static layer """
+        self.render_menu_floor_box()
+
+    def invalidate_static_layer(self):
+        """ forces the static layer to be rendered again, ie: after the fonts were reloaded """
+        self._static_layer = None
+
+    def build_static_layer(self) -> Surface:
+        """ renders the static layer onto a new surface, in the screen's format, with black as transparent """
+        layer = Surface(self.render_surface.get_size(), 0, self.render_surface)
+        layer.fill(EColor.BLACK)
+
+        # the subclass draws with the usual fns, so they're pointed at the layer for a moment, and draw straight away
+        render_surface, dirty_rects, render_queue = self.render_surface, self.dirty_rects, self.render_queue
+        self.render_surface, self.dirty_rects, self.render_queue = layer, DirtyRectTracker(), None
+        try:
+            self.render_static_layer()
+        finally:
+            self.render_surface, self.dirty_rects, self.render_queue = render_surface, dirty_rects, render_queue
+
+        # the screen is black underneath, so dropping the black pixels doesn't change what's drawn
+        layer.set_colorkey(EColor.BLACK, RLEACCEL)
+        self.static_layer_build_count += 1
+        return layer
+
+    def render_cached_static_layer(self):
+        key = (self.engine.ui.get_highlight_color(), self.get_static_layer_key())
+        if self._static_layer is None or key != self._static_layer_key:
+            self._static_layer = self.build_static_layer()
+            self._static_layer_key = key
+            self._static_layer_bounds = self._static_layer.get_bounding_rect()
+
+        # only the part with something on it is blitted
+        self.blit(self._static_layer, self._static_layer_bounds.topleft, key=('static layer', id(self), key),
+                  area=self._static_layer_bounds)
+
     def render_menu_floor_box(self):
         line_padding = self.value_or_default('line_padding', 10)
         color = self.value_or_default('color', EColor.COOL_GREY)
@@ -126,12 +401,21 @@ class RenderMenuBase(AbstractRenderMode):
         top = 0 + line_padding
         bottom = self.surface_height - line_padding
 
-        render_breathe_box(self.render_surface, Padding(left, top, right, bottom), color, True)
+        # drawn from the same pre-rendered phases as the gameplay box
+        self.breathe_boxes.render(
+            surface=self.render_surface,
+            padding=Padding(left, top, right, bottom),
+            color=color,
+            width=1,
+            breathe_ratio=20.0,
+            dirty_rects=self.dirty_rects,
+            render_queue=self.render_queue
+        )
 
     def render_title_text(self, title_text):
         """ renders the given string as a title, at the top of the screen """
 
-        renderable_text = self.title_font.render(title_text, True, self.engine.ui.get_highlight_color())
+        renderable_text = self.render_text(self.title_font, title_text, True, self.engine.ui.get_highlight_color())
 
         # calculate centered on screen position
         total_width, _ = renderable_text.get_size()
@@ -139,7 +423,7 @@ class RenderMenuBase(AbstractRenderMode):
         pos_x = (self.surface_width/2) - (total_width/2)
 
         # blit
-        self.render_surface.blit(renderable_text, (pos_x, pos_y))
+        self.blit(renderable_text, (pos_x, pos_y))
 
     def render_horizontal_fill_bar(self, font: pygame_font, position: tuple[int, int], filled_count: int, sections_count: int):
         def _build_display_string(filled: int, sections: int):
@@ -150,8 +434,8 @@ class RenderMenuBase(AbstractRenderMode):
             return display
 
         display_string = _build_display_string(int(filled_count), int(sections_count))
-        renderable_text = font.render(display_string, True, self.engine.ui.get_highlight_color())
-        self.render_surface.blit(renderable_text, position)
+        renderable_text = self.render_text(font, display_string, True, self.engine.ui.get_highlight_color())
+        self.blit(renderable_text, position)
 
     def render_on_off_toggle(self, font: pygame_font, position: tuple[int, int], is_on: bool):
         def _build_display_string(_is_on: bool):
@@ -160,9 +444,10 @@ class RenderMenuBase(AbstractRenderMode):
             return display
 
         display_string = _build_display_string(is_on)
-        renderable_text = font.render(display_string, True, self.engine.ui.get_highlight_color())
-        self.render_surface.blit(renderable_text, position)
+        renderable_text = self.render_text(font, display_string, True, self.engine.ui.get_highlight_color())
+        self.blit(renderable_text, position)
 
 
     def render(self):
-        pass
+        self.render_cached_static_layer()
+        self.render_animated_layer()
@@ -0,0 +1,155 @@
+from bisect import bisect_right
+from dataclasses import dataclass, replace
+from enum import IntEnum
+import time
+
+
+SECONDS_PER_DAY = 86400
+
+# 1970-01-01 was a thursday, weeks start on monday
+EPOCH_DAY_OF_WEEK = 3
+
+
+class ERollupPeriod(IntEnum):
+    """ The resolutions the StatisticsRollups keeps
+
+    SESSION - one bucket for each time the game was played
+    DAY - one bucket for each local calendar day with any play
+    WEEK - one bucket for each local week (starting monday) with any play
+    """
+    SESSION = 0
+    DAY = 1
+    WEEK = 2
+
+
+@dataclass
+class RollupBucket:
+    """ the totals for one session, day, or week.  start is the unix time the bucket starts """
+    start: int
+    gems: int = 0
+    points: int = 0
+    streak_count: int = 0
+    longest_streak: int = 0
+
+
+class StatisticsRollups:
+    """ The StatisticsRollups keeps per-session, per-day, and per-week totals, which are updated as things happen,
+    so they never need the raw history.  That means the raw streak history can be trimmed to a retention window
+    (see StatisticsData.streak_history_retention_s), and the totals for older play are still around.
+
+    retired_streak_counts is the streak histogram of every streak which was dropped from the raw history, so the
+    lifetime streak counts can still be rebuilt from the history which is left.
+
+    Only the newest max_buckets[period] buckets are kept, so this stays small forever
+    """
+    def __init__(self, utc_offset_s: int = None):
+        self.utc_offset_s = time.localtime().tm_gmtoff if utc_offset_s is None else utc_offset_s
+
+        # buckets are in order of their start time.  Add them with append_bucket, which keeps _bucket_starts in step
+        self.buckets = {period: [] for period in ERollupPeriod}
+        # the start of each bucket, in the same order, so older buckets are found with bisect
+        self._bucket_starts = {period: [] for period in ERollupPeriod}
+        self.max_buckets = {
+            ERollupPeriod.SESSION: 200,
+            ERollupPeriod.DAY: 400,
+            ERollupPeriod.WEEK: 520,
+        }
+
+        self.retired_streak_counts = {}
+
+    def copy(self) -> 'StatisticsRollups':
+        """ returns a copy, which is safe to hand to the autosave thread """
+        rollups = StatisticsRollups(utc_offset_s=self.utc_offset_s)
+        rollups.buckets = {period: [replace(bucket) for bucket in buckets] for period, buckets in self.buckets.items()}
+        rollups._bucket_starts = {period: list(starts) for period, starts in self._bucket_starts.items()}
+        rollups.max_buckets = dict(self.max_buckets)
+        rollups.retired_streak_counts = dict(self.retired_streak_counts)
+        return rollups
+
+    def get_bucket_start(self, period: ERollupPeriod, timestamp: float) -> int:
+        """ returns the start of the day or week this timestamp is in (sessions start when start_session says) """
+        day_index = int((timestamp + self.utc_offset_s) // SECONDS_PER_DAY)
+        if period == ERollupPeriod.WEEK:
+            day_index -= (day_index + EPOCH_DAY_OF_WEEK) % 7
+        return day_index * SECONDS_PER_DAY - self.utc_offset_s
+
+    def get_buckets(self, period: ERollupPeriod) -> list[RollupBucket]:
+        return self.buckets[period]
+
+    def get_current_session(self) -> RollupBucket:
+        sessions = self.buckets[ERollupPeriod.SESSION]
+        return sessions[-1] if sessions else None
+
+    def start_session(self, timestamp: float):
+        self.append_bucket(ERollupPeriod.SESSION, RollupBucket(start=int(timestamp)))
+
+    def append_bucket(self, period: ERollupPeriod, bucket: RollupBucket):
+        """ adds a bucket which starts after all the others """
+        self.buckets[period].append(bucket)
+        self._bucket_starts[period].append(bucket.start)
+        self._trim_buckets(period)
+
+    def _trim_buckets(self, period: ERollupPeriod):
+        buckets = self.buckets[period]
+        if len(buckets) > self.max_buckets[period]:
+            del buckets[0]
+            del self._bucket_starts[period][0]
+
+    def _get_bucket(self, period: ERollupPeriod, timestamp: float) -> RollupBucket:
+        """ returns the bucket for this time, and adds it, if it doesn't exist yet """
+        buckets = self.buckets[period]
+        start = self.get_bucket_start(period, timestamp)
+
+        # almost always the newest bucket, or the one right after it
+        if buckets and buckets[-1].start == start:
+            return buckets[-1]
+        if not buckets or buckets[-1].start < start:
+            bucket = RollupBucket(start=start)
+            self.append_bucket(period, bucket)
+            return bucket
+
+        # the clock went backwards, or this is older history being added
+        starts = self._bucket_starts[period]
+        index = bisect_right(starts, start)
+        if index > 0 and starts[index - 1] == start:
+            return buckets[index - 1]
+        bucket = RollupBucket(start=start)
+        buckets.insert(index, bucket)
+        starts.insert(index, start)
+        self._trim_buckets(period)
+        return bucket
+
+    def _get_buckets_for(self, timestamp: float) -> list[RollupBucket]:
+        buckets = [self._get_bucket(ERollupPeriod.DAY, timestamp), self._get_bucket(ERollupPeriod.WEEK, timestamp)]
+        session = self.get_current_session()
+        if session is not None:
+            buckets.append(session)
+        return buckets
+
+    def record_gem(self, timestamp: float):
+        for bucket in self._get_buckets_for(timestamp):
+            bucket.gems += 1
+
+    def record_point(self, timestamp: float):
+        for bucket in self._get_buckets_for(timestamp):
+            bucket.points += 1
+
+    def record_streak(self, timestamp: float, length: int):
+        for bucket in self._get_buckets_for(timestamp):
+            bucket.streak_count += 1
+            if bucket.longest_streak < length:
+                bucket.longest_streak = length
+
+    def add_streak_history(self, timestamps, lengths):
+        """ adds older streaks to the day and week buckets.  Used once, for history saved before rollups existed """
+        for period in [ERollupPeriod.DAY, ERollupPeriod.WEEK]:
+            for timestamp, length in zip(timestamps, lengths):
+                bucket = self._get_bucket(period, timestamp)
+                bucket.streak_count += 1
+                if bucket.longest_streak < length:
+                    bucket.longest_streak = length
+
+    def retire_streaks(self, lengths):
+        """ remembers the lengths of streaks which are about to be dropped from the raw history """
+        for length in lengths:
+            self.retired_streak_counts[length] = self.retired_streak_counts.get(length, 0) + 1
@@ -0,0 +1,99 @@
+import unittest
+from src.test import AbstractTestBase as TestCase
+
+from src.gembo.rollups import ERollupPeriod, RollupBucket, StatisticsRollups, SECONDS_PER_DAY
+
+
+# 1970-01-05 was a monday
+MONDAY = 4 * SECONDS_PER_DAY
+
+
+class RollupsTestCases(TestCase):
+
+    # test utilities ---------------------------------------------------------------------------------------------------
+
+    def test_framework_can_pass_a_test(self):
+        self.assertTrue(True)
+
+
+    # class StatisticsRollups ------------------------------------------------------------------------------------------
+
+    def test__classStatisticsRollups__exists(self):
+        self.assertIsNotNone(StatisticsRollups)
+
+    def test__classStatisticsRollups__fnGetBucketStart__startsWeeksOnMonday(self):
+        rollups = StatisticsRollups(utc_offset_s=0)
+        self.assertEqual(rollups.get_bucket_start(ERollupPeriod.WEEK, MONDAY + 6.5 * SECONDS_PER_DAY), MONDAY)
+        self.assertEqual(rollups.get_bucket_start(ERollupPeriod.WEEK, MONDAY + 7 * SECONDS_PER_DAY),
+                         MONDAY + 7 * SECONDS_PER_DAY)
+        self.assertEqual(rollups.get_bucket_start(ERollupPeriod.DAY, MONDAY + 100.0), MONDAY)
+
+    def test__classStatisticsRollups__fnGetBucketStart__usesLocalDays(self):
+        rollups = StatisticsRollups(utc_offset_s=3600)
+        # 23:30 utc is 00:30 the next day, local time
+        self.assertEqual(rollups.get_bucket_start(ERollupPeriod.DAY, MONDAY - 1800), MONDAY - 3600)
+
+    def test__classStatisticsRollups__fnRecord__updatesDayWeekAndSession(self):
+        rollups = StatisticsRollups(utc_offset_s=0)
+        rollups.start_session(MONDAY + 10)
+        rollups.record_gem(MONDAY + 10)
+        rollups.record_point(MONDAY + 11)
+        rollups.record_streak(MONDAY + 12, 4)
+        rollups.record_streak(MONDAY + SECONDS_PER_DAY, 2)
+
+        days = rollups.get_buckets(ERollupPeriod.DAY)
+        self.assertEqual(days, [RollupBucket(MONDAY, 1, 1, 1, 4), RollupBucket(MONDAY + SECONDS_PER_DAY, 0, 0, 1, 2)])
+        self.assertEqual(rollups.get_buckets(ERollupPeriod.WEEK), [RollupBucket(MONDAY, 1, 1, 2, 4)])
+        self.assertEqual(rollups.get_current_session(), RollupBucket(MONDAY + 10, 1, 1, 2, 4))
+
+    def test__classStatisticsRollups__fnRecord__skipsSession__beforeOneStarts(self):
+        rollups = StatisticsRollups(utc_offset_s=0)
+        rollups.record_gem(MONDAY)
+        self.assertIsNone(rollups.get_current_session())
+        self.assertEqual(rollups.get_buckets(ERollupPeriod.DAY)[0].gems, 1)
+
+    def test__classStatisticsRollups__fnAddStreakHistory__insertsOlderBucketsInOrder(self):
+        rollups = StatisticsRollups(utc_offset_s=0)
+        rollups.record_streak(MONDAY + 2 * SECONDS_PER_DAY, 1)
+        rollups.add_streak_history([MONDAY, MONDAY + 5.0, MONDAY + 2 * SECONDS_PER_DAY], [3, 7, 2])
+
+        days = rollups.get_buckets(ERollupPeriod.DAY)
+        self.assertEqual([day.start for day in days], [MONDAY, MONDAY + 2 * SECONDS_PER_DAY])
+        self.assertEqual(days[0], RollupBucket(MONDAY, 0, 0, 2, 7))
+        self.assertEqual(days[1].streak_count, 2)
+
+    def test__classStatisticsRollups__fnAddStreakHistory__keepsBucketStartsInStep(self):
+        rollups = StatisticsRollups(utc_offset_s=0)
+        rollups.max_buckets[ERollupPeriod.DAY] = 4
+        rollups.record_streak(MONDAY + 9 * SECONDS_PER_DAY, 1)
+        rollups.add_streak_history([MONDAY + day * SECONDS_PER_DAY for day in [5, 1, 7, 3, 1]], [1, 2, 3, 4, 5])
+
+        for period in [ERollupPeriod.DAY, ERollupPeriod.WEEK]:
+            self.assertEqual(rollups._bucket_starts[period], [bucket.start for bucket in rollups.get_buckets(period)])
+        self.assertEqual([day.start for day in rollups.get_buckets(ERollupPeriod.DAY)],
+                         [MONDAY + day * SECONDS_PER_DAY for day in [3, 5, 7, 9]])
+
+    def test__classStatisticsRollups__keepsOnlyNewestBuckets(self):
+        rollups = StatisticsRollups(utc_offset_s=0)
+        rollups.max_buckets[ERollupPeriod.DAY] = 3
+        for day in range(5):
+            rollups.record_gem(day * SECONDS_PER_DAY)
+        rollups.record_gem(0)
+
+        days = rollups.get_buckets(ERollupPeriod.DAY)
+        self.assertEqual(len(days), 3)
+        self.assertEqual(days[-1].start, 4 * SECONDS_PER_DAY)
+
+    def test__classStatisticsRollups__fnCopy__isIndependent(self):
+        rollups = StatisticsRollups(utc_offset_s=0)
+        rollups.record_gem(MONDAY)
+        copy = rollups.copy()
+        rollups.record_gem(MONDAY)
+        rollups.retire_streaks([1])
+
+        self.assertEqual(copy.get_buckets(ERollupPeriod.DAY)[0].gems, 1)
+        self.assertEqual(copy.retired_streak_counts, {})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,339 @@
+from array import array
+from dataclasses import dataclass
+import json
+import os
+import struct
+import zlib
+
+from src.gembo.rollups import ERollupPeriod, RollupBucket, StatisticsRollups
+
+
+# game.data is a small binary container:
+#
+#   header      magic, version, total_play_time, total_gems_collected, total_points, longest_streak
+#   counts      varint: has counts, number of entries, (length, count) * entries, records counted
+#   history     log id, record count, last timestamp (us), then the compressed timestamp and length columns, each
+#               as one or more zlib streams, one after the other
+#   rollups     varint: has rollups, utc offset, the session, day, and week buckets, retired streak counts
+#   trailer     crc32 of everything before it
+#
+# Older versions of the game wrote game.data as json, those files are still read, and replaced on the next save
+SAVE_FILE_MAGIC = b'GSAV'
+SAVE_FILE_VERSION = 1
+SAVE_FILE_HEADER = struct.Struct('<4sHdqqI')
+SAVE_FILE_HISTORY_HEADER = struct.Struct('<QQq')
+SAVE_FILE_TRAILER = struct.Struct('<I')
+
+# the player stats which live in the header, in order
+SAVE_FILE_SCALARS = ['total_play_time', 'total_gems_collected', 'total_points', 'longest_streak']
+
+
+# varints --------------------------------------------------------------------------------------------------------------
+
+def encode_varint(value: int, out: bytearray):
+    """ appends an unsigned LEB128 varint, 7 bits per byte, the high bit means "more bytes follow" """
+    while value > 0x7F:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+def decode_varint(data, position: int) -> tuple[int, int]:
+    """ returns (value, position after the value) """
+    result = 0
+    shift = 0
+    while True:
+        byte = data[position]
+        position += 1
+        result |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return result, position
+        shift += 7
+
+def zigzag(value: int) -> int:
+    """ maps signed to unsigned, so small negative numbers stay small: 0, -1, 1, -2 -> 0, 1, 2, 3 """
+    return (value << 1) if value >= 0 else ((-value << 1) - 1)
+
+def unzigzag(value: int) -> int:
+    return (value >> 1) if not value & 1 else -((value + 1) >> 1)
+
+
+# compact history ------------------------------------------------------------------------------------------------------
+
+def decompress_streams(blob: bytes) -> bytes:
+    """ returns the data of every zlib stream in blob, one after the other, raising zlib.error if one is cut short """
+    out = bytearray()
+    while blob:
+        decompressor = zlib.decompressobj()
+        out += decompressor.decompress(blob)
+        if not decompressor.eof:
+            raise zlib.error('the last zlib stream is incomplete')
+        blob = decompressor.unused_data
+    return bytes(out)
+
+@dataclass(frozen=True)
+class CompactHistory:
+    """ The streak history, as it's stored in game.data.  Each column is compressed on its own, timestamps as the
+    difference from the previous one, in whole microseconds, and lengths as plain varints.  Streaks are seconds
+    apart, and mostly short, so most records take 4 or 5 bytes before compression, instead of 12.
+
+    It's immutable, so the autosave thread can write it while the game keeps playing.  New records are added with
+    extend, which compresses only the new records, into a zlib stream of their own, and appends it to each column,
+    so the cost of extend doesn't grow with the history.  Each stream costs a few bytes of header, and starts
+    compressing from scratch, so extend should be given a batch of records, not one at a time.
+
+    log_id is the id of the StreakLog which continues this history.  Any other log is stale, because its records
+    were already folded in here (see StreakLog.open)
+
+    dropped_record_count is not saved.  It's the number of records at the start of the in-memory history which
+    were left out of this one, because they are older than the retention window (see StatisticsData)
+    """
+    log_id: int = 0
+    record_count: int = 0
+    last_timestamp_us: int = 0
+    timestamps_blob: bytes = zlib.compress(b'')
+    lengths_blob: bytes = zlib.compress(b'')
+    dropped_record_count: int = 0
+
+    def extend(self, timestamps, lengths, log_id: int) -> 'CompactHistory':
+        """ returns a new CompactHistory, with these records after the ones already in this one """
+        timestamp_bytes = bytearray()
+        length_bytes = bytearray()
+
+        last_timestamp_us = self.last_timestamp_us
+        for timestamp in timestamps:
+            timestamp_us = round(timestamp * 1_000_000)
+            encode_varint(zigzag(timestamp_us - last_timestamp_us), timestamp_bytes)
+            last_timestamp_us = timestamp_us
+        for length in lengths:
+            encode_varint(length, length_bytes)
+
+        # an empty history's blobs hold one empty stream, which is dropped
+        timestamps_blob = self.timestamps_blob if self.record_count else b''
+        lengths_blob = self.lengths_blob if self.record_count else b''
+        return CompactHistory(log_id=log_id,
+                              record_count=self.record_count + len(lengths),
+                              last_timestamp_us=last_timestamp_us,
+                              timestamps_blob=timestamps_blob + zlib.compress(timestamp_bytes),
+                              lengths_blob=lengths_blob + zlib.compress(length_bytes),
+                              dropped_record_count=self.dropped_record_count)
+
+    def iter_chunks(self, max_records: int = 65536):
+        """ yields (timestamps, lengths) arrays, of up to max_records each """
+        timestamp_bytes = decompress_streams(self.timestamps_blob)
+        length_bytes = decompress_streams(self.lengths_blob)
+        timestamp_position = 0
+        length_position = 0
+        timestamp_us = 0
+
+        remaining = self.record_count
+        while remaining > 0:
+            count = min(max_records, remaining)
+            timestamps = array('d')
+            lengths = array('I')
+
+            # the varint decoding is inlined, this loop is most of the cost of loading the history
+            for _ in range(count):
+                delta = 0
+                shift = 0
+                while True:
+                    byte = timestamp_bytes[timestamp_position]
+                    timestamp_position += 1
+                    delta |= (byte & 0x7F) << shift
+                    if byte < 0x80:
+                        break
+                    shift += 7
+                timestamp_us += (delta >> 1) if not delta & 1 else -((delta + 1) >> 1)
+                timestamps.append(timestamp_us / 1_000_000)
+
+            # almost every streak is shorter than 128, so the whole chunk is usually one byte per length
+            chunk = length_bytes[length_position:length_position + count]
+            if chunk.isascii() and len(chunk) == count:
+                lengths.fromlist(list(chunk))
+                length_position += count
+            else:
+                for _ in range(count):
+                    length, length_position = decode_varint(length_bytes, length_position)
+                    lengths.append(length)
+
+            remaining -= count
+            yield timestamps, lengths
+
+
+# encoding -------------------------------------------------------------------------------------------------------------
+
+def encode_rollups(rollups: StatisticsRollups, out: bytearray):
+    encode_varint(zigzag(rollups.utc_offset_s), out)
+    for period in ERollupPeriod:
+        buckets = rollups.get_buckets(period)
+        encode_varint(len(buckets), out)
+        for bucket in buckets:
+            encode_varint(zigzag(bucket.start), out)
+            encode_varint(bucket.gems, out)
+            encode_varint(bucket.points, out)
+            encode_varint(bucket.streak_count, out)
+            encode_varint(bucket.longest_streak, out)
+
+    encode_varint(len(rollups.retired_streak_counts), out)
+    for length, count in rollups.retired_streak_counts.items():
+        encode_varint(length, out)
+        encode_varint(count, out)
+
+def decode_rollups(data, position: int) -> tuple[StatisticsRollups, int]:
+    """ returns (rollups, position after the rollups) """
+    utc_offset_s, position = decode_varint(data, position)
+    rollups = StatisticsRollups(utc_offset_s=unzigzag(utc_offset_s))
+    for period in ERollupPeriod:
+        bucket_count, position = decode_varint(data, position)
+        for _ in range(bucket_count):
+            start, position = decode_varint(data, position)
+            bucket = RollupBucket(start=unzigzag(start))
+            bucket.gems, position = decode_varint(data, position)
+            bucket.points, position = decode_varint(data, position)
+            bucket.streak_count, position = decode_varint(data, position)
+            bucket.longest_streak, position = decode_varint(data, position)
+            rollups.append_bucket(period, bucket)
+
+    entry_count, position = decode_varint(data, position)
+    for _ in range(entry_count):
+        length, position = decode_varint(data, position)
+        rollups.retired_streak_counts[length], position = decode_varint(data, position)
+    return rollups, position
+
+def encode_save_file(save_data: dict) -> bytes:
+    """ Packs the save data into the binary format
+
+    Args:
+        save_data(dict) - the player stats, plus the optional keys: streak_counts, streak_counts_record_count,
+            compact_history(CompactHistory), and rollups(StatisticsRollups)
+
+    Returns:
+        data(bytes)
+    """
+    out = bytearray(SAVE_FILE_HEADER.pack(SAVE_FILE_MAGIC, SAVE_FILE_VERSION,
+                                          float(save_data.get('total_play_time', 0.0)),
+                                          int(save_data.get('total_gems_collected', 0)),
+                                          int(save_data.get('total_points', 0)),
+                                          int(save_data.get('longest_streak', 0))))
+
+    streak_counts = save_data.get('streak_counts')
+    encode_varint(0 if streak_counts is None else 1, out)
+    if streak_counts is not None:
+        encode_varint(len(streak_counts), out)
+        for length, count in streak_counts.items():
+            encode_varint(int(length), out)
+            encode_varint(count, out)
+        encode_varint(save_data.get('streak_counts_record_count', 0), out)
+
+    history = save_data.get('compact_history') or CompactHistory()
+    out += SAVE_FILE_HISTORY_HEADER.pack(history.log_id, history.record_count, history.last_timestamp_us)
+    for blob in [history.timestamps_blob, history.lengths_blob]:
+        encode_varint(len(blob), out)
+        out += blob
+
+    rollups = save_data.get('rollups')
+    encode_varint(0 if rollups is None else 1, out)
+    if rollups is not None:
+        encode_rollups(rollups, out)
+
+    out += SAVE_FILE_TRAILER.pack(zlib.crc32(out))
+    return bytes(out)
+
+def decode_save_file(data: bytes):
+    """ Unpacks a save file, written by encode_save_file
+
+    Returns:
+        save_data(dict) - or None, if the data is not a save file, is a newer version, or is damaged
+    """
+    if len(data) < SAVE_FILE_HEADER.size + SAVE_FILE_TRAILER.size or not data.startswith(SAVE_FILE_MAGIC):
+        return None
+
+    body = memoryview(data)[:-SAVE_FILE_TRAILER.size]
+    (crc,) = SAVE_FILE_TRAILER.unpack_from(data, len(body))
+    if zlib.crc32(body) != crc:
+        print('Save file is damaged, the checksum does not match')
+        return None
+
+    magic, version, *scalars = SAVE_FILE_HEADER.unpack_from(body)
+    if version != SAVE_FILE_VERSION:
+        print(f'Save file version={version} is not supported')
+        return None
+
+    save_data = dict(zip(SAVE_FILE_SCALARS, scalars))
+    try:
+        position = SAVE_FILE_HEADER.size
+        has_counts, position = decode_varint(body, position)
+        if has_counts:
+            streak_counts = {}
+            entry_count, position = decode_varint(body, position)
+            for _ in range(entry_count):
+                length, position = decode_varint(body, position)
+                streak_counts[length], position = decode_varint(body, position)
+            save_data['streak_counts'] = streak_counts
+            save_data['streak_counts_record_count'], position = decode_varint(body, position)
+
+        log_id, record_count, last_timestamp_us = SAVE_FILE_HISTORY_HEADER.unpack_from(body, position)
+        position += SAVE_FILE_HISTORY_HEADER.size
+        blobs = []
+        for _ in range(2):
+            blob_size, position = decode_varint(body, position)
+            blobs.append(bytes(body[position:position + blob_size]))
+            position += blob_size
+
+        has_rollups, position = decode_varint(body, position)
+        if has_rollups:
+            save_data['rollups'], position = decode_rollups(body, position)
+    except (IndexError, struct.error):
+        # the checksum matched, so this only happens for a file which was written wrong
+        print('Save file is truncated')
+        return None
+
+    save_data['compact_history'] = CompactHistory(log_id=log_id,
+                                                  record_count=record_count,
+                                                  last_timestamp_us=last_timestamp_us,
+                                                  timestamps_blob=blobs[0],
+                                                  lengths_blob=blobs[1])
+    return save_data
+
+
+# files ----------------------------------------------------------------------------------------------------------------
+
+def read_save_file(path: str):
+    """ Reads a save file, in the binary format, or the older json format
+
+    Returns:
+        save_data(dict) - or None, if the file is missing or can't be read.  A json save has no compact_history,
+            but may have the old player_streak_history list
+    """
+    if path is None or not os.path.isfile(path):
+        return None
+
+    with open(path, 'rb') as infile:
+        data = infile.read()
+
+    if data.startswith(SAVE_FILE_MAGIC):
+        return decode_save_file(data)
+
+    try:
+        save_data = json.loads(data)
+    except ValueError:
+        print(f'Save file="{path}" is neither a save file, nor json')
+        return None
+    return save_data if isinstance(save_data, dict) else None
+
+def load_save_file(path: str, backup_path: str = None):
+    """ reads the save file, and falls back to the backup, if the save file is missing or damaged """
+    for candidate in [path, backup_path]:
+        save_data = read_save_file(candidate)
+        if save_data is not None:
+            return save_data
+
+def write_save_file(path: str, save_data: dict, backup_path: str = None) -> bool:
+    """ Writes the save file atomically.  The current file is rotated into the backup, but only if it can still be
+    read, so a damaged file never replaces the last good one
+    """
+    # resource imports pygame, and this module is also used by stats_cli.py, which doesn't want it
+    from src.engine.resource import write_file_atomic
+
+    if backup_path and read_save_file(path) is None:
+        backup_path = None
+    return write_file_atomic(path, encode_save_file(save_data), backup_path)
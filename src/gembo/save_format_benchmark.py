@@ -0,0 +1,74 @@
+""" Compares the binary game.data format against the json format it replaced, for size, save time, and load time
+
+    python -m src.gembo.save_format_benchmark [record count]
+"""
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+from src.gembo.save_format import CompactHistory, encode_save_file, decode_save_file
+
+
+def make_history(record_count: int) -> list[list]:
+    """ streaks a few seconds apart, mostly short, like real play """
+    timestamp = 1739772301.4202752
+    history = []
+    for _ in range(record_count):
+        timestamp += random.expovariate(1 / 6.0)
+        history.append([timestamp, min(int(random.expovariate(1 / 4.0)), 200)])
+    return history
+
+def time_it(fn) -> tuple[float, any]:
+    started_at = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - started_at, result
+
+def run_benchmark(record_count: int):
+    history = make_history(record_count)
+    scalars = {'total_play_time': 87804.66, 'total_gems_collected': 27258, 'total_points': 17831, 'longest_streak': 174}
+    json_data = dict(scalars, player_streak_history=history)
+
+    with tempfile.TemporaryDirectory() as directory:
+        json_path = os.path.join(directory, 'game.json')
+        binary_path = os.path.join(directory, 'game.data')
+
+        def save_json():
+            with open(json_path, 'w') as outfile:
+                outfile.write(json.dumps(json_data))
+
+        def load_json():
+            with open(json_path, 'r') as infile:
+                return json.loads(infile.read())
+
+        def save_binary():
+            compact_history = CompactHistory().extend([t for t, _ in history], [n for _, n in history], log_id=1)
+            with open(binary_path, 'wb') as outfile:
+                outfile.write(encode_save_file(dict(scalars, compact_history=compact_history)))
+
+        def load_binary_scalars():
+            with open(binary_path, 'rb') as infile:
+                return decode_save_file(infile.read())
+
+        def load_binary():
+            save_data = load_binary_scalars()
+            return [chunk for chunk in save_data['compact_history'].iter_chunks()]
+
+        json_save_s, _ = time_it(save_json)
+        json_load_s, _ = time_it(load_json)
+        binary_save_s, _ = time_it(save_binary)
+        binary_scalars_s, _ = time_it(load_binary_scalars)
+        binary_load_s, _ = time_it(load_binary)
+
+        print(f'records: {record_count}')
+        print(f'{"":>28}{"json":>12}{"binary":>12}')
+        print(f'{"size (bytes)":>28}{os.path.getsize(json_path):>12}{os.path.getsize(binary_path):>12}')
+        print(f'{"save (ms)":>28}{json_save_s * 1000:>12.1f}{binary_save_s * 1000:>12.1f}')
+        print(f'{"load, totals only (ms)":>28}{json_load_s * 1000:>12.1f}{binary_scalars_s * 1000:>12.1f}')
+        print(f'{"load, with history (ms)":>28}{json_load_s * 1000:>12.1f}{binary_load_s * 1000:>12.1f}')
+
+
+if __name__ == '__main__':
+    run_benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
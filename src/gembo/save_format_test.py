@@ -0,0 +1,186 @@
+import unittest
+from src.test import AbstractTestBase as TestCase
+
+import json
+import os
+
+import struct
+import zlib
+
+from src.gembo.rollups import ERollupPeriod, StatisticsRollups
+from src.gembo.save_format import (CompactHistory, decode_save_file, decode_varint, decompress_streams,
+                                   encode_save_file, encode_varint, load_save_file, read_save_file, unzigzag, write_save_file, zigzag, SAVE_FILE_TRAILER)
+
+
+class SaveFormatTestCases(TestCase):
+
+    # test utilities ---------------------------------------------------------------------------------------------------
+
+    def setUp(self):
+        self.test_path = 'deleteme.data'
+        self.test_backup_path = 'deleteme.data.backup'
+
+    def tearDown(self):
+        for path in [self.test_path, self.test_backup_path]:
+            if os.path.exists(path):
+                self.assertRemoveFile(path)
+
+    @staticmethod
+    def get_save_data():
+        return {
+            'total_play_time': 12.5,
+            'total_gems_collected': 30,
+            'total_points': 20,
+            'longest_streak': 7,
+            'streak_counts': {1: 3, 7: 1},
+            'streak_counts_record_count': 4,
+            'compact_history': CompactHistory().extend([1.5, 2.0, 2.25, 9.0], [1, 1, 7, 1], log_id=42),
+        }
+
+    def test_framework_can_pass_a_test(self):
+        self.assertTrue(True)
+
+
+    # varints ----------------------------------------------------------------------------------------------------------
+
+    def test__fnEncodeVarint__roundTrips(self):
+        out = bytearray()
+        values = [0, 1, 127, 128, 300, 2 ** 40]
+        for value in values:
+            encode_varint(value, out)
+
+        position = 0
+        for value in values:
+            decoded, position = decode_varint(out, position)
+            self.assertEqual(decoded, value)
+        self.assertEqual(position, len(out))
+
+    def test__fnEncodeVarint__usesOneByte__forSmallValues(self):
+        out = bytearray()
+        encode_varint(127, out)
+        self.assertEqual(len(out), 1)
+
+    def test__fnZigzag__roundTrips__andKeepsSmallNegativesSmall(self):
+        self.assertEqual([zigzag(v) for v in [0, -1, 1, -2]], [0, 1, 2, 3])
+        for value in [0, 5, -5, 2 ** 50, -2 ** 50]:
+            self.assertEqual(unzigzag(zigzag(value)), value)
+
+
+    # class CompactHistory ---------------------------------------------------------------------------------------------
+
+    def test__classCompactHistory__isFrozenDataClass(self):
+        self.assertTrue(CompactHistory().__dataclass_params__.frozen)
+
+    def test__classCompactHistory__fnExtend__returnsNewHistory(self):
+        empty = CompactHistory()
+        history = empty.extend([1.0], [2], log_id=5)
+        self.assertEqual(empty.record_count, 0)
+        self.assertEqual(history.record_count, 1)
+        self.assertEqual(history.log_id, 5)
+
+    def test__classCompactHistory__fnIterChunks__roundTripsToTheMicrosecond(self):
+        timestamps = [1739772301.4202752, 1739772305.734839, 1739772300.0]
+        history = CompactHistory().extend(timestamps[:2], [1, 2], log_id=1).extend(timestamps[2:], [300], log_id=2)
+
+        decoded_timestamps = []
+        decoded_lengths = []
+        for chunk_timestamps, chunk_lengths in history.iter_chunks(max_records=2):
+            decoded_timestamps.extend(chunk_timestamps)
+            decoded_lengths.extend(chunk_lengths)
+
+        self.assertEqual(decoded_lengths, [1, 2, 300])
+        for expected, decoded in zip(timestamps, decoded_timestamps):
+            self.assertAlmostEqual(expected, decoded, delta=1e-6)
+
+    def test__classCompactHistory__fnExtend__appendsToBlobs__withoutRecompressingThem(self):
+        history = CompactHistory().extend([1.0, 2.0], [1, 2], log_id=1)
+        extended = history.extend([3.0], [3], log_id=2)
+        self.assertTrue(extended.timestamps_blob.startswith(history.timestamps_blob))
+        self.assertTrue(extended.lengths_blob.startswith(history.lengths_blob))
+
+
+    # fn decompress_streams --------------------------------------------------------------------------------------------
+
+    def test__fnDecompressStreams__joinsEveryStream(self):
+        self.assertEqual(decompress_streams(zlib.compress(b'ab') + zlib.compress(b'') + zlib.compress(b'cd')), b'abcd')
+
+    def test__fnDecompressStreams__raises__forIncompleteStream(self):
+        blob = zlib.compress(b'ab') + zlib.compress(b'cd')
+        with self.assertRaises(zlib.error):
+            decompress_streams(blob[:-2])
+
+
+    # fn encode_save_file / decode_save_file ---------------------------------------------------------------------------
+
+    def test__fnDecodeSaveFile__roundTripsEncodedData(self):
+        save_data = self.get_save_data()
+        decoded = decode_save_file(encode_save_file(save_data))
+        self.assertEqual(decoded, save_data)
+
+    def test__fnDecodeSaveFile__returnsNone__forDamagedData(self):
+        data = bytearray(encode_save_file(self.get_save_data()))
+        data[10] ^= 0xFF
+        self.assertIsNone(decode_save_file(bytes(data)))
+
+    def test__fnDecodeSaveFile__returnsNone__forJson(self):
+        self.assertIsNone(decode_save_file(b'{"total_points": 1}'))
+
+    def test__fnDecodeSaveFile__handlesMissingCounts(self):
+        decoded = decode_save_file(encode_save_file({'total_points': 3}))
+        self.assertEqual(decoded['total_points'], 3)
+        self.assertFalse('streak_counts' in decoded)
+        self.assertEqual(decoded['compact_history'].record_count, 0)
+
+    def test__fnDecodeSaveFile__roundTripsRollups(self):
+        rollups = StatisticsRollups(utc_offset_s=-3600)
+        rollups.start_session(100.0)
+        rollups.record_gem(100.0)
+        rollups.record_streak(200.0, 6)
+        rollups.retire_streaks([2, 2, 9])
+
+        decoded = decode_save_file(encode_save_file(dict(self.get_save_data(), rollups=rollups)))['rollups']
+        self.assertEqual(decoded.utc_offset_s, -3600)
+        self.assertEqual(decoded.retired_streak_counts, {2: 2, 9: 1})
+        for period in ERollupPeriod:
+            self.assertEqual(decoded.get_buckets(period), rollups.get_buckets(period))
+
+    def test__fnDecodeSaveFile__returnsNone__forNewerVersion(self):
+        data = bytearray(encode_save_file(self.get_save_data()))[:-SAVE_FILE_TRAILER.size]
+        struct.pack_into('<H', data, 4, 2)
+        data += SAVE_FILE_TRAILER.pack(zlib.crc32(data))
+        self.assertIsNone(decode_save_file(bytes(data)))
+
+
+    # fn read_save_file / load_save_file -------------------------------------------------------------------------------
+
+    def test__fnReadSaveFile__readsJsonSaves__fromOlderVersions(self):
+        legacy = {'total_points': 5, 'player_streak_history': [[1.0, 2]]}
+        self.assertCreateFile(self.test_path, json.dumps(legacy))
+        self.assertEqual(read_save_file(self.test_path), legacy)
+
+    def test__fnReadSaveFile__returnsNone__forMissingFile(self):
+        self.assertIsNone(read_save_file('asdasdad'))
+
+    def test__fnLoadSaveFile__fallsBackToBackup__forDamagedFile(self):
+        self.assertCreateFile(self.test_path, '{"total_points": ')
+        self.assertCreateFile(self.test_backup_path, '{"total_points": 4}')
+        self.assertEqual(load_save_file(self.test_path, self.test_backup_path), {'total_points': 4})
+
+
+    # fn write_save_file -----------------------------------------------------------------------------------------------
+
+    def test__fnWriteSaveFile__rotatesPreviousSaveIntoBackup(self):
+        self.assertTrue(write_save_file(self.test_path, {'total_points': 1}, self.test_backup_path))
+        self.assertTrue(write_save_file(self.test_path, {'total_points': 2}, self.test_backup_path))
+        self.assertEqual(read_save_file(self.test_path)['total_points'], 2)
+        self.assertEqual(read_save_file(self.test_backup_path)['total_points'], 1)
+
+    def test__fnWriteSaveFile__keepsBackup__ifCurrentFileIsDamaged(self):
+        self.assertCreateFile(self.test_backup_path, '{"total_points": 4}')
+        self.assertCreateFile(self.test_path, 'damaged')
+        write_save_file(self.test_path, {'total_points': 5}, self.test_backup_path)
+        self.assertEqual(read_save_file(self.test_backup_path), {'total_points': 4})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,292 @@
+from array import array
+from collections import Counter
+import sqlite3
+import threading
+
+from src.gembo.save_format import SAVE_FILE_SCALARS, decode_rollups, encode_rollups
+
+
+STATISTICS_STORE_SCHEMA_VERSION = 1
+
+STATISTICS_STORE_SCHEMA = [
+    'CREATE TABLE IF NOT EXISTS player_stats (key TEXT PRIMARY KEY, value) WITHOUT ROWID',
+    'CREATE TABLE IF NOT EXISTS streaks (id INTEGER PRIMARY KEY, timestamp REAL NOT NULL, length INTEGER NOT NULL)',
+    'CREATE INDEX IF NOT EXISTS streaks_by_timestamp ON streaks (timestamp)',
+    'CREATE INDEX IF NOT EXISTS streaks_by_length ON streaks (length)',
+]
+
+
+class StatisticsStore:
+    """ The StatisticsStore keeps the statistics in a sqlite database, as an alternative to game.data and
+    game.streaks (see StatisticsData.use_statistics_database).  Every streak is a row, and the indexes on timestamp
+    and length answer questions like "the 10 longest streaks", "streaks this week", or "streaks of at least 20",
+    without reading the whole history.
+
+    The main thread reads through one connection, and the autosave thread writes through another.  The database is
+    in WAL mode, so the reads don't wait for the autosave thread's transaction, they see the last commit.  The main
+    thread never writes: append_streak only buffers the streak, and the autosave thread inserts every buffered
+    streak with the player stats, in one transaction (see write_save_data).  Until then, the queries add the
+    buffered streaks to what they read from the database.
+
+    The lock guards the buffer.  The autosave thread only holds it while it commits, and takes the streaks it
+    inserted out of the buffer, so a query never counts a streak twice, or misses one
+    """
+    def __init__(self, path: str):
+        self.path = path
+
+        # the main thread reads through _connection, the autosave thread writes through _write_connection
+        self._connection = None
+        self._write_connection = None
+        # guards _pending_streaks, and the commit which moves them into the database
+        self._lock = threading.Lock()
+        # one write at a time, ie: close, while the autosave thread is saving
+        self._write_lock = threading.Lock()
+
+        # (timestamp, length) rows which haven't been inserted yet
+        self._pending_streaks = []
+
+        # how many times a transaction was committed, for tests and profiling
+        self.transaction_count = 0
+
+    def is_open(self) -> bool:
+        return self._connection is not None
+
+    def _connect(self):
+        # isolation_level=None leaves the transactions to us, see _write.  The connections are made on the main
+        # thread, but the write connection is used on the autosave thread
+        connection = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        connection.execute('PRAGMA journal_mode=WAL')
+        # in WAL mode, a crash can lose the last transactions, but never damages the database
+        connection.execute('PRAGMA synchronous=NORMAL')
+        return connection
+
+    def open(self) -> bool:
+        """ opens the database, creating it, and its tables, if they don't exist yet
+
+        Returns:
+            was_opened(bool) - False, if the file is not a database, or was written by a newer version of the game
+        """
+        if self.is_open():
+            return False
+        connection = None
+        try:
+            connection = self._connect()
+
+            (schema_version,) = connection.execute('PRAGMA user_version').fetchone()
+            if schema_version > STATISTICS_STORE_SCHEMA_VERSION:
+                print(f'Statistics database version={schema_version} is not supported, path="{self.path}"')
+                connection.close()
+                return False
+
+            connection.execute('BEGIN')
+            for statement in STATISTICS_STORE_SCHEMA:
+                connection.execute(statement)
+            connection.execute(f'PRAGMA user_version={STATISTICS_STORE_SCHEMA_VERSION}')
+            connection.execute('COMMIT')
+
+            write_connection = self._connect()
+        except sqlite3.Error as error:
+            print(f'Could not open the statistics database, path="{self.path}", error="{error}"')
+            if connection is not None:
+                connection.close()
+            return False
+
+        self._connection = connection
+        self._write_connection = write_connection
+        return True
+
+    def close(self):
+        """ inserts any buffered streaks, and closes both connections """
+        self.flush_streaks()
+        with self._write_lock:
+            if self._connection is not None:
+                self._write_connection.close()
+                self._write_connection = None
+                self._connection.close()
+                self._connection = None
+
+    def _write(self, fn=None) -> bool:
+        """ Inserts the buffered streaks, and runs fn(connection), in one transaction on the write connection.
+        Returns False, and rolls back, if it fails, and then the streaks stay buffered, for the next write
+        """
+        with self._write_lock:
+            connection = self._write_connection
+            if connection is None:
+                return False
+            with self._lock:
+                pending_streaks = list(self._pending_streaks)
+            try:
+                connection.execute('BEGIN')
+                if pending_streaks:
+                    connection.executemany('INSERT INTO streaks (timestamp, length) VALUES (?, ?)', pending_streaks)
+                if fn is not None:
+                    fn(connection)
+                # the queries add the buffer to what they read, so the streaks leave it as they're committed.  Any
+                # appended since are after them
+                with self._lock:
+                    connection.execute('COMMIT')
+                    del self._pending_streaks[:len(pending_streaks)]
+            except sqlite3.Error as error:
+                print(f'Could not write the statistics database, path="{self.path}", error="{error}"')
+                if connection.in_transaction:
+                    connection.execute('ROLLBACK')
+                return False
+            self.transaction_count += 1
+            return True
+
+    def _query(self, sql: str, parameters=()) -> list:
+        """ runs a query on the main thread's connection.  It doesn't see the buffered streaks, so the callers which
+        add them in hold the lock around both, so a commit can't move them in between
+        """
+        if self._connection is None:
+            return []
+        return self._connection.execute(sql, parameters).fetchall()
+
+    # streaks ----------------------------------------------------------------------------------------------------------
+
+    def append_streak(self, length: int, timestamp: float):
+        """ buffers one streak, it's inserted by the next save (see write_save_data) """
+        with self._lock:
+            self._pending_streaks.append((timestamp, length))
+
+    def flush_streaks(self) -> bool:
+        """ inserts the buffered streaks, without waiting for the next save """
+        with self._lock:
+            if not self._pending_streaks:
+                return True
+        return self._write()
+
+    def get_streak_count(self) -> int:
+        if not self.is_open():
+            return 0
+        with self._lock:
+            return self._query('SELECT COUNT(*) FROM streaks')[0][0] + len(self._pending_streaks)
+
+    def get_streak_length_count(self) -> int:
+        """ the number of distinct streak lengths, read from the length index """
+        if not self.is_open():
+            return 0
+        with self._lock:
+            pending_lengths = list({length for _, length in self._pending_streaks})
+            if not pending_lengths:
+                return self._query('SELECT COUNT(DISTINCT length) FROM streaks')[0][0]
+            # UNION drops the buffered lengths which are already in the database
+            values = ', '.join(['(?)'] * len(pending_lengths))
+            return self._query(f'SELECT COUNT(*) FROM (SELECT length FROM streaks UNION VALUES {values})',
+                               pending_lengths)[0][0]
+
+    def get_streak_rows(self, start: int, stop: int) -> list[tuple[int, int]]:
+        """ returns [(streak length, count)] for rows start to stop of the table of distinct lengths, longest first.
+        The length index is walked from the longest, so the cost grows with stop, not with the whole history
+        """
+        start = max(0, start)
+        if stop <= start:
+            return []
+        with self._lock:
+            pending_counts = Counter(length for _, length in self._pending_streaks)
+            if not pending_counts:
+                return [tuple(row) for row in self._query(
+                    'SELECT length, COUNT(*) FROM streaks GROUP BY length ORDER BY length DESC LIMIT ? OFFSET ?',
+                    (stop - start, start))]
+            rows = self._query('SELECT length, COUNT(*) FROM streaks GROUP BY length ORDER BY length DESC LIMIT ?',
+                               (stop,))
+
+        # a buffered length which is shorter than all of these rows isn't in the first stop rows anyway, unless the
+        # database ran out of rows, and then it isn't in the database either
+        streak_counts = Counter(dict(rows))
+        streak_counts.update(pending_counts)
+        return sorted(streak_counts.items(), reverse=True)[start:stop]
+
+    def get_top_streaks(self, n: int = 10) -> list[tuple[int, int]]:
+        """ returns [(streak length, count)] for the n longest distinct lengths, longest first """
+        return self.get_streak_rows(0, n)
+
+    def count_streaks_since(self, timestamp: float) -> int:
+        """ the number of streaks at or after timestamp, read from the timestamp index """
+        if not self.is_open():
+            return 0
+        with self._lock:
+            (count,) = self._query('SELECT COUNT(*) FROM streaks WHERE timestamp >= ?', (timestamp,))[0]
+            return count + sum(1 for streak_timestamp, _ in self._pending_streaks if streak_timestamp >= timestamp)
+
+    def count_streaks_at_least(self, length: int) -> int:
+        """ the number of streaks at least length long, read from the length index """
+        if not self.is_open():
+            return 0
+        with self._lock:
+            (count,) = self._query('SELECT COUNT(*) FROM streaks WHERE length >= ?', (length,))[0]
+            return count + sum(1 for _, streak_length in self._pending_streaks if streak_length >= length)
+
+    def get_streak_counts(self) -> dict:
+        """ returns {streak length: count}, read from the length index """
+        with self._lock:
+            streak_counts = Counter(dict(self._query('SELECT length, COUNT(*) FROM streaks GROUP BY length')))
+            streak_counts.update(length for _, length in self._pending_streaks)
+        return dict(streak_counts)
+
+    def iter_streak_chunks(self, max_records: int = 65536):
+        """ yields (timestamps, lengths) arrays, oldest first, of the streaks in the database when this was called.
+        Each chunk is a separate query, so this can be spread over many frames (see StreakLog.load_chunk)
+        """
+        with self._lock:
+            rows = self._query('SELECT MAX(id) FROM streaks')
+        last_id = rows[0][0] if rows and rows[0][0] is not None else 0
+        after_id = 0
+        while after_id < last_id:
+            with self._lock:
+                rows = self._query('SELECT id, timestamp, length FROM streaks WHERE id > ? AND id <= ? ORDER BY id '
+                                   'LIMIT ?', (after_id, last_id, max_records))
+            if not rows:
+                return
+            after_id = rows[-1][0]
+            yield array('d', [row[1] for row in rows]), array('I', [row[2] for row in rows])
+
+    # player stats -----------------------------------------------------------------------------------------------------
+
+    def is_empty(self) -> bool:
+        """ True for a new database, which should be filled from game.data (see StatisticsData.load_statistics_store) """
+        with self._lock:
+            return (not self._pending_streaks and not self._query('SELECT 1 FROM player_stats LIMIT 1')
+                    and not self._query('SELECT 1 FROM streaks LIMIT 1'))
+
+    def write_save_data(self, save_data: dict) -> bool:
+        """ Saves the player stats, and any buffered streaks, in one transaction.  Runs on the autosave thread.
+
+        Args:
+            save_data(dict) - from StatisticsData.get_save_data.  Only the player stats and rollups are kept, the
+                streak counts and history are already in the streaks table
+        """
+        rows = [(key, save_data[key]) for key in SAVE_FILE_SCALARS if key in save_data]
+        rollups = save_data.get('rollups')
+        if rollups is not None:
+            rollups_blob = bytearray()
+            encode_rollups(rollups, rollups_blob)
+            rows.append(('rollups', bytes(rollups_blob)))
+
+        return self._write(
+            lambda connection: connection.executemany('INSERT OR REPLACE INTO player_stats (key, value) VALUES (?, ?)',
+                                                      rows))
+
+    def import_save_data(self, save_data: dict, timestamps, lengths) -> bool:
+        """ fills a new database from game.data and its streak history, in one transaction """
+        with self._lock:
+            self._pending_streaks.extend(zip(timestamps, lengths))
+        return self.write_save_data(save_data)
+
+    def read_save_data(self) -> dict:
+        """ Returns the player stats, in the same form read_save_file does, with exact streak counts from the
+        streaks table.  Streaks which were dropped from the history before the database existed only live in the
+        rollups, so they're added in
+        """
+        with self._lock:
+            save_data = dict(self._query('SELECT key, value FROM player_stats'))
+        if 'rollups' in save_data:
+            save_data['rollups'], _ = decode_rollups(save_data['rollups'], 0)
+
+        streak_counts = self.get_streak_counts()
+        if 'rollups' in save_data:
+            for length, count in save_data['rollups'].retired_streak_counts.items():
+                streak_counts[length] = streak_counts.get(length, 0) + count
+        save_data['streak_counts'] = streak_counts
+        save_data['streak_counts_record_count'] = self.get_streak_count()
+        return save_data
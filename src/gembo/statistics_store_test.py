@@ -0,0 +1,172 @@
+import unittest
+from src.test import AbstractTestBase as TestCase
+
+import os
+
+from src.gembo.rollups import StatisticsRollups
+from src.gembo.statistics_store import StatisticsStore
+
+
+class StatisticsStoreTestCases(TestCase):
+
+    # test utilities ---------------------------------------------------------------------------------------------------
+
+    def setUp(self):
+        self.test_path = 'deleteme.db'
+
+    def tearDown(self):
+        # WAL mode keeps two more files next to the database, while it's open
+        for path in [self.test_path, self.test_path + '-wal', self.test_path + '-shm']:
+            if os.path.exists(path):
+                self.assertRemoveFile(path)
+
+    def make_store(self, **kwargs):
+        store = StatisticsStore(self.test_path, **kwargs)
+        self.assertTrue(store.open())
+        self.addCleanup(store.close)
+        return store
+
+    def test_framework_can_pass_a_test(self):
+        self.assertTrue(True)
+
+
+    # class StatisticsStore --------------------------------------------------------------------------------------------
+
+    def test__classStatisticsStore__exists(self):
+        self.assertIsNotNone(StatisticsStore)
+
+    def test__classStatisticsStore__fnOpen__usesWalMode__andCreatesIndexes(self):
+        store = self.make_store()
+        self.assertEqual(store._query('PRAGMA journal_mode'), [('wal',)])
+        indexes = {row[0] for row in store._query("SELECT name FROM sqlite_master WHERE type = 'index'")}
+        self.assertTrue({'streaks_by_timestamp', 'streaks_by_length'} <= indexes)
+
+    def test__classStatisticsStore__fnOpen__returnsFalse__forFileWhichIsNotADatabase(self):
+        self.assertCreateFile(self.test_path, 'not a database, but long enough that sqlite reads the header of it')
+        store = StatisticsStore(self.test_path)
+        self.assertFalse(store.open())
+        self.assertFalse(store.is_open())
+
+    def test__classStatisticsStore__fnAppendStreak__buffersStreaks__untilTheNextSave(self):
+        store = self.make_store()
+        store.append_streak(1, 10.0)
+        store.append_streak(2, 11.0)
+        self.assertEqual(store.transaction_count, 0)
+        self.assertEqual(store._query('SELECT COUNT(*) FROM streaks'), [(0,)])
+        self.assertEqual(store.get_streak_count(), 2)
+
+        self.assertTrue(store.write_save_data({'total_points': 3}))
+        self.assertEqual(store.transaction_count, 1)
+        self.assertEqual(store._query('SELECT COUNT(*) FROM streaks'), [(2,)])
+        self.assertEqual(store.get_streak_count(), 2)
+
+    def test__classStatisticsStore__queries__dontWait__forTheAutosaveTransaction(self):
+        store = self.make_store()
+        store.append_streak(4, 10.0)
+        self.assertTrue(store.flush_streaks())
+
+        # like the autosave thread, part way through a save
+        store._write_connection.execute('BEGIN IMMEDIATE')
+        store._write_connection.execute('INSERT INTO streaks (timestamp, length) VALUES (11.0, 9)')
+        self.assertEqual(store.get_streak_rows(0, 10), [(4, 1)])
+        store._write_connection.execute('ROLLBACK')
+
+    def test__classStatisticsStore__fnFlushStreaks__keepsStreaks__whenTransactionFails(self):
+        store = self.make_store()
+        store.append_streak(1, 10.0)
+        store.append_streak(2, 11.0)
+
+        # every write fails, like a locked or full database
+        store._write_connection.execute('PRAGMA query_only=ON')
+        self.assertFalse(store.flush_streaks())
+        self.assertFalse(store.write_save_data({'total_points': 3}))
+        self.assertEqual(store.get_streak_count(), 2)
+
+        store._write_connection.execute('PRAGMA query_only=OFF')
+        self.assertTrue(store.flush_streaks())
+        self.assertEqual(store._query('SELECT length FROM streaks ORDER BY id'), [(1,), (2,)])
+
+    def test__classStatisticsStore__fnWriteSaveData__keepsStreaks__whenTransactionFails(self):
+        store = self.make_store()
+        store.append_streak(3, 10.0)
+        store._write_connection.execute('PRAGMA query_only=ON')
+        self.assertFalse(store.write_save_data({'total_points': 3}))
+
+        store._write_connection.execute('PRAGMA query_only=OFF')
+        self.assertTrue(store.write_save_data({'total_points': 3}))
+        self.assertEqual(store.get_streak_count(), 1)
+
+    def test__classStatisticsStore__queries__useTheIndexes(self):
+        store = self.make_store()
+        for sql in ['SELECT COUNT(*) FROM streaks WHERE timestamp >= 0',
+                    'SELECT COUNT(*) FROM streaks WHERE length >= 0',
+                    'SELECT COUNT(DISTINCT length) FROM streaks',
+                    'SELECT length, COUNT(*) FROM streaks GROUP BY length ORDER BY length DESC LIMIT 10 OFFSET 5']:
+            plan = ' '.join(str(row[-1]) for row in store._query('EXPLAIN QUERY PLAN ' + sql))
+            self.assertTrue('INDEX' in plan, plan)
+
+    def test__classStatisticsStore__queries__answerFromStreaks(self):
+        store = self.make_store()
+        for timestamp, length in [(1.0, 2), (2.0, 9), (3.0, 2), (4.0, 5)]:
+            store.append_streak(length, timestamp)
+        self.assertTrue(store.flush_streaks())
+
+        self.assertEqual(store.get_streak_rows(0, 2), [(9, 1), (5, 1)])
+        self.assertEqual(store.get_streak_rows(1, 10), [(5, 1), (2, 2)])
+        self.assertEqual(store.get_streak_length_count(), 3)
+        self.assertEqual(store.get_streak_counts(), {2: 2, 5: 1, 9: 1})
+        self.assertEqual(store.get_top_streaks(2), [(9, 1), (5, 1)])
+        self.assertEqual(store.count_streaks_since(3.0), 2)
+        self.assertEqual(store.count_streaks_at_least(5), 2)
+
+    def test__classStatisticsStore__queries__addBufferedStreaks(self):
+        store = self.make_store()
+        for timestamp, length in [(1.0, 2), (2.0, 9), (3.0, 2)]:
+            store.append_streak(length, timestamp)
+        self.assertTrue(store.flush_streaks())
+        for timestamp, length in [(4.0, 5), (5.0, 9), (6.0, 1)]:
+            store.append_streak(length, timestamp)
+
+        self.assertEqual(store.get_streak_rows(0, 2), [(9, 2), (5, 1)])
+        self.assertEqual(store.get_streak_rows(1, 10), [(5, 1), (2, 2), (1, 1)])
+        self.assertEqual(store.get_streak_length_count(), 4)
+        self.assertEqual(store.get_streak_counts(), {1: 1, 2: 2, 5: 1, 9: 2})
+        self.assertEqual(store.get_streak_count(), 6)
+        self.assertEqual(store.count_streaks_since(3.0), 4)
+        self.assertEqual(store.count_streaks_at_least(5), 3)
+
+    def test__classStatisticsStore__fnIterStreakChunks__readsInOrder__andStopsAtRowsWhichExisted(self):
+        store = self.make_store()
+        for i in range(5):
+            store.append_streak(i, float(i))
+        self.assertTrue(store.flush_streaks())
+
+        chunks = store.iter_streak_chunks(max_records=2)
+        timestamps, lengths = next(chunks)
+        store.append_streak(99, 99.0)
+        lengths.extend(length for _, chunk in chunks for length in chunk)
+        self.assertEqual(list(lengths), [0, 1, 2, 3, 4])
+        self.assertEqual(list(timestamps), [0.0, 1.0])
+
+    def test__classStatisticsStore__fnWriteSaveData__roundTrips(self):
+        rollups = StatisticsRollups(utc_offset_s=0)
+        rollups.record_streak(5.0, 2)
+        rollups.retire_streaks([7])
+
+        store = self.make_store()
+        self.assertTrue(store.is_empty())
+        store.import_save_data({'total_points': 4, 'total_play_time': 1.5, 'rollups': rollups}, [5.0], [2])
+        store.close()
+
+        reopened = self.make_store()
+        self.assertFalse(reopened.is_empty())
+        save_data = reopened.read_save_data()
+        self.assertEqual(save_data['total_points'], 4)
+        self.assertEqual(save_data['total_play_time'], 1.5)
+        self.assertEqual(save_data['rollups'].retired_streak_counts, {7: 1})
+        self.assertEqual(save_data['streak_counts'], {2: 1, 7: 1})
+        self.assertEqual(save_data['streak_counts_record_count'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,242 @@
+""" Reads game.data files without the game, and adds them up into one report.  Used by stats_cli.py.
+
+Nothing here may import pygame, directly or through another module, so it runs anywhere python does
+"""
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+import os
+import time
+
+from src.gembo.rollups import ERollupPeriod
+from src.gembo.save_format import read_save_file
+from src.gembo.streak_log import StreakLog, STREAK_LOG_HEADER, STREAK_LOG_RECORD
+
+
+# streaks closer together than this count as one stretch of play, when estimating the play time on each day
+ACTIVE_PLAY_GAP_S = 300
+
+# (shortest, longest) streak lengths shown on each line of the streak distribution, None means no upper limit
+STREAK_LENGTH_RANGES = [(0, 0), (1, 1), (2, 2), (3, 4), (5, 9), (10, 19), (20, 49), (50, None)]
+
+
+@dataclass
+class DayTotals:
+    """ the totals for one calendar day.  gems and points are only known for days played since rollups existed """
+    streak_count: int = 0
+    active_play_s: float = 0.0
+    gems: int = 0
+    points: int = 0
+
+
+@dataclass
+class StatsReport:
+    """ The totals across any number of save files.  One is built for each file, in a worker process, and then they
+    are merged, so it only holds counts, never the raw history
+    """
+    file_count: int = 0
+    failed_paths: list = field(default_factory=list)
+    total_play_time: float = 0.0
+    total_gems_collected: int = 0
+    total_points: int = 0
+    longest_streak: int = 0
+    streak_counts: Counter = field(default_factory=Counter)
+    # 'YYYY-MM-DD' -> DayTotals
+    days: dict = field(default_factory=dict)
+
+    def get_day(self, day: str) -> DayTotals:
+        if day not in self.days:
+            self.days[day] = DayTotals()
+        return self.days[day]
+
+    def merge(self, other: 'StatsReport'):
+        self.file_count += other.file_count
+        self.failed_paths.extend(other.failed_paths)
+        self.total_play_time += other.total_play_time
+        self.total_gems_collected += other.total_gems_collected
+        self.total_points += other.total_points
+        self.longest_streak = max(self.longest_streak, other.longest_streak)
+        self.streak_counts.update(other.streak_counts)
+        for day, other_totals in other.days.items():
+            totals = self.get_day(day)
+            totals.streak_count += other_totals.streak_count
+            totals.active_play_s += other_totals.active_play_s
+            totals.gems += other_totals.gems
+            totals.points += other_totals.points
+
+    def get_points_ratio(self) -> float:
+        """ points per gem collected """
+        return self.total_points / self.total_gems_collected if self.total_gems_collected else 0.0
+
+    def get_gems_per_hour(self) -> float:
+        return self.total_gems_collected / (self.total_play_time / 3600) if self.total_play_time > 0 else 0.0
+
+    def to_dict(self) -> dict:
+        """ returns the report as plain types, for json """
+        return {
+            'file_count': self.file_count,
+            'failed_paths': list(self.failed_paths),
+            'total_play_time': self.total_play_time,
+            'total_gems_collected': self.total_gems_collected,
+            'total_points': self.total_points,
+            'longest_streak': self.longest_streak,
+            'points_ratio': self.get_points_ratio(),
+            'gems_per_hour': self.get_gems_per_hour(),
+            'streak_counts': {str(length): count for length, count in sorted(self.streak_counts.items())},
+            'days': {day: vars(totals) for day, totals in sorted(self.days.items())},
+        }
+
+
+# reading --------------------------------------------------------------------------------------------------------------
+
+def find_save_files(paths: list[str]) -> list[str]:
+    """ returns every path which is a file, plus every *.data file under the paths which are directories """
+    save_paths = []
+    for path in paths:
+        if not os.path.isdir(path):
+            save_paths.append(path)
+            continue
+        for directory, directory_names, file_names in os.walk(path):
+            directory_names.sort()
+            save_paths.extend(os.path.join(directory, name) for name in sorted(file_names) if name.endswith('.data'))
+    return save_paths
+
+def get_streak_log_path(save_path: str) -> str:
+    """ the game keeps game.streaks next to game.data """
+    return os.path.splitext(save_path)[0] + '.streaks'
+
+def iter_streak_log_chunks(path: str, expected_log_id: int = None, max_records: int = 65536):
+    """ Yields (timestamps, lengths) arrays from a streak log, without opening it for writing the way StreakLog
+    does.  A log with a different id than the save file expects is stale, and yields nothing
+    """
+    if not os.path.isfile(path):
+        return
+    log_id = StreakLog(path).read_header()
+    if log_id is None or (expected_log_id is not None and log_id != expected_log_id):
+        return
+
+    with open(path, 'rb') as infile:
+        infile.seek(STREAK_LOG_HEADER.size)
+        while True:
+            data = infile.read(max_records * STREAK_LOG_RECORD.size)
+            # a half written record at the end is ignored, like the game does
+            data = data[:len(data) - len(data) % STREAK_LOG_RECORD.size]
+            if not data:
+                return
+            yield StreakLog.unpack_records(data)
+
+def iter_history_chunks(save_path: str, save_data: dict):
+    """ yields (timestamps, lengths) for the whole history of one save, oldest first, in chunks """
+    compact_history = save_data.get('compact_history')
+    log_path = get_streak_log_path(save_path)
+    if compact_history is not None:
+        yield from compact_history.iter_chunks()
+        yield from iter_streak_log_chunks(log_path, expected_log_id=compact_history.log_id)
+        return
+
+    # a json save, from an older version.  Its list was moved into the log, the first time the log was used
+    has_log_records = False
+    for timestamps, lengths in iter_streak_log_chunks(log_path):
+        has_log_records = True
+        yield timestamps, lengths
+    if not has_log_records:
+        history = save_data.get('player_streak_history') or []
+        yield [record[0] for record in history], [record[1] for record in history]
+
+def get_day(timestamp: float, utc_offset_s: int) -> str:
+    return time.strftime('%Y-%m-%d', time.gmtime(timestamp + utc_offset_s))
+
+def summarize_save_file(save_path: str) -> StatsReport:
+    """ Reads one save file, and its streak log, into a StatsReport.  This runs in a worker process, so it takes
+    and returns only things which can be pickled
+    """
+    report = StatsReport()
+    save_data = read_save_file(save_path)
+    if save_data is None:
+        report.failed_paths.append(save_path)
+        return report
+
+    report.file_count = 1
+    report.total_play_time = float(save_data.get('total_play_time', 0.0))
+    report.total_gems_collected = int(save_data.get('total_gems_collected', 0))
+    report.total_points = int(save_data.get('total_points', 0))
+    report.longest_streak = int(save_data.get('longest_streak', 0))
+
+    # days are local to the kiosk, if the save says where that was
+    rollups = save_data.get('rollups')
+    utc_offset_s = rollups.utc_offset_s if rollups is not None else 0
+
+    previous_timestamp = None
+    for timestamps, lengths in iter_history_chunks(save_path, save_data):
+        report.streak_counts.update(lengths)
+        for timestamp in timestamps:
+            totals = report.get_day(get_day(timestamp, utc_offset_s))
+            totals.streak_count += 1
+            if previous_timestamp is not None and 0 < timestamp - previous_timestamp <= ACTIVE_PLAY_GAP_S:
+                totals.active_play_s += timestamp - previous_timestamp
+            previous_timestamp = timestamp
+
+    if rollups is not None:
+        # streaks past the retention window are only in the rollups
+        report.streak_counts.update(rollups.retired_streak_counts)
+        for bucket in rollups.get_buckets(ERollupPeriod.DAY):
+            totals = report.get_day(get_day(bucket.start, utc_offset_s))
+            totals.streak_count = max(totals.streak_count, bucket.streak_count)
+            totals.gems += bucket.gems
+            totals.points += bucket.points
+    return report
+
+def build_report(paths: list[str], jobs: int = None) -> StatsReport:
+    """ Reads every save file under the paths, in a process pool when there's more than one
+
+    Args:
+        paths(list[str]) - save files, or directories of them
+        jobs(int) - the number of worker processes, defaults to the number of cpus.  1 reads them all in this process
+    """
+    save_paths = find_save_files(paths)
+    report = StatsReport()
+    if jobs == 1 or len(save_paths) < 2:
+        for file_report in map(summarize_save_file, save_paths):
+            report.merge(file_report)
+        return report
+
+    jobs = jobs or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        # a few files per task, so the workers aren't mostly waiting on the pool
+        chunksize = max(1, len(save_paths) // (jobs * 4))
+        for file_report in pool.map(summarize_save_file, save_paths, chunksize=chunksize):
+            report.merge(file_report)
+    return report
+
+
+# formatting -----------------------------------------------------------------------------------------------------------
+
+def format_report(report: StatsReport) -> list[str]:
+    """ returns the report as lines of text """
+    lines = [
+        f'files: {report.file_count}' + (f' ({len(report.failed_paths)} unreadable)' if report.failed_paths else ''),
+        f'play time: {report.total_play_time / 3600:.1f} h',
+        f'gems: {report.total_gems_collected}, {report.get_gems_per_hour():.1f} per hour',
+        f'points: {report.total_points}, {report.get_points_ratio():.2f} per gem',
+        f'longest streak: {report.longest_streak}',
+        '',
+        'streak distribution',
+    ]
+
+    streak_total = sum(report.streak_counts.values())
+    for shortest, longest in STREAK_LENGTH_RANGES:
+        count = sum(count for length, count in report.streak_counts.items()
+                    if length >= shortest and (longest is None or length <= longest))
+        label = (f'{shortest}+' if longest is None else str(shortest) if shortest == longest
+                 else f'{shortest}-{longest}')
+        share = count / streak_total * 100 if streak_total else 0.0
+        lines.append(f'{label:>8}{count:>10}{share:>8.1f}%')
+
+    lines += ['', 'per day', f'{"day":>10}{"streaks":>10}{"active min":>12}{"gems":>8}{"points":>8}']
+    for day, totals in sorted(report.days.items()):
+        lines.append(f'{day:>10}{totals.streak_count:>10}{totals.active_play_s / 60:>12.1f}'
+                     f'{totals.gems:>8}{totals.points:>8}')
+
+    for path in report.failed_paths:
+        lines.append(f'could not read: {path}')
+    return lines
@@ -0,0 +1,152 @@
+import unittest
+from src.test import AbstractTestBase as TestCase
+
+import json
+import os
+import subprocess
+import sys
+
+from src.gembo.rollups import StatisticsRollups
+from src.gembo.save_format import CompactHistory, encode_save_file
+from src.gembo.stats_report import (StatsReport, build_report, find_save_files, format_report, summarize_save_file,
+                                    ACTIVE_PLAY_GAP_S)
+from src.gembo.streak_log import StreakLog
+
+
+DAY_S = 86400
+
+
+class StatsReportTestCases(TestCase):
+
+    # test utilities ---------------------------------------------------------------------------------------------------
+
+    def setUp(self):
+        self.test_directory = 'deleteme_saves'
+        os.makedirs(os.path.join(self.test_directory, 'kiosk2'), exist_ok=True)
+
+    def tearDown(self):
+        for directory, _, file_names in os.walk(self.test_directory, topdown=False):
+            for name in file_names:
+                self.assertRemoveFile(os.path.join(directory, name))
+            os.rmdir(directory)
+
+    def write_binary_save(self, path, records, log_records=(), **scalars):
+        compact_history = CompactHistory().extend([t for t, _ in records], [n for _, n in records], log_id=7)
+        with open(path, 'wb') as outfile:
+            outfile.write(encode_save_file(dict(scalars, compact_history=compact_history)))
+
+        log = StreakLog(os.path.splitext(path)[0] + '.streaks')
+        log.open(expected_log_id=7)
+        log.extend(log_records)
+        log.close()
+
+    def test_framework_can_pass_a_test(self):
+        self.assertTrue(True)
+
+
+    # fn find_save_files -----------------------------------------------------------------------------------------------
+
+    def test__fnFindSaveFiles__searchesDirectories__forDataFiles(self):
+        paths = [os.path.join(self.test_directory, 'game.data'),
+                 os.path.join(self.test_directory, 'game.data.backup'),
+                 os.path.join(self.test_directory, 'kiosk2', 'game.data')]
+        for path in paths:
+            self.assertCreateFile(path, '{}')
+        self.assertEqual(find_save_files([self.test_directory, 'other.data']),
+                         [paths[0], paths[2], 'other.data'])
+
+
+    # fn summarize_save_file -------------------------------------------------------------------------------------------
+
+    def test__fnSummarizeSaveFile__readsCompactHistory__andStreakLog(self):
+        path = os.path.join(self.test_directory, 'game.data')
+        self.write_binary_save(path, [(DAY_S + 10.0, 2), (DAY_S + 70.0, 5)], [(DAY_S + 100.0, 5)],
+                               total_gems_collected=40, total_points=10, total_play_time=7200.0, longest_streak=5)
+
+        report = summarize_save_file(path)
+        self.assertEqual(report.file_count, 1)
+        self.assertEqual(report.streak_counts, {2: 1, 5: 2})
+        self.assertEqual(report.get_gems_per_hour(), 20.0)
+        self.assertEqual(report.get_points_ratio(), 0.25)
+        self.assertEqual(report.days['1970-01-02'].streak_count, 3)
+        self.assertEqual(report.days['1970-01-02'].active_play_s, 90.0)
+
+    def test__fnSummarizeSaveFile__skipsGaps__whenEstimatingPlayTime(self):
+        path = os.path.join(self.test_directory, 'game.data')
+        self.write_binary_save(path, [(0.0, 1), (ACTIVE_PLAY_GAP_S + 1.0, 1)])
+        self.assertEqual(summarize_save_file(path).days['1970-01-01'].active_play_s, 0.0)
+
+    def test__fnSummarizeSaveFile__ignoresStaleLog(self):
+        path = os.path.join(self.test_directory, 'game.data')
+        self.write_binary_save(path, [(1.0, 2)])
+        log = StreakLog(os.path.join(self.test_directory, 'game.streaks'))
+        log.open(expected_log_id=8)
+        log.append(9, 2.0)
+        log.close()
+        self.assertEqual(summarize_save_file(path).streak_counts, {2: 1})
+
+    def test__fnSummarizeSaveFile__readsJsonSaves(self):
+        path = os.path.join(self.test_directory, 'game.data')
+        self.assertCreateFile(path, json.dumps({'total_points': 3, 'player_streak_history': [[1.0, 4], [2.0, 4]]}))
+        report = summarize_save_file(path)
+        self.assertEqual(report.total_points, 3)
+        self.assertEqual(report.streak_counts, {4: 2})
+
+    def test__fnSummarizeSaveFile__addsRollups(self):
+        rollups = StatisticsRollups(utc_offset_s=0)
+        rollups.record_gem(DAY_S * 3)
+        rollups.retire_streaks([6])
+        path = os.path.join(self.test_directory, 'game.data')
+        with open(path, 'wb') as outfile:
+            outfile.write(encode_save_file({'rollups': rollups}))
+
+        report = summarize_save_file(path)
+        self.assertEqual(report.streak_counts, {6: 1})
+        self.assertEqual(report.days['1970-01-04'].gems, 1)
+
+    def test__fnSummarizeSaveFile__reportsUnreadableFiles(self):
+        path = os.path.join(self.test_directory, 'game.data')
+        self.assertCreateFile(path, 'not a save')
+        report = summarize_save_file(path)
+        self.assertEqual(report.file_count, 0)
+        self.assertEqual(report.failed_paths, [path])
+
+
+    # fn build_report --------------------------------------------------------------------------------------------------
+
+    def test__fnBuildReport__mergesFiles__inAProcessPool(self):
+        self.write_binary_save(os.path.join(self.test_directory, 'game.data'), [(1.0, 2)], total_points=1)
+        self.write_binary_save(os.path.join(self.test_directory, 'kiosk2', 'game.data'), [(2.0, 2), (3.0, 3)],
+                               total_points=2, longest_streak=3)
+
+        report = build_report([self.test_directory], jobs=2)
+        self.assertEqual(report.file_count, 2)
+        self.assertEqual(report.total_points, 3)
+        self.assertEqual(report.longest_streak, 3)
+        self.assertEqual(report.streak_counts, {2: 2, 3: 1})
+        self.assertEqual(report.days['1970-01-01'].streak_count, 3)
+        self.assertEqual(report.to_dict(), build_report([self.test_directory], jobs=1).to_dict())
+
+    def test__fnFormatReport__listsDistribution__andDays(self):
+        report = StatsReport(file_count=1)
+        report.streak_counts.update([1, 1, 60])
+        report.get_day('2025-02-17').streak_count = 3
+        lines = format_report(report)
+        self.assertTrue(any(line.split() == ['1', '2', '66.7%'] for line in lines))
+        self.assertTrue(any(line.split() == ['50+', '1', '33.3%'] for line in lines))
+        self.assertTrue(any(line.startswith('2025-02-17') for line in lines))
+
+
+    # stats_cli.py -----------------------------------------------------------------------------------------------------
+
+    def test__statsCli__neverImportsPygame(self):
+        code = ('import sys, runpy; sys.argv = ["stats_cli.py", "--help"]\n'
+                'try:\n    runpy.run_path("stats_cli.py", run_name="__main__")\n'
+                'except SystemExit:\n    pass\n'
+                'assert "pygame" not in sys.modules')
+        result = subprocess.run([sys.executable, '-c', code], capture_output=True)
+        self.assertEqual(result.returncode, 0, result.stderr)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,99 @@
+import time
+
+# numpy is optional.  Without it, StatisticsData.get_streak_analytics returns None, and the stats menu only shows
+# the streak counts
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+SECONDS_PER_DAY = 86400
+SECONDS_PER_HOUR = 3600
+
+
+def is_available() -> bool:
+    return np is not None
+
+
+class StreakAnalytics:
+    """ The StreakAnalytics holds the streak history as two numpy columns, and answers questions about it with
+    vectorized calls, instead of python loops.  It is a snapshot, it doesn't change when new streaks happen, so
+    build a new one (see StatisticsData.get_streak_analytics) when the history grows.
+
+    Days and hours are in local time, using the current utc offset
+    """
+    def __init__(self, timestamps, lengths, utc_offset_s: int = None):
+        assert is_available()
+
+        # copied, because a numpy view would stop the source arrays from growing
+        self.timestamps = np.array(timestamps, dtype=np.float64)
+        self.lengths = np.array(lengths, dtype=np.int64)
+        self.utc_offset_s = time.localtime().tm_gmtoff if utc_offset_s is None else utc_offset_s
+
+    def __len__(self):
+        return len(self.lengths)
+
+    def get_streak_counts(self):
+        """ returns an array, where index is the streak length, and value is the number of times it happened """
+        return np.bincount(self.lengths)
+
+    def get_longest_streak(self) -> int:
+        return int(self.lengths.max()) if len(self) else 0
+
+    def get_percentiles(self, percentiles=(50, 90, 99)):
+        """ returns the streak length at each percentile, or zeros for an empty history """
+        if not len(self):
+            return np.zeros(len(percentiles))
+        return np.percentile(self.lengths, percentiles)
+
+    def get_rolling_average(self, window: int):
+        """ returns the average length of each run of `window` consecutive streaks, oldest first """
+        if window <= 0 or len(self) < window:
+            return np.zeros(0)
+        running_total = np.cumsum(self.lengths, dtype=np.float64)
+        running_total[window:] = running_total[window:] - running_total[:-window]
+        return running_total[window - 1:] / window
+
+    def get_per_day(self):
+        """ Groups the streaks by local calendar day
+
+        Returns:
+            days(array) - the unix time of the start of each day which had streaks (utc), ascending
+            counts(array) - the number of streaks on each day
+            totals(array) - the sum of the streak lengths on each day
+            longest(array) - the longest streak on each day
+        """
+        return self._group_by(np.floor_divide(self.timestamps + self.utc_offset_s, SECONDS_PER_DAY).astype(np.int64),
+                              SECONDS_PER_DAY)
+
+    def get_per_hour_of_day(self):
+        """ returns (counts, average lengths), each with 24 entries, one for each hour of the (local) day """
+        hours = (np.floor_divide(self.timestamps + self.utc_offset_s, SECONDS_PER_HOUR) % 24).astype(np.int64)
+        counts = np.bincount(hours, minlength=24)
+        totals = np.bincount(hours, weights=self.lengths, minlength=24)
+        averages = np.divide(totals, counts, out=np.zeros(24), where=counts > 0)
+        return counts, averages
+
+    def get_best_day(self):
+        """ returns (day start, streak count) for the day with the most streaks, or None for an empty history """
+        days, counts, _, _ = self.get_per_day()
+        if not len(days):
+            return None
+        best = int(np.argmax(counts))
+        return float(days[best]), int(counts[best])
+
+    def _group_by(self, buckets, bucket_size_s: int):
+        if not len(self):
+            empty = np.zeros(0, dtype=np.int64)
+            return empty.astype(np.float64), empty, empty, empty
+
+        # the history is almost always in time order already, but a clock change can break that
+        order = np.argsort(buckets, kind='stable')
+        sorted_buckets = buckets[order]
+        sorted_lengths = self.lengths[order]
+
+        unique_buckets, starts, counts = np.unique(sorted_buckets, return_index=True, return_counts=True)
+        totals = np.add.reduceat(sorted_lengths, starts)
+        longest = np.maximum.reduceat(sorted_lengths, starts)
+        return unique_buckets * bucket_size_s - self.utc_offset_s, counts, totals, longest
@@ -0,0 +1,87 @@
+import unittest
+from src.test import AbstractTestBase as TestCase
+
+from array import array
+
+from src.gembo.streak_analytics import StreakAnalytics, is_available, SECONDS_PER_DAY, SECONDS_PER_HOUR
+
+
+@unittest.skipUnless(is_available(), 'numpy is not installed')
+class StreakAnalyticsTestCases(TestCase):
+
+    # test utilities ---------------------------------------------------------------------------------------------------
+
+    @staticmethod
+    def make_analytics(records):
+        timestamps = array('d', [timestamp for timestamp, _ in records])
+        lengths = array('I', [length for _, length in records])
+        return StreakAnalytics(timestamps, lengths, utc_offset_s=0)
+
+    def test_framework_can_pass_a_test(self):
+        self.assertTrue(True)
+
+
+    # class StreakAnalytics --------------------------------------------------------------------------------------------
+
+    def test__classStreakAnalytics__exists(self):
+        self.assertIsNotNone(StreakAnalytics)
+
+    def test__classStreakAnalytics__copiesColumns__soSourceCanStillGrow(self):
+        timestamps = array('d', [1.0])
+        lengths = array('I', [2])
+        analytics = StreakAnalytics(timestamps, lengths, utc_offset_s=0)
+        lengths.append(3)
+        self.assertEqual(len(analytics), 1)
+
+    def test__classStreakAnalytics__fnGetStreakCounts__countsEachLength(self):
+        analytics = self.make_analytics([(0.0, 1), (1.0, 3), (2.0, 3)])
+        self.assertEqual(list(analytics.get_streak_counts()), [0, 1, 0, 2])
+
+    def test__classStreakAnalytics__fnGetLongestStreak__returnsZero__forEmptyHistory(self):
+        self.assertEqual(self.make_analytics([]).get_longest_streak(), 0)
+        self.assertEqual(self.make_analytics([(0.0, 4), (1.0, 9)]).get_longest_streak(), 9)
+
+    def test__classStreakAnalytics__fnGetPercentiles__returnsLengthAtEachPercentile(self):
+        analytics = self.make_analytics([(float(i), i) for i in range(101)])
+        self.assertEqual(list(analytics.get_percentiles((50, 90))), [50, 90])
+
+    def test__classStreakAnalytics__fnGetRollingAverage__averagesEachWindow(self):
+        analytics = self.make_analytics([(0.0, 1), (1.0, 3), (2.0, 5), (3.0, 7)])
+        self.assertEqual(list(analytics.get_rolling_average(2)), [2.0, 4.0, 6.0])
+        self.assertEqual(len(analytics.get_rolling_average(5)), 0)
+
+    def test__classStreakAnalytics__fnGetPerDay__groupsByDay(self):
+        analytics = self.make_analytics([
+            (10.0, 2),
+            (20.0, 6),
+            (SECONDS_PER_DAY + 5.0, 1),
+        ])
+        days, counts, totals, longest = analytics.get_per_day()
+        self.assertEqual(list(days), [0, SECONDS_PER_DAY])
+        self.assertEqual(list(counts), [2, 1])
+        self.assertEqual(list(totals), [8, 1])
+        self.assertEqual(list(longest), [6, 1])
+
+    def test__classStreakAnalytics__fnGetPerDay__handlesOutOfOrderTimestamps(self):
+        analytics = self.make_analytics([(SECONDS_PER_DAY + 1.0, 1), (1.0, 5), (2.0, 3)])
+        days, counts, _, longest = analytics.get_per_day()
+        self.assertEqual(list(counts), [2, 1])
+        self.assertEqual(list(longest), [5, 1])
+
+    def test__classStreakAnalytics__fnGetPerHourOfDay__returns24Hours(self):
+        analytics = self.make_analytics([(0.0, 2), (60.0, 4), (3 * SECONDS_PER_HOUR, 1)])
+        counts, averages = analytics.get_per_hour_of_day()
+        self.assertEqual(len(counts), 24)
+        self.assertEqual(counts[0], 2)
+        self.assertEqual(averages[0], 3.0)
+        self.assertEqual(counts[3], 1)
+        self.assertEqual(averages[1], 0.0)
+
+    def test__classStreakAnalytics__fnGetBestDay__returnsDayWithMostStreaks(self):
+        analytics = self.make_analytics([(1.0, 1), (SECONDS_PER_DAY + 1.0, 1), (SECONDS_PER_DAY + 2.0, 1)])
+        self.assertEqual(analytics.get_best_day(), (SECONDS_PER_DAY, 2))
+        self.assertIsNone(self.make_analytics([]).get_best_day())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,300 @@
+from array import array
+import os
+import struct
+import sys
+
+
+# header: magic, version, record size, log id
+STREAK_LOG_MAGIC = b'GSTK'
+STREAK_LOG_VERSION = 1
+STREAK_LOG_HEADER = struct.Struct('<4sHHQ')
+
+# record: timestamp (float64), streak length (uint32)
+STREAK_LOG_RECORD = struct.Struct('<dI')
+
+
+class StreakLog:
+    """ The StreakLog stores the player's streak history as an append-only binary file, made of fixed size records.
+    Ending a streak writes one record to the end of the file, so the cost doesn't grow with the history.  Reading
+    the log splits the records into two compact arrays, timestamps and lengths, without creating a python tuple per
+    record.
+
+    The log can be opened lazily, which only checks the header, so new streaks can be appended right away.  The
+    records already on disk are then read in chunks (see load_chunk), or all at once, the first time the timestamps
+    or lengths are needed.
+
+    A record which was only half written (ie: the game crashed mid-write) is ignored, and cut off before the next
+    append.  The log can be iterated, and yields (timestamp, length), like the list it replaces.
+
+    Older records can be compacted into the save file (see save_format.CompactHistory).  Those come first, and are
+    handed to the log with set_compacted_records.  After compacting, the file is rotated, which empties it, and
+    gives it a new log id.  The save file remembers that id, so a log which wasn't rotated (ie: the game crashed
+    between writing the save file and rotating the log) is known to be stale, and its records aren't counted twice.
+    """
+    def __init__(self, path: str = None):
+        self.path = path
+
+        # identifies this file, see rotate
+        self.log_id: int = 0
+
+        # records which were compacted into the save file, and haven't been decoded yet
+        self.compacted_record_count: int = 0
+        self._compacted_unread_count: int = 0
+        self._compacted_chunks = None
+
+        # every record, once the log is loaded.  Until then, only the records appended since it was opened
+        self._timestamps = array('d')
+        self._lengths = array('I')
+
+        # records read from disk so far, while loading in chunks
+        self._loaded_timestamps = array('d')
+        self._loaded_lengths = array('I')
+
+        # the byte range of records which are on disk, but haven't been read yet
+        self._unread_start: int = 0
+        self._unread_end: int = 0
+
+        # unbuffered, so every append is exactly one write
+        self._file = None
+
+    def __len__(self):
+        unread_count = (self._unread_end - self._unread_start) // STREAK_LOG_RECORD.size
+        return self._compacted_unread_count + unread_count + len(self._loaded_lengths) + len(self._lengths)
+
+    def __iter__(self):
+        return zip(self.timestamps, self.lengths)
+
+    @property
+    def timestamps(self) -> array:
+        self.load_all()
+        return self._timestamps
+
+    @property
+    def lengths(self) -> array:
+        self.load_all()
+        return self._lengths
+
+    def is_open(self) -> bool:
+        return self._file is not None
+
+    def is_loaded(self) -> bool:
+        return self._compacted_unread_count == 0 and self._unread_start >= self._unread_end
+
+    def get_log_record_count(self) -> int:
+        """ returns the number of records which are only in this file, and not compacted yet """
+        return len(self) - self.compacted_record_count
+
+    @staticmethod
+    def new_log_id() -> int:
+        # zero is CompactHistory's default log id, which no log should match
+        return int.from_bytes(os.urandom(8), 'little') or 1
+
+    def set_compacted_records(self, record_count: int, chunks):
+        """ Tells the log about the records which were compacted into the save file.  They come before every record
+        in this file, and are decoded as the log loads.  Call this before open.
+
+        Args:
+            record_count(int) - the number of compacted records
+            chunks(iterator) - yields (timestamps, lengths) arrays, see CompactHistory.iter_chunks
+        """
+        self.compacted_record_count = record_count
+        self._compacted_unread_count = record_count
+        self._compacted_chunks = chunks
+
+    @staticmethod
+    def unpack_records(data) -> tuple[array, array]:
+        """ Splits a block of packed records into (timestamps, lengths)
+
+        The records are interleaved, so each byte of a column is gathered with one strided slice, which runs in C.
+        That is 12 slice operations, no matter how many records there are.
+
+        Args:
+            data(bytes) - whole records only, no header
+
+        Returns:
+            timestamps(array('d')), lengths(array('I'))
+        """
+        record_size = STREAK_LOG_RECORD.size
+        count = len(data) // record_size
+
+        timestamp_bytes = bytearray(count * 8)
+        for i in range(8):
+            timestamp_bytes[i::8] = data[i::record_size]
+
+        length_bytes = bytearray(count * 4)
+        for i in range(4):
+            length_bytes[i::4] = data[8 + i::record_size]
+
+        timestamps = array('d', timestamp_bytes)
+        lengths = array('I', length_bytes)
+
+        # the file is little-endian
+        if sys.byteorder == 'big':
+            timestamps.byteswap()
+            lengths.byteswap()
+
+        return timestamps, lengths
+
+    def read_header(self):
+        """ returns the log id, or None, if the file is not a streak log we understand """
+        with open(self.path, 'rb') as infile:
+            header = infile.read(STREAK_LOG_HEADER.size)
+
+        if len(header) < STREAK_LOG_HEADER.size:
+            return None
+
+        magic, version, record_size, log_id = STREAK_LOG_HEADER.unpack(header)
+        if magic != STREAK_LOG_MAGIC or version != STREAK_LOG_VERSION or record_size != STREAK_LOG_RECORD.size:
+            return None
+        return log_id
+
+    def open(self, lazy: bool = False, expected_log_id: int = None) -> bool:
+        """ Opens the file for appending, and reads every record in it, unless lazy is set.  A missing file is
+        created.  Records which were appended before the log was opened are kept, and written after the ones on disk.
+
+        Args:
+            lazy(bool) - if True, only the header is read now, and the records are read later
+            expected_log_id(int) - the log id the save file expects.  A file with any other id is stale, and emptied
+
+        Returns:
+            was_opened(bool) - False, if there is no path, or the file is not a streak log
+        """
+        if self.path is None or not self.path or self.is_open():
+            return False
+
+        file_size = os.path.getsize(self.path) if os.path.exists(self.path) else 0
+        if file_size:
+            log_id = self.read_header()
+            if log_id is None:
+                # don't append to something we don't understand
+                print(f'Not a streak log, or an unknown version, path="{self.path}"')
+                return False
+            self.log_id = log_id
+
+        self._file = open(self.path, 'r+b' if file_size else 'w+b', buffering=0)
+
+        if not file_size or (expected_log_id is not None and expected_log_id != self.log_id):
+            if file_size:
+                print(f'Streak log is stale, its records are already in the save file, path="{self.path}"')
+            self.write_empty_file(self.new_log_id() if expected_log_id is None else expected_log_id)
+            whole_records_size = 0
+        else:
+            body_size = file_size - STREAK_LOG_HEADER.size
+            whole_records_size = body_size - (body_size % STREAK_LOG_RECORD.size)
+            # drops a partial record, left by an interrupted write
+            self._file.truncate(STREAK_LOG_HEADER.size + whole_records_size)
+            self._file.seek(0, os.SEEK_END)
+
+        # anything appended before opening is already in memory, it only needs to be written
+        self._unread_start = STREAK_LOG_HEADER.size
+        self._unread_end = STREAK_LOG_HEADER.size + whole_records_size
+        self._file.write(self.pack_records(zip(self._timestamps, self._lengths)))
+
+        if not lazy:
+            self.load_all()
+        return True
+
+    def load_chunk(self, max_records: int = 65536) -> bool:
+        """ Reads up to max_records of the records which are still on disk, compacted ones first
+
+        Returns:
+            is_loaded(bool) - True, once every record has been read
+        """
+        if self.is_loaded():
+            return True
+
+        if self._compacted_unread_count > 0:
+            timestamps, lengths = next(self._compacted_chunks, (array('d'), array('I')))
+            self._compacted_unread_count -= len(lengths)
+            if len(lengths) == 0:
+                # the save file had fewer records than it claimed
+                self._compacted_unread_count = 0
+        else:
+            chunk_size = min(max_records * STREAK_LOG_RECORD.size, self._unread_end - self._unread_start)
+            with open(self.path, 'rb') as infile:
+                infile.seek(self._unread_start)
+                data = infile.read(chunk_size)
+
+            timestamps, lengths = self.unpack_records(data)
+            self._unread_start += len(data)
+
+            if len(data) < chunk_size:
+                # the file shrank underneath us, so there's nothing more to read
+                self._unread_start = self._unread_end
+
+        self._loaded_timestamps.extend(timestamps)
+        self._loaded_lengths.extend(lengths)
+
+        if self.is_loaded():
+            # the records from disk come before the ones appended since opening
+            self._loaded_timestamps.extend(self._timestamps)
+            self._loaded_lengths.extend(self._lengths)
+            self._timestamps, self._loaded_timestamps = self._loaded_timestamps, array('d')
+            self._lengths, self._loaded_lengths = self._loaded_lengths, array('I')
+        return self.is_loaded()
+
+    def load_all(self):
+        """ reads every record which is still on disk """
+        while not self.load_chunk(max_records=len(self)):
+            pass
+
+    def rotate(self, log_id: int):
+        """ Empties the file, and gives it a new id.  This is called after every record in it was compacted into the
+        save file, so the records stay in memory, and now count as compacted
+        """
+        self.load_all()
+        self.compacted_record_count = len(self)
+        self.write_empty_file(log_id)
+
+    def drop_compacted_records(self, record_count: int):
+        """ forgets the oldest records.  Only compacted records can be dropped, the log file is never rewritten """
+        self.load_all()
+        record_count = min(record_count, self.compacted_record_count)
+        del self._timestamps[:record_count]
+        del self._lengths[:record_count]
+        self.compacted_record_count -= record_count
+
+    def write_empty_file(self, log_id: int):
+        """ replaces the open file with just a header, for this log id """
+        self.log_id = log_id
+        if self._file is not None:
+            # emptied first, so a crash in between leaves an empty file, which is treated like a missing one
+            self._file.truncate(0)
+            self._file.seek(0)
+            self._file.write(STREAK_LOG_HEADER.pack(STREAK_LOG_MAGIC, STREAK_LOG_VERSION, STREAK_LOG_RECORD.size,
+                                                    self.log_id))
+
+    def sync(self):
+        """ makes sure every appended record is on disk, not just handed to the OS """
+        log_file = self._file
+        try:
+            if log_file is not None:
+                os.fsync(log_file.fileno())
+        except (OSError, ValueError):
+            # the log was closed while syncing, which is fine, closing flushes it anyway
+            pass
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    @staticmethod
+    def pack_records(records) -> bytes:
+        return b''.join(STREAK_LOG_RECORD.pack(timestamp, length) for timestamp, length in records)
+
+    def append(self, length: int, timestamp: float):
+        """ adds one streak, and writes it to the end of the file, if the log is open """
+        self._timestamps.append(timestamp)
+        self._lengths.append(length)
+        if self._file is not None:
+            self._file.write(STREAK_LOG_RECORD.pack(timestamp, length))
+
+    def extend(self, records):
+        """ adds many (timestamp, length) records, with a single write """
+        records = [(timestamp, length) for timestamp, length in records]
+        for timestamp, length in records:
+            self._timestamps.append(timestamp)
+            self._lengths.append(length)
+        if self._file is not None and records:
+            self._file.write(self.pack_records(records))
@@ -0,0 +1,248 @@
+import unittest
+from src.test import AbstractTestBase as TestCase
+
+import os
+
+from array import array
+
+from src.gembo.streak_log import StreakLog, STREAK_LOG_HEADER, STREAK_LOG_RECORD
+
+
+class StreakLogTestCases(TestCase):
+
+    # test utilities ---------------------------------------------------------------------------------------------------
+
+    def setUp(self):
+        self.test_path = 'deleteme.streaks'
+
+    def tearDown(self):
+        if os.path.exists(self.test_path):
+            self.assertRemoveFile(self.test_path)
+
+    def test_framework_can_pass_a_test(self):
+        self.assertTrue(True)
+
+
+    # class StreakLog --------------------------------------------------------------------------------------------------
+
+    def test__classStreakLog__exists(self):
+        self.assertIsNotNone(StreakLog)
+
+    def test__classStreakLog__constructsEmpty__withoutTouchingDisk(self):
+        log = StreakLog(self.test_path)
+        self.assertEqual(len(log), 0)
+        self.assertFalse(log.is_open())
+        self.assertFalse(os.path.exists(self.test_path))
+
+    def test__classStreakLog__iteratesTimestampLengthPairs(self):
+        log = StreakLog()
+        log.append(3, 10.0)
+        log.append(5, 11.0)
+        self.assertEqual(list(log), [(10.0, 3), (11.0, 5)])
+
+    # fn open ----------------------------------------------------------------------------------------------------------
+
+    def test__classStreakLog__fnOpen__returnsFalse__forNoPath(self):
+        self.assertFalse(StreakLog().open())
+
+    def test__classStreakLog__fnOpen__createsFileWithHeader(self):
+        log = StreakLog(self.test_path)
+        self.assertTrue(log.open())
+        log.close()
+        self.assertEqual(os.path.getsize(self.test_path), STREAK_LOG_HEADER.size)
+
+    def test__classStreakLog__fnOpen__returnsFalse__forUnknownFile(self):
+        self.assertCreateFile(self.test_path, '{"not": "a streak log"}')
+        log = StreakLog(self.test_path)
+        self.assertFalse(log.open())
+        self.assertFalse(log.is_open())
+
+    def test__classStreakLog__fnOpen__readsRecordsWrittenBefore(self):
+        log = StreakLog(self.test_path)
+        log.open()
+        for i in range(100):
+            log.append(i, 1000.0 + i)
+        log.close()
+
+        reopened = StreakLog(self.test_path)
+        self.assertTrue(reopened.open())
+        reopened.close()
+        self.assertEqual(list(reopened), [(1000.0 + i, i) for i in range(100)])
+
+    def test__classStreakLog__fnOpen__dropsPartialRecord(self):
+        log = StreakLog(self.test_path)
+        log.open()
+        log.append(7, 1.5)
+        log.close()
+        with open(self.test_path, 'ab') as outfile:
+            outfile.write(b'\x01\x02\x03')
+
+        reopened = StreakLog(self.test_path)
+        reopened.open()
+        reopened.append(8, 2.5)
+        reopened.close()
+
+        self.assertEqual(os.path.getsize(self.test_path), STREAK_LOG_HEADER.size + 2 * STREAK_LOG_RECORD.size)
+        final = StreakLog(self.test_path)
+        final.open()
+        final.close()
+        self.assertEqual(list(final), [(1.5, 7), (2.5, 8)])
+
+    def test__classStreakLog__fnOpen__keepsRecordsAppendedBeforeOpen(self):
+        log = StreakLog(self.test_path)
+        log.append(4, 3.0)
+        log.open()
+        log.close()
+
+        reopened = StreakLog(self.test_path)
+        reopened.open()
+        reopened.close()
+        self.assertEqual(list(reopened), [(3.0, 4)])
+
+    def test__classStreakLog__fnOpen__readsNothing__whenLazy(self):
+        log = StreakLog(self.test_path)
+        log.open()
+        log.extend([(float(i), i) for i in range(10)])
+        log.close()
+
+        lazy = StreakLog(self.test_path)
+        self.assertTrue(lazy.open(lazy=True))
+        self.assertFalse(lazy.is_loaded())
+        self.assertEqual(len(lazy), 10)
+        lazy.close()
+
+    def test__classStreakLog__fnOpen__returnsFalse__forNewerVersion(self):
+        with open(self.test_path, 'wb') as outfile:
+            outfile.write(STREAK_LOG_HEADER.pack(b'GSTK', 2, STREAK_LOG_RECORD.size, 1))
+            outfile.write(STREAK_LOG_RECORD.pack(1.0, 3))
+
+        log = StreakLog(self.test_path)
+        self.assertFalse(log.open())
+        self.assertFalse(log.is_open())
+
+    def test__classStreakLog__fnOpen__emptiesStaleLog__forOtherLogId(self):
+        log = StreakLog(self.test_path)
+        log.open()
+        log.append(3, 1.0)
+        log.close()
+
+        reopened = StreakLog(self.test_path)
+        self.assertTrue(reopened.open(expected_log_id=log.log_id + 1))
+        reopened.close()
+        self.assertEqual(len(reopened), 0)
+        self.assertEqual(reopened.log_id, log.log_id + 1)
+        self.assertEqual(os.path.getsize(self.test_path), STREAK_LOG_HEADER.size)
+
+    # fn set_compacted_records -----------------------------------------------------------------------------------------
+
+    def test__classStreakLog__fnSetCompactedRecords__comeBeforeLogRecords(self):
+        log = StreakLog(self.test_path)
+        log.open()
+        log.append(3, 3.0)
+        log.close()
+
+        chunks = iter([(array('d', [1.0]), array('I', [1])), (array('d', [2.0]), array('I', [2]))])
+        reopened = StreakLog(self.test_path)
+        reopened.set_compacted_records(2, chunks)
+        reopened.open(lazy=True, expected_log_id=log.log_id)
+        self.assertEqual(len(reopened), 3)
+        self.assertEqual(reopened.get_log_record_count(), 1)
+        self.assertEqual(list(reopened), [(1.0, 1), (2.0, 2), (3.0, 3)])
+        reopened.close()
+
+    # fn rotate --------------------------------------------------------------------------------------------------------
+
+    def test__classStreakLog__fnRotate__emptiesFile__andKeepsRecordsInMemory(self):
+        log = StreakLog(self.test_path)
+        log.open()
+        log.extend([(1.0, 1), (2.0, 2)])
+        log.rotate(1234)
+        log.append(3, 3.0)
+        log.close()
+
+        self.assertEqual(list(log.lengths), [1, 2, 3])
+        self.assertEqual(log.get_log_record_count(), 1)
+        self.assertEqual(os.path.getsize(self.test_path), STREAK_LOG_HEADER.size + STREAK_LOG_RECORD.size)
+
+        reopened = StreakLog(self.test_path)
+        reopened.open(expected_log_id=1234)
+        reopened.close()
+        self.assertEqual(list(reopened), [(3.0, 3)])
+
+    # fn load_chunk ----------------------------------------------------------------------------------------------------
+
+    def test__classStreakLog__fnLoadChunk__readsInChunks__andKeepsNewAppendsLast(self):
+        log = StreakLog(self.test_path)
+        log.open()
+        log.extend([(float(i), i) for i in range(10)])
+        log.close()
+
+        lazy = StreakLog(self.test_path)
+        lazy.open(lazy=True)
+        lazy.append(99, 99.0)
+
+        self.assertFalse(lazy.load_chunk(max_records=4))
+        self.assertFalse(lazy.load_chunk(max_records=4))
+        self.assertEqual(len(lazy), 11)
+        self.assertTrue(lazy.load_chunk(max_records=4))
+        self.assertEqual(list(lazy.lengths), list(range(10)) + [99])
+        lazy.close()
+
+        reopened = StreakLog(self.test_path)
+        reopened.open()
+        reopened.close()
+        self.assertEqual(list(reopened.lengths), list(range(10)) + [99])
+
+    def test__classStreakLog__propertyLengths__loadsEverything__whenLazy(self):
+        log = StreakLog(self.test_path)
+        log.open()
+        log.extend([(1.0, 1), (2.0, 2)])
+        log.close()
+
+        lazy = StreakLog(self.test_path)
+        lazy.open(lazy=True)
+        self.assertEqual(list(lazy.lengths), [1, 2])
+        self.assertTrue(lazy.is_loaded())
+        lazy.close()
+
+    def test__classStreakLog__fnDropCompactedRecords__dropsOnlyCompactedRecords(self):
+        log = StreakLog(self.test_path)
+        log.open()
+        log.extend([(1.0, 1), (2.0, 2), (3.0, 3)])
+        log.rotate(StreakLog.new_log_id())
+        log.append(4, 4.0)
+
+        log.drop_compacted_records(10)
+        self.assertEqual(list(log), [(4.0, 4)])
+        self.assertEqual(log.compacted_record_count, 0)
+        self.assertEqual(log.get_log_record_count(), 1)
+        log.close()
+
+    # fn append --------------------------------------------------------------------------------------------------------
+
+    def test__classStreakLog__fnAppend__writesOneRecord(self):
+        log = StreakLog(self.test_path)
+        log.open()
+        log.append(2, 5.0)
+        self.assertEqual(os.path.getsize(self.test_path), STREAK_LOG_HEADER.size + STREAK_LOG_RECORD.size)
+        log.close()
+
+    # fn extend --------------------------------------------------------------------------------------------------------
+
+    def test__classStreakLog__fnExtend__acceptsLegacyListOfLists(self):
+        log = StreakLog()
+        log.extend([[1.0, 1], [2.0, 2]])
+        self.assertEqual(list(log.lengths), [1, 2])
+        self.assertEqual(list(log.timestamps), [1.0, 2.0])
+
+    # fn unpack_records ------------------------------------------------------------------------------------------------
+
+    def test__classStreakLog__fnUnpackRecords__splitsColumns(self):
+        data = b''.join(STREAK_LOG_RECORD.pack(t, n) for t, n in [(0.25, 1), (1e9, 4_000_000_000)])
+        timestamps, lengths = StreakLog.unpack_records(data)
+        self.assertEqual(list(timestamps), [0.25, 1e9])
+        self.assertEqual(list(lengths), [1, 4_000_000_000])
+
+
+if __name__ == '__main__':
+    unittest.main()
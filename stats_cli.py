@@ -0,0 +1,31 @@
+""" Prints a report across one or many game.data files, without starting the game
+
+    python stats_cli.py game.data
+    python stats_cli.py saves/ [--jobs 8] [--json]
+
+Directories are searched for *.data files, and read in parallel.  game.streaks is read too, if it's next to the save
+"""
+import argparse
+import json
+import sys
+
+from src.gembo.stats_report import build_report, format_report
+
+
+def main(argv: list[str] = None) -> int:
+    parser = argparse.ArgumentParser(description='Reports on game.data files, from one or many players')
+    parser.add_argument('paths', nargs='+', help='save files, or directories of them')
+    parser.add_argument('--jobs', type=int, default=None, help='worker processes, defaults to the number of cpus')
+    parser.add_argument('--json', action='store_true', help='print the report as json, instead of text')
+    args = parser.parse_args(argv)
+
+    report = build_report(args.paths, jobs=args.jobs)
+    if args.json:
+        print(json.dumps(report.to_dict(), indent=2))
+    else:
+        print('\n'.join(format_report(report)))
+    return 0 if report.file_count else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())